@@ -90,6 +90,10 @@ def main():
         metavar="TASK_ID",
         help="Task IDs this task depends on"
     )
+    start_parser.add_argument(
+        "--deadline",
+        help="When the result is needed: a duration (90m, 2h, 1d) or ISO time",
+    )
 
     # Run command
     run_parser = subparsers.add_parser("run", help="Execute pending task(s)")
@@ -176,6 +180,117 @@ def main():
     index_subparsers.add_parser("stats", help="Show index statistics")
     index_subparsers.add_parser("verify", help="Verify index consistency")
 
+    # Search command
+    search_parser = subparsers.add_parser(
+        "search", help="Search finished tasks' prompts, errors, plans and logs"
+    )
+    search_parser.add_argument(
+        "query", nargs="+", help='Terms and "quoted phrases" (all must match)'
+    )
+    search_parser.add_argument("--agent", help="Only tasks for this agent")
+    search_parser.add_argument(
+        "--status",
+        choices=["complete", "failed", "cancelled"],
+        help="Only tasks that finished in this state",
+    )
+    search_parser.add_argument(
+        "--limit", type=int, default=20, help="Maximum results (default: 20)"
+    )
+
+    # Storage command
+    storage_parser = subparsers.add_parser("storage", help="Manage task storage")
+    storage_subparsers = storage_parser.add_subparsers(dest="storage_subcommand")
+    storage_subparsers.add_parser("info", help="Show storage backend and counts")
+    storage_convert_parser = storage_subparsers.add_parser(
+        "convert", help="Copy tasks into another backend and switch to it"
+    )
+    storage_convert_parser.add_argument(
+        "backend", choices=["json", "sqlite", "journal"], help="Target backend"
+    )
+    storage_convert_parser.add_argument(
+        "--source",
+        choices=["json", "sqlite", "journal"],
+        help="Backend to copy from (default: configured backend)",
+    )
+    storage_subparsers.add_parser(
+        "compact", help="Snapshot and rotate the task journal (journal backend)"
+    )
+    storage_history_parser = storage_subparsers.add_parser(
+        "history", help="Show journal history for a task (journal backend)"
+    )
+    storage_history_parser.add_argument("task_id", help="Task ID")
+    storage_migrate_parser = storage_subparsers.add_parser(
+        "migrate", help="Rewrite task files in another on-disk format"
+    )
+    storage_migrate_parser.add_argument(
+        "format",
+        nargs="?",
+        default="compact",
+        choices=["json", "compact"],
+        help="Target format (default: compact)",
+    )
+    storage_reshard_parser = storage_subparsers.add_parser(
+        "reshard", help="Move task files into a flat or sharded layout"
+    )
+    storage_reshard_parser.add_argument(
+        "layout",
+        nargs="?",
+        default="sharded",
+        choices=["flat", "sharded"],
+        help="Target layout (default: sharded)",
+    )
+
+    # Simulate command
+    simulate_parser = subparsers.add_parser(
+        "simulate", help="Compare scheduling policies on a simulated workload"
+    )
+    workload_group = simulate_parser.add_mutually_exclusive_group()
+    workload_group.add_argument("--workload", help="Workload JSON file")
+    workload_group.add_argument(
+        "--recorded", action="store_true", help="Replay the tasks in the task store"
+    )
+    simulate_parser.add_argument(
+        "--agent",
+        action="append",
+        metavar="NAME=MEAN[:STDDEV[:FAILURE_RATE]]",
+        help="Synthetic agent profile in seconds (repeatable)",
+    )
+    simulate_parser.add_argument(
+        "--tasks", type=int, default=100, help="Number of synthetic tasks"
+    )
+    simulate_parser.add_argument(
+        "--arrival",
+        type=float,
+        default=30.0,
+        help="Mean seconds between synthetic submissions (0 = all at once)",
+    )
+    simulate_parser.add_argument(
+        "--dependency-rate",
+        type=float,
+        default=0.3,
+        help="Chance a synthetic task depends on a recent one",
+    )
+    simulate_parser.add_argument(
+        "--policy",
+        nargs="+",
+        choices=["priority", "critical_path"],
+        help="Policies to compare (default: all)",
+    )
+    simulate_parser.add_argument(
+        "--max-concurrent",
+        "-c",
+        type=int,
+        nargs="+",
+        help="Max concurrent tasks to compare (default: 3)",
+    )
+    simulate_parser.add_argument(
+        "--interval", "-i", type=int, default=5, help="Daemon check interval in seconds"
+    )
+    simulate_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    simulate_parser.add_argument(
+        "--save-workload", metavar="FILE", help="Write the workload as JSON"
+    )
+
     args = parser.parse_args()
 
     # Enable debug logging if --debug flag is passed
@@ -210,6 +325,7 @@ def main():
                 args.priority,
                 args.timeout,
                 args.depends_on,
+                args.deadline,
             )
         elif args.command == "run":
             from cli.commands.run import run_command
@@ -289,6 +405,55 @@ def main():
                 sys.exit(index_verify_command())
             else:
                 console.print("[yellow]Use: index rebuild|stats|verify[/yellow]")
+        elif args.command == "search":
+            from cli.commands.search import search_command
+
+            search_command(" ".join(args.query), args.agent, args.status, args.limit)
+        elif args.command == "storage":
+            if args.storage_subcommand == "info":
+                from cli.commands.storage_cmd import storage_info_command
+
+                storage_info_command()
+            elif args.storage_subcommand == "convert":
+                from cli.commands.storage_cmd import storage_convert_command
+
+                sys.exit(storage_convert_command(args.backend, args.source))
+            elif args.storage_subcommand == "compact":
+                from cli.commands.storage_cmd import storage_compact_command
+
+                sys.exit(storage_compact_command())
+            elif args.storage_subcommand == "history":
+                from cli.commands.storage_cmd import storage_history_command
+
+                sys.exit(storage_history_command(args.task_id))
+            elif args.storage_subcommand == "migrate":
+                from cli.commands.storage_cmd import storage_migrate_command
+
+                sys.exit(storage_migrate_command(args.format))
+            elif args.storage_subcommand == "reshard":
+                from cli.commands.storage_cmd import storage_reshard_command
+
+                sys.exit(storage_reshard_command(args.layout))
+            else:
+                console.print(
+                    "[yellow]Use: storage info|convert|compact|history|migrate|reshard[/yellow]"
+                )
+        elif args.command == "simulate":
+            from cli.commands.simulate import simulate_command
+
+            simulate_command(
+                args.workload,
+                args.recorded,
+                args.agent,
+                args.tasks,
+                args.arrival,
+                args.dependency_rate,
+                args.policy,
+                args.max_concurrent,
+                args.interval,
+                args.seed,
+                args.save_workload,
+            )
         else:
             console.print(f"[red]Unknown command: {args.command}[/red]", "red")
             parser.print_help()
@@ -7,7 +7,7 @@ from pathlib import Path
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 from cli.core.archive_manager import ArchiveManager
 from cli.core.config import OrchestratorConfig
 
@@ -20,8 +20,8 @@ def archive_command(dry_run: bool = False, force: bool = False):
         dry_run: Show what would be archived without doing it
         force: Archive even if auto-archival is disabled
     """
-    repo = TaskRepository()
     config = OrchestratorConfig.load()
+    repo = create_repository(config)
 
     if not config.archive.enabled and not force:
         print("Auto-archival is disabled. Use --force to archive anyway.")
@@ -67,8 +67,8 @@ def archive_command(dry_run: bool = False, force: bool = False):
 
 def archive_stats_command():
     """Show archive statistics."""
-    repo = TaskRepository()
     config = OrchestratorConfig.load()
+    repo = create_repository(config)
     manager = ArchiveManager(repo, config)
 
     stats = manager.get_archive_stats()
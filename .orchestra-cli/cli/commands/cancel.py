@@ -7,7 +7,7 @@ from pathlib import Path
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 from cli.core.models import TaskStatus
 from cli.utils.process import kill_process
 
@@ -19,35 +19,39 @@ def cancel_command(task_id: str):
     Args:
         task_id: Task ID to cancel
     """
-    repo = TaskRepository()
+    repo = create_repository()
     task = repo.load(task_id)
 
     if not task:
         print(f"\033[91mError: Task {task_id} not found\033[0m")  # Red
         return
 
-    if task.status == TaskStatus.PENDING:
-        task.status = TaskStatus.CANCELLED
-        task.completedAt = datetime.now()
-        repo.save(task)
-        print(f"\033[93mTask {task_id} cancelled (was pending)\033[0m")  # Yellow
-
-    elif task.status == TaskStatus.RUNNING:
-        if task.pid:
-            success = kill_process(task.pid)
-            if success:
-                print(f"\033[93mProcess {task.pid} terminated\033[0m")  # Yellow
-
-        task.status = TaskStatus.CANCELLED
-        task.completedAt = datetime.now()
-        repo.save(task)
+    if task.status not in (TaskStatus.PENDING, TaskStatus.RUNNING):
+        print(
+            f"\033[93mTask {task_id} is {task.status.value} (cannot cancel)\033[0m"
+        )  # Yellow
+        return
 
-        # Create sentinel
+    was_running = task.status == TaskStatus.RUNNING
+    if was_running:
+        # Sentinel first: if the save below loses to the reconciler, the
+        # sentinel still records the cancellation for the next pass.
         repo.write_sentinel_file(task_id, "cancelled")
-
+        if task.pid and kill_process(task.pid):
+            print(f"\033[93mProcess {task.pid} terminated\033[0m")  # Yellow
+
+    def mark_cancelled(current):
+        if current.status not in (TaskStatus.PENDING, TaskStatus.RUNNING):
+            return False
+        current.status = TaskStatus.CANCELLED
+        current.completedAt = datetime.now()
+
+    saved = repo.update(task_id, mark_cancelled)
+    if saved is None:
+        current = repo.load(task_id)
+        status = current.status.value if current else "deleted"
+        print(f"\033[93mTask {task_id} is {status} (cannot cancel)\033[0m")  # Yellow
+    elif was_running:
         print(f"\033[92mTask {task_id} cancelled\033[0m")  # Green
-
     else:
-        print(
-            f"\033[93mTask {task_id} is {task.status.value} (cannot cancel)\033[0m"
-        )  # Yellow
+        print(f"\033[93mTask {task_id} cancelled (was pending)\033[0m")  # Yellow
@@ -7,7 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from cli.core.models import TaskStatus
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 
 
 def clean_command(filter_type: str = "completed", force: bool = False):
@@ -18,7 +18,7 @@ def clean_command(filter_type: str = "completed", force: bool = False):
         filter_type: Filter type (completed, failed, cancelled, all, or task_id)
         force: Skip confirmation prompt
     """
-    repo = TaskRepository()
+    repo = create_repository()
 
     # 1. Determine filter and find matching tasks
     matching_tasks = []
@@ -31,27 +31,18 @@ def clean_command(filter_type: str = "completed", force: bool = False):
             sys.exit(1)
         matching_tasks = [task]
     else:
-        # Load all tasks
-        all_tasks = repo.list_tasks()
-
-        # Filter based on type
-        if filter_type == "completed":
-            matching_tasks = [t for t in all_tasks if t.status == TaskStatus.COMPLETE]
-        elif filter_type == "failed":
-            matching_tasks = [t for t in all_tasks if t.status == TaskStatus.FAILED]
-        elif filter_type == "cancelled":
-            matching_tasks = [t for t in all_tasks if t.status == TaskStatus.CANCELLED]
-        elif filter_type == "all":
-            matching_tasks = [
-                t
-                for t in all_tasks
-                if t.status
-                in (TaskStatus.COMPLETE, TaskStatus.FAILED, TaskStatus.CANCELLED)
-            ]
-        else:
+        # Map filter to statuses; only matching tasks are decoded
+        statuses = {
+            "completed": (TaskStatus.COMPLETE,),
+            "failed": (TaskStatus.FAILED,),
+            "cancelled": (TaskStatus.CANCELLED,),
+            "all": (TaskStatus.COMPLETE, TaskStatus.FAILED, TaskStatus.CANCELLED),
+        }.get(filter_type)
+        if statuses is None:
             print(f"Error: Invalid filter type '{filter_type}'.")
             print("Valid filters: completed, failed, cancelled, all, task_<id>")
             sys.exit(1)
+        matching_tasks = list(repo.iter_tasks(*statuses))
 
     # 2. Safety check - never delete running or pending
     matching_tasks = [
@@ -76,36 +67,10 @@ def clean_command(filter_type: str = "completed", force: bool = False):
             print("Cancelled.")
             return
 
-    # 4. Delete task artifacts
-    deleted_count = 0
-    deleted_ids = []
-
-    for task in matching_tasks:
-        task_id = task.taskId
-
-        # Delete JSON file
-        json_path = repo.tasks_dir / f"{task_id}.json"
-        if json_path.exists():
-            json_path.unlink()
-
-        # Delete plan file
-        plan_path = Path(task.planFile)
-        if plan_path.exists():
-            plan_path.unlink()
-
-        # Delete log file
-        log_path = Path(task.logFile)
-        if log_path.exists():
-            log_path.unlink()
-
-        # Delete sentinel files
-        for sentinel in [".done", ".error", ".cancelled", ".timeout"]:
-            sentinel_path = repo.tasks_dir / f"{task_id}{sentinel}"
-            if sentinel_path.exists():
-                sentinel_path.unlink()
-
-        deleted_count += 1
-        deleted_ids.append(task_id)
+    # 4. Delete task artifacts (one group commit for all task records)
+    deleted_ids = [task.taskId for task in matching_tasks]
+    repo.delete_many(deleted_ids)
+    deleted_count = len(deleted_ids)
 
     # 5. Report
     if deleted_count == 1:
@@ -31,6 +31,20 @@ def config_init_command():
     print(f"  archive.max_failed_age_days: {config.archive.max_failed_age_days}")
     print(f"  archive.max_queue_size: {config.archive.max_queue_size}")
     print(f"  archive.archive_dir: {config.archive.archive_dir}")
+    print(f"  storage.backend: {config.storage.backend}")
+    print(f"  storage.layout: {config.storage.layout}")
+    print(f"  storage.format: {config.storage.format}")
+    print(f"  storage.sqlite_path: {config.storage.sqlite_path}")
+    print(f"  storage.journal_dir: {config.storage.journal_dir}")
+    print(f"  storage.journal_compact_every: {config.storage.journal_compact_every}")
+    print(f"  storage.load_workers: {config.storage.load_workers}")
+    print(f"  scheduler.aging_interval: {config.scheduler.aging_interval}")
+    print(f"  scheduler.policy: {config.scheduler.policy}")
+    print(f"  scheduler.deadline_slack: {config.scheduler.deadline_slack}")
+    for attr, value in config.admission.to_dict().items():
+        print(f"  admission.{attr}: {value}")
+    for attr, value in config.cache.to_dict().items():
+        print(f"  cache.{attr}: {value}")
 
 
 def config_show_command():
@@ -44,6 +58,20 @@ def config_show_command():
     print(f"  archive.max_failed_age_days: {config.archive.max_failed_age_days}")
     print(f"  archive.max_queue_size: {config.archive.max_queue_size}")
     print(f"  archive.archive_dir: {config.archive.archive_dir}")
+    print(f"  storage.backend: {config.storage.backend}")
+    print(f"  storage.layout: {config.storage.layout}")
+    print(f"  storage.format: {config.storage.format}")
+    print(f"  storage.sqlite_path: {config.storage.sqlite_path}")
+    print(f"  storage.journal_dir: {config.storage.journal_dir}")
+    print(f"  storage.journal_compact_every: {config.storage.journal_compact_every}")
+    print(f"  storage.load_workers: {config.storage.load_workers}")
+    print(f"  scheduler.aging_interval: {config.scheduler.aging_interval}")
+    print(f"  scheduler.policy: {config.scheduler.policy}")
+    print(f"  scheduler.deadline_slack: {config.scheduler.deadline_slack}")
+    for attr, value in config.admission.to_dict().items():
+        print(f"  admission.{attr}: {value}")
+    for attr, value in config.cache.to_dict().items():
+        print(f"  cache.{attr}: {value}")
 
 
 def config_set_command(key: str, value: str):
@@ -52,11 +80,32 @@ def config_set_command(key: str, value: str):
 
     # Parse the key path
     parts = key.split(".")
-    if len(parts) != 2 or parts[0] != "archive":
+    if len(parts) != 2 or parts[0] not in (
+        "archive",
+        "storage",
+        "scheduler",
+        "admission",
+        "cache",
+    ):
         print(f"Error: Invalid key '{key}'")
         print("Valid keys: archive.enabled, archive.max_completed_age_days, etc.")
         return
 
+    setters = {
+        "storage": _set_storage_value,
+        "scheduler": _set_scheduler_value,
+        "admission": _set_admission_value,
+        "cache": _set_cache_value,
+    }
+    if parts[0] in setters:
+        setter = setters[parts[0]]
+        if not setter(config, parts[1], key, value):
+            return
+        config.save()
+        print(f"Set {key} = {value}")
+        print(f"Configuration saved to .orchestra/config.json")
+        return
+
     attr = parts[1]
 
     # Validate and set the value
@@ -85,3 +134,131 @@ def config_set_command(key: str, value: str):
     print(f"Set {key} = {value}")
     print(f"Configuration saved to .orchestra/config.json")
 
+
+
+def _set_scheduler_value(
+    config: OrchestratorConfig, attr: str, key: str, value: str
+) -> bool:
+    """Set a scheduler.* value. Returns False (after printing why) if invalid."""
+    if attr == "policy":
+        if value not in config.scheduler.POLICIES:
+            print(f"Error: Invalid policy '{value}'")
+            print(f"Valid policies: {', '.join(config.scheduler.POLICIES)}")
+            return False
+        config.scheduler.policy = value
+        return True
+    if attr not in ("aging_interval", "deadline_slack"):
+        print(f"Error: Unknown key '{key}'")
+        return False
+    try:
+        seconds = int(value)
+    except ValueError:
+        seconds = -1
+    if seconds < 0:
+        print(f"Error: Invalid value '{value}' (seconds, 0 = off)")
+        return False
+    setattr(config.scheduler, attr, seconds)
+    return True
+
+
+def _set_admission_value(
+    config: OrchestratorConfig, attr: str, key: str, value: str
+) -> bool:
+    """Set an admission.* value. Returns False (after printing why) if invalid."""
+    if attr == "enabled":
+        if value.lower() in ("true", "1", "yes"):
+            config.admission.enabled = True
+        elif value.lower() in ("false", "0", "no"):
+            config.admission.enabled = False
+        else:
+            print(f"Error: Invalid boolean value '{value}'")
+            return False
+        return True
+    if attr not in config.admission.to_dict():
+        print(f"Error: Unknown key '{key}'")
+        return False
+    try:
+        threshold = int(value) if attr == "min_available_mb" else float(value)
+    except ValueError:
+        threshold = -1
+    if threshold < 0:
+        print(f"Error: Invalid value '{value}' (a threshold >= 0, 0 = check off)")
+        return False
+    setattr(config.admission, attr, threshold)
+    return True
+
+
+def _set_cache_value(
+    config: OrchestratorConfig, attr: str, key: str, value: str
+) -> bool:
+    """Set a cache.* value. Returns False (after printing why) if invalid."""
+    if attr in ("enabled", "workspace_fingerprint"):
+        if value.lower() in ("true", "1", "yes"):
+            setattr(config.cache, attr, True)
+        elif value.lower() in ("false", "0", "no"):
+            setattr(config.cache, attr, False)
+        else:
+            print(f"Error: Invalid boolean value '{value}'")
+            return False
+        return True
+    if attr not in ("ttl_seconds", "max_size_mb"):
+        print(f"Error: Unknown key '{key}'")
+        return False
+    try:
+        amount = int(value)
+    except ValueError:
+        amount = -1
+    if amount < 0:
+        print(f"Error: Invalid value '{value}' (an integer >= 0)")
+        return False
+    setattr(config.cache, attr, amount)
+    return True
+
+
+def _set_storage_value(
+    config: OrchestratorConfig, attr: str, key: str, value: str
+) -> bool:
+    """Set a storage.* value. Returns False (after printing why) if invalid."""
+    if attr == "backend":
+        if value not in config.storage.BACKENDS:
+            print(f"Error: Invalid backend '{value}'")
+            print(f"Valid backends: {', '.join(config.storage.BACKENDS)}")
+            return False
+        old_backend = config.storage.backend
+        config.storage.backend = value
+        if old_backend != value:
+            print("Note: existing tasks are not copied to the new backend.")
+            print(
+                f"  To copy them, run: python3 -m cli storage convert {value} "
+                f"--source {old_backend}"
+            )
+    elif attr == "layout":
+        if value not in config.storage.LAYOUTS:
+            print(f"Error: Invalid layout '{value}'")
+            print(f"Valid layouts: {', '.join(config.storage.LAYOUTS)}")
+            return False
+        config.storage.layout = value
+        print(
+            "Note: only new files use the new layout (existing ones are still found)."
+        )
+        print(f"  To move existing files, run: python3 -m cli storage reshard {value}")
+    elif attr == "format":
+        if value not in config.storage.FORMATS:
+            print(f"Error: Invalid format '{value}'")
+            print(f"Valid formats: {', '.join(config.storage.FORMATS)}")
+            return False
+        config.storage.format = value
+        print("Note: existing task files are kept as-is (both formats are readable).")
+        print(f"  To rewrite them, run: python3 -m cli storage migrate {value}")
+    elif attr in ("sqlite_path", "journal_dir"):
+        setattr(config.storage, attr, value)
+    elif attr in ("journal_compact_every", "load_workers"):
+        try:
+            setattr(config.storage, attr, int(value))
+        except ValueError:
+            print(f"Error: Invalid integer value '{value}'")
+            return False
+    else:
+        print(f"Error: Unknown key '{key}'")
+        return False
+    return True
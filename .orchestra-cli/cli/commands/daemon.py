@@ -3,19 +3,20 @@
 import signal
 import sys
 import time
-from datetime import datetime
 from pathlib import Path
 
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
+from cli.core.admission import AdmissionController
 from cli.core.reconciler import Reconciler
 from cli.core.scheduler import Scheduler
 from cli.core.executor import Executor
 from cli.core.retry_manager import RetryManager
 from cli.core.archive_manager import ArchiveManager
 from cli.core.models import TaskStatus
+from cli.core.search import SearchIndex
 from cli.utils.logger import logger
 
 
@@ -26,12 +27,14 @@ class DaemonRunner:
         self.max_concurrent = max_concurrent
         self.interval = interval
         self.running = True
-        self.repo = TaskRepository()
+        self.repo = create_repository()
         self.reconciler = Reconciler(self.repo)
         self.scheduler = Scheduler(self.repo)
-        self.executor = Executor(self.repo)
+        self.executor = Executor(self.repo, rate_limiter=self.scheduler.rate_limiter)
         self.retry_manager = RetryManager(self.repo)
         self.archive_manager = ArchiveManager(self.repo)
+        self.search_index = SearchIndex.for_repository(self.repo)
+        self.admission = AdmissionController()
 
         # Archive check interval (1 hour)
         self.archive_interval = 3600
@@ -57,29 +60,39 @@ class DaemonRunner:
             logger.error(f"Reconciliation error: {e}")
             return 0
 
+    def _index_finished(self):
+        """Add newly finished (and newly archived) tasks to the search index."""
+        try:
+            return self.search_index.sync(
+                self.repo, self.archive_manager.archive_dir
+            )
+        except Exception as e:
+            logger.error(f"Search indexing error: {e}")
+            return 0
+
     def _auto_retry(self):
         """Check for tasks that need automatic retry."""
         try:
-            tasks = self.repo.load_all()
+            tasks = self.retry_manager.due_retries()
             retry_count = 0
-            for task in tasks:
-                if task.status == TaskStatus.FAILED and task.autoRetry:
-                    if self.retry_manager.is_retry_due(task):
-                        new_task = self.retry_manager.create_retry_task(
-                            task, auto_retry=True
+            # All retries created this cycle are written in one group commit
+            with self.repo.transaction():
+                for task in tasks:
+                    new_task = self.retry_manager.create_retry_task(
+                        task, auto_retry=True
+                    )
+                    if new_task:
+                        logger.info(
+                            f"Auto-retrying {task.taskId} (attempt {new_task.retryCount}/{new_task.maxRetries})"
                         )
-                        if new_task:
-                            logger.info(
-                                f"Auto-retrying {task.taskId} (attempt {new_task.retryCount}/{new_task.maxRetries})"
-                            )
-                            retry_count += 1
+                        retry_count += 1
             return retry_count
         except Exception as e:
             logger.error(f"Auto-retry error: {e}")
             return 0
 
     def _launch_tasks(self):
-        """Launch pending tasks up to the concurrency limit."""
+        """Launch pending tasks up to the concurrency and host load limits."""
         try:
             running_count = self.scheduler.get_running_count()
             available = self.max_concurrent - running_count
@@ -87,6 +100,10 @@ class DaemonRunner:
             if available <= 0:
                 return 0
 
+            # Leave the queue untouched while the host is over a threshold
+            if not self.admission.admit():
+                return 0
+
             pending_tasks = self.scheduler.get_pending_tasks(available)
             if not pending_tasks:
                 return 0
@@ -94,19 +111,24 @@ class DaemonRunner:
             launched = 0
             for task in pending_tasks:
                 try:
-                    task.status = TaskStatus.RUNNING
-                    task.startedAt = datetime.now()
-                    task.pid = self.executor.launch_task(task)
-                    self.repo.save(task)
+                    # Re-check before each further launch; tasks not
+                    # launched are queued again by the next refresh
+                    if launched and not self.admission.admit():
+                        break
+                    if not self.executor.start_task(task):
+                        continue
+                    if task.cachedFrom:
+                        logger.info(
+                            f"Completed task {task.taskId} from cache "
+                            f"(result of {task.cachedFrom})"
+                        )
+                        continue
                     logger.info(
                         f"Launched task {task.taskId} (PID: {task.pid}, agent: {task.agent})"
                     )
                     launched += 1
                 except Exception as e:
                     logger.error(f"Failed to launch {task.taskId}: {e}")
-                    task.status = TaskStatus.FAILED
-                    task.errorMessage = str(e)
-                    self.repo.save(task)
 
             return launched
         except Exception as e:
@@ -115,14 +137,14 @@ class DaemonRunner:
 
     def _get_status_summary(self):
         """Get a summary of current task states."""
-        tasks = self.repo.load_all()
+        by_status = self.repo.count_by_status()
         counts = {
-            "total": len(tasks),
-            "running": sum(1 for t in tasks if t.status == TaskStatus.RUNNING),
-            "pending": sum(1 for t in tasks if t.status == TaskStatus.PENDING),
-            "completed": sum(1 for t in tasks if t.status == TaskStatus.COMPLETE),
-            "failed": sum(1 for t in tasks if t.status == TaskStatus.FAILED),
-            "cancelled": sum(1 for t in tasks if t.status == TaskStatus.CANCELLED),
+            "total": sum(by_status.values()),
+            "running": by_status[TaskStatus.RUNNING],
+            "pending": by_status[TaskStatus.PENDING],
+            "completed": by_status[TaskStatus.COMPLETE],
+            "failed": by_status[TaskStatus.FAILED],
+            "cancelled": by_status[TaskStatus.CANCELLED],
         }
         return counts
 
@@ -132,9 +154,35 @@ class DaemonRunner:
         logger.info("Agent Orchestrator Daemon Started")
         logger.info(f"Max concurrent tasks: {self.max_concurrent}")
         logger.info(f"Check interval: {self.interval}s")
+        if self.admission.config.enabled:
+            logger.info(f"Host load: {self.admission.sample().describe()}")
+        else:
+            logger.info("Admission control: disabled")
+        for agent, limits in self.scheduler.agent_limits.items():
+            if (
+                limits.max_concurrent is None
+                and limits.weight == 1
+                and limits.rate_limit is None
+            ):
+                continue
+            cap = "-" if limits.max_concurrent is None else limits.max_concurrent
+            rate = limits.rate_limit
+            rate_str = (
+                f", {rate.per_minute:g}/min (burst {rate.burst})" if rate else ""
+            )
+            logger.info(
+                f"Agent {agent}: max concurrent {cap}, weight {limits.weight:g}"
+                f"{rate_str}"
+            )
         logger.info("Press Ctrl+C to stop")
         logger.info("=" * 60)
 
+        # Start from an index that matches the task files (repairs drift
+        # from crashes or hand edits); every later write keeps it current
+        if self.repo.index is not None:
+            indexed = self.repo.rebuild_index()
+            logger.info(f"Task index rebuilt ({indexed} tasks)")
+
         cycle = 0
         while self.running:
             try:
@@ -144,13 +192,16 @@ class DaemonRunner:
                 # 1. Reconcile task states
                 reconciled = self._reconcile()
 
-                # 2. Auto-retry failed tasks
+                # 2. Index tasks that finished since the last cycle
+                self._index_finished()
+
+                # 3. Auto-retry failed tasks
                 retried = self._auto_retry()
 
-                # 3. Launch pending tasks
+                # 4. Launch pending tasks
                 launched = self._launch_tasks()
 
-                # 4. Show status summary
+                # 5. Show status summary
                 status = self._get_status_summary()
                 logger.info(
                     f"Status: {status['running']} running, "
@@ -163,8 +214,22 @@ class DaemonRunner:
                     logger.debug(
                         f"Actions: reconciled={reconciled}, retried={retried}, launched={launched}"
                     )
+                if self.admission.deferrals:
+                    logger.debug(
+                        "Deferred launch checks: "
+                        + ", ".join(
+                            f"{check}={count}"
+                            for check, count in self.admission.deferrals.items()
+                        )
+                    )
+
+                cache = self.repo.cache_stats()
+                logger.debug(
+                    f"Task cache: {cache['hits']} hits, {cache['misses']} misses, "
+                    f"{cache['size']} cached"
+                )
 
-                # 5. Periodic archival check (every hour)
+                # 6. Periodic archival check (every hour)
                 current_time = time.time()
                 if current_time - self.last_archive_check > self.archive_interval:
                     archived, _ = self.archive_manager.run_archival()
@@ -173,7 +238,7 @@ class DaemonRunner:
                     self.archive_manager.check_queue_size()
                     self.last_archive_check = current_time
 
-                # 6. Sleep until next cycle
+                # 7. Sleep until next cycle
                 time.sleep(self.interval)
 
             except KeyboardInterrupt:
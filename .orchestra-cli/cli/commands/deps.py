@@ -6,14 +6,14 @@ from pathlib import Path
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 from cli.core.dependency_resolver import DependencyResolver
 from cli.core.models import TaskStatus
 
 
 def deps_show_command(task_id: str):
     """Show dependencies for a task."""
-    repo = TaskRepository()
+    repo = create_repository()
     task = repo.load(task_id)
 
     if not task:
@@ -41,7 +41,7 @@ def deps_show_command(task_id: str):
 
 def deps_graph_command():
     """Show dependency graph for all tasks."""
-    repo = TaskRepository()
+    repo = create_repository()
     resolver = DependencyResolver(repo)
 
     graph = resolver.build_dependency_graph()
@@ -65,7 +65,7 @@ def deps_graph_command():
 
 def deps_validate_command():
     """Validate dependency graph for cycles."""
-    repo = TaskRepository()
+    repo = create_repository()
     resolver = DependencyResolver(repo)
 
     cycle = resolver.detect_cycle()
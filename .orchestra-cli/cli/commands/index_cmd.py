@@ -6,64 +6,82 @@ from pathlib import Path
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.repository import TaskRepository
-from cli.core.index import TaskIndex
+from cli.core.repository import create_repository
+
+
+def _open_index():
+    """Return (repo, index), or (repo, None) if the backend needs no index."""
+    repo = create_repository()
+    if repo.index is None:
+        print(
+            "The configured storage backend answers status queries itself; "
+            "no task index is used."
+        )
+    return repo, repo.index
 
 
 def index_rebuild_command():
     """Rebuild the task index from scratch."""
+    repo, index = _open_index()
+    if index is None:
+        return
+
     print("Rebuilding task index...")
-    
-    repo = TaskRepository()
-    index = TaskIndex()
-    
-    tasks = repo.load_all()
-    index.rebuild(tasks)
-    
-    print(f"\033[92m✓ Index rebuilt with {len(tasks)} tasks\033[0m")
+    count = repo.rebuild_index()
+
+    print(f"\033[92m✓ Index rebuilt with {count} tasks\033[0m")
 
 
 def index_stats_command():
     """Show index statistics."""
-    index = TaskIndex()
+    _, index = _open_index()
+    if index is None:
+        return
+    stats = index.stats()
     
     print("\n\033[1mTask Index Statistics:\033[0m")
-    print(f"  Total tasks: {index.data['count']}")
-    print(f"  Last updated: {index.data.get('last_updated', 'Never')}")
+    print(f"  Total tasks: {stats['count']}")
+    print(f"  Last updated: {stats['last_updated'] or 'Never'}")
     
     print(f"\n\033[1mBy Status:\033[0m")
-    for status, task_ids in sorted(index.data["by_status"].items()):
-        print(f"  {status}: {len(task_ids)}")
+    for status, count in sorted(stats["by_status"].items()):
+        print(f"  {status}: {count}")
     
     print(f"\n\033[1mBy Agent:\033[0m")
-    for agent, task_ids in sorted(index.data["by_agent"].items()):
-        print(f"  {agent}: {len(task_ids)}")
+    for agent, count in sorted(stats["by_agent"].items()):
+        print(f"  {agent}: {count}")
     
     print(f"\n\033[1mBy Priority:\033[0m")
-    for priority, task_ids in sorted(index.data["by_priority"].items(), key=lambda x: int(x[0]), reverse=True):
-        print(f"  Priority {priority}: {len(task_ids)}")
+    for priority, count in sorted(stats["by_priority"].items(), reverse=True):
+        print(f"  Priority {priority}: {count}")
 
 
 def index_verify_command():
     """Verify index consistency with actual tasks."""
+    repo, index = _open_index()
+    if index is None:
+        return 0
+
     print("Verifying index consistency...")
-    
-    repo = TaskRepository()
-    index = TaskIndex()
-    
-    tasks = repo.load_all()
-    actual_ids = {t.taskId for t in tasks}
-    
-    # Get all IDs from index
-    indexed_ids = set()
-    for status_list in index.data["by_status"].values():
-        indexed_ids.update(status_list)
-    
+
+    # Full scan of the task files (headers only)
+    actual = {h.taskId: h.status.value for h in repo.load_headers()}
+    actual_ids = set(actual)
+
+    # Get all IDs (and their indexed status) from the index
+    indexed = {task_id: index.status_of(task_id) for task_id in index.task_ids()}
+    indexed_ids = set(indexed)
+
     # Find discrepancies
     missing_from_index = actual_ids - indexed_ids
     extra_in_index = indexed_ids - actual_ids
-    
-    if not missing_from_index and not extra_in_index:
+    wrong_status = {
+        task_id
+        for task_id in actual_ids & indexed_ids
+        if actual[task_id] != indexed[task_id]
+    }
+
+    if not missing_from_index and not extra_in_index and not wrong_status:
         print("\033[92m✓ Index is consistent\033[0m")
         return 0
     
@@ -80,6 +98,16 @@ def index_verify_command():
             print(f"  - {task_id}")
         if len(extra_in_index) > 5:
             print(f"  ... and {len(extra_in_index) - 5} more")
+
+    if wrong_status:
+        print(
+            f"\033[93m⚠ {len(wrong_status)} tasks indexed under the wrong "
+            "status:\033[0m"
+        )
+        for task_id in list(wrong_status)[:5]:
+            print(f"  - {task_id} (indexed {indexed[task_id]}, is {actual[task_id]})")
+        if len(wrong_status) > 5:
+            print(f"  ... and {len(wrong_status) - 5} more")
     
     print("\nRun 'python3 -m cli index rebuild' to fix inconsistencies")
     return 1
@@ -7,7 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from cli.core.models import Task, TaskStatus, RetryHistoryEntry
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 from cli.core.retry_manager import RetryManager
 
 
@@ -24,7 +24,7 @@ def retry_command(
         max_retries: Override max retries (None to use original)
         auto_retry: Enable automatic retries for new task
     """
-    repo = TaskRepository()
+    repo = create_repository()
 
     # 1. Validate task exists and is failed
     original = repo.get_task(task_id)
@@ -1,16 +1,14 @@
 """Run command implementation - executes pending tasks."""
 
 import sys
-from datetime import datetime
 from pathlib import Path
 
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 from cli.core.scheduler import Scheduler
 from cli.core.executor import Executor
-from cli.core.models import TaskStatus
 
 
 def run_command(parallel: int = None):
@@ -20,9 +18,9 @@ def run_command(parallel: int = None):
     Args:
         parallel: If specified, run up to N tasks in parallel
     """
-    repo = TaskRepository()
+    repo = create_repository()
     scheduler = Scheduler(repo)
-    executor = Executor(repo)
+    executor = Executor(repo, rate_limiter=scheduler.rate_limiter)
 
     if parallel:
         # Parallel execution
@@ -43,16 +41,17 @@ def run_command(parallel: int = None):
         started = []
         for task in tasks:
             try:
-                task.status = TaskStatus.RUNNING
-                task.startedAt = datetime.now()
-                task.pid = executor.launch_task(task)
-                repo.save(task)
+                if not executor.start_task(task):
+                    continue
+                if task.cachedFrom:
+                    print(
+                        f"\033[92mCompleted {task.taskId} from cache "
+                        f"(result of {task.cachedFrom})\033[0m"
+                    )  # Green
+                    continue
                 started.append((task.taskId, task.pid))
             except Exception as e:
                 print(f"\033[91mError starting {task.taskId}: {e}\033[0m")  # Red
-                task.status = TaskStatus.FAILED
-                task.errorMessage = str(e)
-                repo.save(task)
 
         if started:
             print(f"\033[92mStarted {len(started)} task(s):\033[0m")  # Green
@@ -66,10 +65,18 @@ def run_command(parallel: int = None):
             return
 
         try:
-            task.status = TaskStatus.RUNNING
-            task.startedAt = datetime.now()
-            task.pid = executor.launch_task(task)
-            repo.save(task)
+            if not executor.start_task(task):
+                print(
+                    f"\033[93mTask {task.taskId} was not started (started "
+                    f"elsewhere or rate limited)\033[0m"
+                )  # Yellow
+                return
+            if task.cachedFrom:
+                print(
+                    f"\033[92mCompleted task {task.taskId} from cache "
+                    f"(result of {task.cachedFrom})\033[0m"
+                )  # Green
+                return
 
             print(
                 f"\033[92mStarted task {task.taskId} (PID: {task.pid})\033[0m"
@@ -78,6 +85,3 @@ def run_command(parallel: int = None):
                 print(f"  Timeout: {task.timeout}s")
         except Exception as e:
             print(f"\033[91mError starting task: {e}\033[0m")  # Red
-            task.status = TaskStatus.FAILED
-            task.errorMessage = str(e)
-            repo.save(task)
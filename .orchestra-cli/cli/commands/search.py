@@ -0,0 +1,59 @@
+"""Search command implementation."""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.config import OrchestratorConfig
+from cli.core.repository import create_repository
+from cli.core.search import SearchIndex
+
+
+def search_command(
+    query: str,
+    agent: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 20,
+):
+    """
+    Search finished and archived tasks.
+
+    Args:
+        query: Terms and "quoted phrases"; all must match
+        agent: Only tasks for this agent
+        status: Only tasks that finished in this state
+        limit: Maximum number of results
+    """
+    config = OrchestratorConfig.load()
+    repo = create_repository(config)
+    archive_dir = Path(config.archive.archive_dir)
+
+    index = SearchIndex.for_repository(repo)
+    try:
+        # Only tasks finished since the last sync (daemon or search) are read
+        added = index.sync(repo, archive_dir)
+        if added:
+            print(f"Indexed {added} newly finished task(s)")
+
+        results = index.search(
+            query, repo, archive_dir, agent=agent, status=status, limit=limit
+        )
+    finally:
+        index.close()
+
+    if not results:
+        print("No matching tasks.")
+        return
+
+    print(f"\n{'Score':>7}  {'ID':<30} {'Agent':<8} {'Status':<10} Prompt")
+    print("=" * 100)
+    for result in results:
+        status_str = result.status + (" (A)" if result.archived else "")
+        print(
+            f"{result.score:>7.2f}  {result.task_id:<30} {result.agent:<8} "
+            f"{status_str:<10} {result.preview}"
+        )
+    print(f"\n{len(results)} result(s); (A) = archived")
@@ -0,0 +1,97 @@
+"""Simulate command implementation."""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.config import SchedulerConfig
+from cli.core.repository import create_repository
+from cli.core.simulator import AgentProfile, Simulation, Workload
+from cli.utils.time_utils import format_duration
+
+# Used when neither --workload, --recorded nor --agent is given
+DEFAULT_PROFILE = "coder=600:300:0.1"
+
+
+def simulate_command(
+    workload_file: Optional[str] = None,
+    recorded: bool = False,
+    agents: Optional[List[str]] = None,
+    tasks: int = 100,
+    arrival: float = 30.0,
+    dependency_rate: float = 0.3,
+    policies: Optional[List[str]] = None,
+    max_concurrent: Optional[List[int]] = None,
+    interval: int = 5,
+    seed: int = 0,
+    save_workload: Optional[str] = None,
+):
+    """
+    Compare scheduling policies on a workload without running agents.
+
+    The workload is read from a file, replayed from the task store
+    (--recorded) or generated from per-agent profiles. Each combination of
+    policy and max concurrency is simulated with the same run times and
+    failures, using the agent limits from agent-config.json.
+    """
+    try:
+        if workload_file:
+            workload = Workload.load(Path(workload_file))
+        elif recorded:
+            workload = Workload.from_repository(create_repository())
+        else:
+            specs = agents or [DEFAULT_PROFILE]
+            profiles = dict(AgentProfile.parse(spec) for spec in specs)
+            workload = Workload.synthetic(
+                profiles, tasks, arrival, dependency_rate, seed
+            )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"\033[91mError: Invalid workload: {e}\033[0m")  # Red
+        return
+
+    if save_workload:
+        workload.save(Path(save_workload))
+        print(f"Workload saved to {save_workload}")
+
+    policies = policies or list(SchedulerConfig.POLICIES)
+    max_concurrent = max_concurrent or [3]
+
+    print(f"\n\033[1mSimulating {len(workload.tasks)} task(s):\033[0m")  # Bold
+    for name, profile in sorted(workload.agents.items()):
+        print(
+            f"  {name}: mean {format_duration(int(profile.mean_seconds))}, "
+            f"stddev {format_duration(int(profile.stddev_seconds))}, "
+            f"{profile.failure_rate:.0%} failures"
+        )
+
+    print("\n" + "=" * 112)
+    print(
+        f"{'Policy':<15} {'Slots':>5} {'Makespan':>10} {'Wait p50':>10} "
+        f"{'p90':>10} {'p99':>10} {'Util':>6} {'Retries':>8} {'Done':>6} "
+        f"{'Failed':>6} {'Unfin.':>6} {'Late':>6}"
+    )
+    print("=" * 112)
+    for slots in max_concurrent:
+        for policy in policies:
+            simulation = Simulation(workload, policy, slots, interval, seed)
+            # The scheduler and retry manager log every step
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = simulation.run()
+            waits = [
+                format_duration(int(result.wait_percentile(p))) for p in (50, 90, 99)
+            ]
+            print(
+                f"{policy:<15} {slots:>5} {format_duration(int(result.makespan)):>10} "
+                f"{waits[0]:>10} {waits[1]:>10} {waits[2]:>10} "
+                f"{result.utilization:>6.0%} {result.retries:>8} "
+                f"{result.completed:>6} {result.failed:>6} "
+                f"{result.unfinished:>6} {result.missed_deadlines:>6}"
+            )
+    print("=" * 112)
+    print("Unfin.: never finished (e.g. blocked by a failed dependency)")
+    print("Late: deadlines missed\n")
@@ -8,9 +8,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from cli.core.models import Task, TaskStatus
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 from cli.core.dependency_resolver import DependencyResolver
-from cli.utils.time_utils import format_duration
+from cli.utils.ids import new_task_id
+from cli.utils.time_utils import format_duration, parse_deadline
 from typing import Optional, List
 
 
@@ -22,6 +23,7 @@ def start_command(
     priority: int = 5,
     timeout: int = None,
     depends_on: Optional[List[str]] = None,
+    deadline: Optional[str] = None,
 ):
     """
     Queue a new agent task.
@@ -34,8 +36,20 @@ def start_command(
         priority: Task priority (1-10)
         timeout: Timeout in seconds (None for no timeout)
         depends_on: List of task IDs this task depends on
+        deadline: When the result is needed ("2h", "1d" or an ISO timestamp)
     """
-    repo = TaskRepository()
+    deadline_at = None
+    if deadline:
+        try:
+            deadline_at = parse_deadline(deadline)
+        except ValueError:
+            print(
+                f"\033[91mError: Invalid deadline '{deadline}' "
+                f"(use e.g. 90m, 2h, 1d or 2026-03-01T17:00)\033[0m"
+            )
+            return
+
+    repo = create_repository()
 
     # Validate dependencies
     if depends_on:
@@ -47,14 +61,15 @@ def start_command(
                 return
 
         # Generate temporary task ID for cycle detection
-        temp_task_id = f"task_{int(datetime.now().timestamp() * 1000)}"
+        temp_task_id = new_task_id()
         valid, message = resolver.validate_new_dependency(temp_task_id, depends_on)
         if not valid:
             print(f"\033[91mError: {message}\033[0m")
             return
 
-    # Generate task ID
-    task_id = f"task_{int(datetime.now().timestamp() * 1000)}"
+    # Generate task ID (unique across processes, sortable by creation time)
+    created_at = datetime.now()
+    task_id = new_task_id(created_at)
 
     # Create task
     task = Task(
@@ -64,13 +79,14 @@ def start_command(
         prompt=prompt,
         planFile=f".orchestra/plans/{task_id}_plan.md",
         logFile=f".orchestra/logs/{task_id}.log",
-        createdAt=datetime.now(),
+        createdAt=created_at,
         maxRetries=max_retries,
         autoRetry=auto_retry,
         priority=priority,
         timeout=timeout,
         timeoutWarning=60 if timeout else None,
         dependsOn=depends_on or [],
+        deadline=deadline_at,
     )
 
     # Save task
@@ -98,3 +114,5 @@ def start_command(
         print(f"  Timeout: {timeout}s ({format_duration(timeout)})")
     if depends_on:
         print(f"  Dependencies: {', '.join(depends_on)}")
+    if deadline_at:
+        print(f"  Deadline: {deadline_at.isoformat(timespec='minutes')}")
@@ -7,11 +7,12 @@ from pathlib import Path
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 from cli.core.reconciler import Reconciler
 from cli.core.formatter import Formatter
 from cli.core.retry_manager import RetryManager
 from cli.core.models import TaskStatus
+from cli.core.scheduler import Scheduler
 
 
 def status_command(watch: bool = False, interval: int = 5, auto_retry: bool = True):
@@ -26,7 +27,7 @@ def status_command(watch: bool = False, interval: int = 5, auto_retry: bool = Tr
 
     def _display_status():
         """Display status once."""
-        repo = TaskRepository()
+        repo = create_repository()
         reconciler = Reconciler(repo)
         formatter = Formatter()
 
@@ -38,24 +39,35 @@ def status_command(watch: bool = False, interval: int = 5, auto_retry: bool = Tr
         # Auto-retry logic
         if auto_retry:
             retry_manager = RetryManager(repo)
-            tasks = repo.load_all()  # Reload in case reconciliation changed things
-            for task in tasks:
-                if task.status == TaskStatus.FAILED and task.autoRetry:
-                    if retry_manager.is_retry_due(task):
-                        new_task = retry_manager.create_retry_task(
-                            task, auto_retry=True
-                        )
-                        if new_task:
-                            print(
-                                f"\033[96mAuto-retrying {task.taskId} (attempt {new_task.retryCount}/{new_task.maxRetries})\033[0m"
-                            )
-
-        # Load and display tasks
-        tasks = repo.load_all()
+            # Queried after reconciliation, which may have failed tasks
+            for task in retry_manager.due_retries():
+                new_task = retry_manager.create_retry_task(task, auto_retry=True)
+                if new_task:
+                    print(
+                        f"\033[96mAuto-retrying {task.taskId} (attempt {new_task.retryCount}/{new_task.maxRetries})\033[0m"
+                    )
 
+        # Stream tasks into the table; the summary only needs counts
         print("\033[1m\033[96mTask Queue Status\033[0m")  # Bold Cyan
-        formatter.print_task_table(tasks)
-        formatter.print_summary(tasks)
+        scheduler = Scheduler(repo)
+        at_risk = []
+
+        def deadline_risk(task):
+            risk = scheduler.deadline_risk(task)
+            if risk and task.status in (TaskStatus.PENDING, TaskStatus.RUNNING):
+                at_risk.append(task.taskId)
+            return risk
+
+        formatter.print_task_table(
+            repo.iter_tasks(), scheduler.effective_priority, deadline_risk
+        )
+        formatter.print_summary(repo.count_by_status())
+        formatter.print_rate_limits(scheduler.rate_limiter)
+        if at_risk:
+            print(
+                f"\033[93m{len(at_risk)} unfinished task(s) can no longer "
+                f"meet their deadline\033[0m\n"
+            )  # Yellow
 
     if watch:
         # Watch mode: clear screen and refresh
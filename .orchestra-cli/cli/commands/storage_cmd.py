@@ -0,0 +1,177 @@
+"""Storage backend management commands."""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.archive_manager import ArchiveManager
+from cli.core.config import OrchestratorConfig
+from cli.core.journal_repository import JournalTaskRepository
+from cli.core.repository import create_repository
+
+
+def storage_info_command():
+    """Show the configured storage backend and task counts."""
+    config = OrchestratorConfig.load()
+    repo = create_repository(config)
+
+    print("\n\033[1mTask Storage:\033[0m")
+    print(f"  Backend: {config.storage.backend}")
+    print(f"  Layout: {config.storage.layout}")
+    print(f"  Format: {config.storage.format}")
+    if config.storage.backend == "sqlite":
+        print(f"  Database: {config.storage.sqlite_path}")
+    elif config.storage.backend == "journal":
+        print(f"  Journal: {config.storage.journal_dir}")
+        print(f"  Compact every: {config.storage.journal_compact_every} records")
+    print(f"  Tasks dir: {repo.tasks_dir}")
+
+    counts = repo.count_by_status()
+    print(f"\n\033[1mTasks ({sum(counts.values())}):\033[0m")
+    for status, count in counts.items():
+        print(f"  {status.value}: {count}")
+
+
+def storage_convert_command(target: str, source: Optional[str] = None):
+    """
+    Copy all tasks into another storage backend and switch to it.
+
+    The tasks are written in a single transaction, so the target gets
+    either every task or none of them.
+
+    Args:
+        target: Backend to copy tasks into ("json", "sqlite" or "journal")
+        source: Backend to read from (defaults to the configured backend)
+    """
+    config = OrchestratorConfig.load()
+    source = source or config.storage.backend
+
+    for backend in (source, target):
+        if backend not in config.storage.BACKENDS:
+            print(f"\033[91mError: Unknown backend '{backend}'\033[0m")
+            print(f"Valid backends: {', '.join(config.storage.BACKENDS)}")
+            return 1
+
+    if source == target:
+        print(f"Tasks are already stored in the {target} backend.")
+        return 0
+
+    config.storage.backend = source
+    source_repo = create_repository(config)
+    config.storage.backend = target
+    target_repo = create_repository(config)
+
+    tasks = source_repo.load_all()
+    target_repo.save_many(tasks)
+
+    config.save()
+    print(
+        f"\033[92m✓ Copied {len(tasks)} tasks from {source} to {target}\033[0m"
+    )
+    print(f"storage.backend is now '{target}'.")
+    print(f"The {source} copy was left in place; remove it once verified.")
+    return 0
+
+
+def storage_reshard_command(layout: str = "sharded"):
+    """
+    Move task and sentinel files into a layout and switch to it.
+
+    Safe to run while the daemon and agents are active: files are moved
+    with atomic renames and both layouts are searched on read.
+
+    Args:
+        layout: Target layout ("sharded" or "flat")
+    """
+    config = OrchestratorConfig.load()
+    if layout not in config.storage.LAYOUTS:
+        print(f"\033[91mError: Unknown layout '{layout}'\033[0m")
+        print(f"Valid layouts: {', '.join(config.storage.LAYOUTS)}")
+        return 1
+
+    # Switch first so new writes already go to the target layout
+    config.storage.layout = layout
+    config.save()
+
+    repo = create_repository(config)
+    moved = repo.reshard(layout)
+    print(f"\033[92m✓ Moved {moved} files into the {layout} layout\033[0m")
+    print(f"storage.layout is now '{layout}'.")
+    print("Restart a running daemon so its own writes use the new layout.")
+    return 0
+
+
+def storage_migrate_command(task_format: str = "compact"):
+    """
+    Rewrite stored and archived tasks in another on-disk format.
+
+    Tasks are streamed one at a time (one batch per transaction for SQLite),
+    so memory use stays flat. Stop the daemon first: a task it saves while
+    being rewritten could be overwritten with the older copy.
+
+    Args:
+        task_format: Target format ("compact" or "json")
+    """
+    config = OrchestratorConfig.load()
+    if task_format not in config.storage.FORMATS:
+        print(f"\033[91mError: Unknown format '{task_format}'\033[0m")
+        print(f"Valid formats: {', '.join(config.storage.FORMATS)}")
+        return 1
+
+    config.storage.format = task_format
+    config.save()
+
+    repo = create_repository(config)
+    migrated = repo.migrate_format(task_format)
+    archived = ArchiveManager(repo, config).migrate_archive(task_format)
+
+    print(
+        f"\033[92m✓ Rewrote {migrated} tasks and {archived} archived tasks "
+        f"as {task_format}\033[0m"
+    )
+    print(f"storage.format is now '{task_format}'.")
+    return 0
+
+
+def _open_journal() -> Optional[JournalTaskRepository]:
+    """Open the journal repository, or explain why it is not available."""
+    repo = create_repository()
+    if not isinstance(repo, JournalTaskRepository):
+        print("The task journal is only used by the journal backend.")
+        print("  To enable: python3 -m cli storage convert journal")
+        return None
+    return repo
+
+
+def storage_compact_command():
+    """Snapshot the journal state and rotate the event log."""
+    repo = _open_journal()
+    if not repo:
+        return 1
+    repo.compact()
+    print(f"\033[92m✓ Journal compacted ({len(repo.load_all())} tasks)\033[0m")
+    return 0
+
+
+def storage_history_command(task_id: str):
+    """Print every journal record for a task."""
+    repo = _open_journal()
+    if not repo:
+        return 1
+
+    records = repo.history(task_id)
+    if not records:
+        print(f"No journal history for {task_id}")
+        return 1
+
+    print(f"\n\033[1mHistory: {task_id}\033[0m")
+    for record in records:
+        fields = record.get("fields", {})
+        detail = ""
+        if record["event"] != "created":
+            detail = ", ".join(f"{k}={v}" for k, v in sorted(fields.items()))
+        print(f"  {record['ts']}  {record['event']:<10} {detail}")
+    return 0
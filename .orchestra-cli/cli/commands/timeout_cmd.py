@@ -8,14 +8,14 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from cli.core.models import TaskStatus
-from cli.core.repository import TaskRepository
+from cli.core.repository import create_repository
 from cli.utils.process import kill_process
 from cli.utils.time_utils import format_duration
 
 
 def timeout_immediate(task_id: str):
     """Immediately terminate a task as timed out."""
-    repo = TaskRepository()
+    repo = create_repository()
 
     # Validate task
     task = repo.get_task(task_id)
@@ -41,9 +41,10 @@ def timeout_immediate(task_id: str):
         print(f"Warning: Failed to terminate PID {task.pid} (may already be dead).")
 
     # Create .timeout sentinel file
-    timeout_file = repo.tasks_dir / f"{task_id}.timeout"
-    timeout_file.write_text(
-        f'{{"timeout": "manual", "timestamp": "{datetime.now().isoformat()}"}}'
+    repo.write_sentinel_file(
+        task_id,
+        "timeout",
+        f'{{"timeout": "manual", "timestamp": "{datetime.now().isoformat()}"}}',
     )
 
     print(
@@ -53,21 +54,26 @@ def timeout_immediate(task_id: str):
 
 def timeout_list():
     """List all tasks with timeouts."""
-    repo = TaskRepository()
-    all_tasks = repo.list_tasks()
-
-    # Filter tasks with timeouts
-    timeout_tasks = [t for t in all_tasks if t.timeout is not None]
-
-    if not timeout_tasks:
-        print("No tasks with timeouts found.")
-        return
-
-    # Build table
-    print("\n| ID         | Status | Timeout | Elapsed | Remaining | State |")
-    print("|------------|--------|---------|---------|-----------|-------|")
+    repo = create_repository()
+
+    # Stream tasks; rows are printed as they are decoded
+    total = running = timed_out = 0
+    for task in repo.iter_tasks():
+        if task.timeout is None:
+            continue
+
+        if total == 0:
+            # Build table
+            print("\n| ID         | Status | Timeout | Elapsed | Remaining | State |")
+            print("|------------|--------|---------|---------|-----------|-------|")
+        total += 1
+        if task.status == TaskStatus.RUNNING:
+            running += 1
+        elif task.status == TaskStatus.FAILED and "timeout" in (
+            task.errorMessage or ""
+        ):
+            timed_out += 1
 
-    for task in timeout_tasks:
         task_id = task.taskId[:12] + "..." if len(task.taskId) > 12 else task.taskId
 
         # Status icon
@@ -111,15 +117,11 @@ def timeout_list():
             f"| {task_id:<10} | {status_icon:<6} | {timeout_str:<7} | {elapsed_str:<7} | {remaining_str:<9} | {state_str:<5} |"
         )
 
-    # Summary
-    total = len(timeout_tasks)
-    running = sum(1 for t in timeout_tasks if t.status == TaskStatus.RUNNING)
-    timed_out = sum(
-        1
-        for t in timeout_tasks
-        if t.status == TaskStatus.FAILED and "timeout" in (t.errorMessage or "")
-    )
+    if total == 0:
+        print("No tasks with timeouts found.")
+        return
 
+    # Summary
     print(
         f"\nTotal with timeouts: {total} | Running: {running} | Timed out: {timed_out}"
     )
@@ -127,7 +129,7 @@ def timeout_list():
 
 def timeout_extend(task_id: str, seconds: int):
     """Extend timeout for a task (metadata only - cannot extend running process)."""
-    repo = TaskRepository()
+    repo = create_repository()
 
     # Validate task
     task = repo.get_task(task_id)
@@ -150,9 +152,17 @@ def timeout_extend(task_id: str, seconds: int):
 
     # Update metadata (for pending tasks or documentation)
     old_timeout = task.timeout or 0
-    new_timeout = old_timeout + seconds
-    task.timeout = new_timeout
-    repo.save_task(task)
+
+    def extend(current):
+        if current.status == TaskStatus.RUNNING:
+            return False
+        current.timeout = (current.timeout or 0) + seconds
+
+    task = repo.update(task_id, extend)
+    if not task:
+        print(f"Error: Task {task_id} started running; timeout not changed.")
+        sys.exit(1)
+    new_timeout = task.timeout
 
     print(
         f"Updated timeout for task {task_id}: {format_duration(old_timeout)} → {format_duration(new_timeout)}"
@@ -0,0 +1,206 @@
+"""Load-aware admission control for task launches."""
+
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.config import AdmissionConfig, OrchestratorConfig
+from cli.utils.logger import logger
+
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+
+
+@dataclass
+class HostLoad:
+    """One sample of host load. None/missing means the source is unavailable."""
+
+    load_per_cpu: Optional[float] = None
+    available_mb: Optional[float] = None
+    # "some avg10" stall percentage per PSI resource (cpu, memory, io)
+    pressure: Dict[str, float] = field(default_factory=dict)
+
+    def describe(self) -> str:
+        """Short human-readable summary."""
+        parts = []
+        if self.load_per_cpu is not None:
+            parts.append(f"load/cpu {self.load_per_cpu:.2f}")
+        if self.available_mb is not None:
+            parts.append(f"mem avail {self.available_mb:.0f} MB")
+        for resource in PRESSURE_RESOURCES:
+            if resource in self.pressure:
+                parts.append(f"{resource} psi {self.pressure[resource]:.1f}%")
+        return ", ".join(parts) or "no load data"
+
+
+def parse_meminfo(text: str) -> Optional[float]:
+    """MemAvailable from /proc/meminfo contents, in MB (None if absent)."""
+    for line in text.splitlines():
+        if line.startswith("MemAvailable:"):
+            fields = line.split()
+            try:
+                return int(fields[1]) / 1024
+            except (IndexError, ValueError):
+                return None
+    return None
+
+
+def parse_pressure(text: str) -> Optional[float]:
+    """The "some avg10" value from a PSI file's contents (None if absent)."""
+    for line in text.splitlines():
+        fields = line.split()
+        if not fields or fields[0] != "some":
+            continue
+        for item in fields[1:]:
+            key, _, value = item.partition("=")
+            if key == "avg10":
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+    return None
+
+
+class AdmissionController:
+    """
+    Decides whether the host has room for another task launch.
+
+    Before each launch the controller samples the 1-minute load average
+    (per CPU), MemAvailable from /proc/meminfo and the cgroup v2 pressure
+    stall information of the orchestrator's own cgroup (falling back to
+    the system-wide /proc/pressure files). A launch is deferred while any
+    enabled threshold in the admission config is exceeded; sources that
+    don't exist on this host (e.g. non-Linux) are skipped.
+
+    Deferral reasons are counted per check (cpu-load, memory, cpu-pressure,
+    memory-pressure, io-pressure) and logged when launches stop and resume.
+    """
+
+    def __init__(
+        self,
+        config: Optional[AdmissionConfig] = None,
+        proc_root: Path = Path("/proc"),
+        cgroup_root: Path = Path("/sys/fs/cgroup"),
+    ):
+        self.config = config or OrchestratorConfig.load().admission
+        self.proc_root = proc_root
+        self.cgroup_root = cgroup_root
+        self.cpu_count = os.cpu_count() or 1
+        self._pressure_dir = self._find_pressure_dir()
+
+        # Deferred launch checks per reason, and the current deferral
+        self.deferrals: Counter = Counter()
+        self.deferred_since: Optional[float] = None
+        self.last_reason: Optional[str] = None
+
+    def _find_pressure_dir(self) -> Optional[Path]:
+        """Directory with this process's cgroup v2 *.pressure files, if any."""
+        try:
+            lines = (self.proc_root / "self" / "cgroup").read_text().splitlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            # cgroup v2 entry: "0::/path/of/cgroup"
+            if line.startswith("0::"):
+                path = self.cgroup_root / line[3:].strip().lstrip("/")
+                if (path / "cpu.pressure").exists():
+                    return path
+        system = self.proc_root / "pressure"
+        if (system / "cpu").exists():
+            return system
+        return None
+
+    def _pressure_file(self, resource: str) -> Path:
+        """PSI file for a resource in the pressure directory."""
+        if self._pressure_dir == self.proc_root / "pressure":
+            return self._pressure_dir / resource
+        return self._pressure_dir / f"{resource}.pressure"
+
+    def sample(self) -> HostLoad:
+        """Read the current host load from every available source."""
+        load = HostLoad()
+        try:
+            load.load_per_cpu = os.getloadavg()[0] / self.cpu_count
+        except (AttributeError, OSError):
+            pass
+        try:
+            load.available_mb = parse_meminfo(
+                (self.proc_root / "meminfo").read_text()
+            )
+        except OSError:
+            pass
+        if self._pressure_dir is not None:
+            for resource in PRESSURE_RESOURCES:
+                try:
+                    value = parse_pressure(self._pressure_file(resource).read_text())
+                except OSError:
+                    continue
+                if value is not None:
+                    load.pressure[resource] = value
+        return load
+
+    def deferral_reason(self, load: HostLoad) -> Optional[str]:
+        """Why a launch should wait under this load, or None to admit it."""
+        config = self.config
+        if (
+            config.max_load_per_cpu
+            and load.load_per_cpu is not None
+            and load.load_per_cpu > config.max_load_per_cpu
+        ):
+            return (
+                f"cpu-load: {load.load_per_cpu:.2f} per CPU "
+                f"> {config.max_load_per_cpu:g}"
+            )
+        if (
+            config.min_available_mb
+            and load.available_mb is not None
+            and load.available_mb < config.min_available_mb
+        ):
+            return (
+                f"memory: {load.available_mb:.0f} MB available "
+                f"< {config.min_available_mb:g} MB"
+            )
+        for resource in PRESSURE_RESOURCES:
+            limit = getattr(config, f"max_{resource}_pressure")
+            value = load.pressure.get(resource)
+            if limit and value is not None and value > limit:
+                return f"{resource}-pressure: {value:.1f}% stalled > {limit:g}%"
+        return None
+
+    def admit(self) -> bool:
+        """
+        Check whether another task may be launched now.
+
+        Returns False (and records the reason) if the host is over a
+        threshold.
+        """
+        if not self.config.enabled:
+            return True
+
+        load = self.sample()
+        reason = self.deferral_reason(load)
+        if reason is None:
+            if self.deferred_since is not None:
+                waited = time.time() - self.deferred_since
+                logger.info(
+                    f"Launches resumed after {waited:.0f}s ({load.describe()})"
+                )
+                self.deferred_since = None
+                self.last_reason = None
+            return True
+
+        check = reason.split(":")[0]
+        self.deferrals[check] += 1
+        if self.deferred_since is None:
+            self.deferred_since = time.time()
+        # Log when launches stop, or stop for a different check
+        if self.last_reason is None or not self.last_reason.startswith(check + ":"):
+            logger.warning(f"Deferring task launches: {reason} ({load.describe()})")
+        self.last_reason = reason
+        return False
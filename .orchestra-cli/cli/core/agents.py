@@ -0,0 +1,74 @@
+"""Agent configuration (agent-config.json)."""
+
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.rate_limit import RateLimit
+from cli.utils.logger import logger
+from cli.utils.paths import AGENT_CONFIG_PATH
+
+
+def load_agent_configs(path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load the "agents" section of agent-config.json.
+
+    Returns {} if the file is missing or invalid (with a warning).
+    """
+    config_path = path or AGENT_CONFIG_PATH
+    if not config_path.exists():
+        return {}
+    try:
+        with open(config_path) as f:
+            return json.load(f).get("agents", {})
+    except Exception as e:
+        logger.warning(f"Failed to load agent config: {e}")
+        return {}
+
+
+@dataclass
+class AgentLimits:
+    """Scheduling limits for one agent."""
+
+    # Tasks of this agent that may run at once (None = only the global limit)
+    max_concurrent: Optional[int] = None
+    # Share of launch slots relative to other agents with ready tasks
+    weight: float = 1.0
+    # Token bucket on launches (None = launch as fast as slots allow)
+    rate_limit: Optional[RateLimit] = None
+
+    @classmethod
+    def from_dict(cls, agent: str, data: dict) -> "AgentLimits":
+        """Create from an agent's config entry, ignoring invalid values."""
+        limits = cls()
+        max_concurrent = data.get("maxConcurrent")
+        if max_concurrent is not None:
+            if isinstance(max_concurrent, int) and max_concurrent >= 0:
+                limits.max_concurrent = max_concurrent
+            else:
+                logger.warning(f"Ignoring invalid maxConcurrent for {agent}")
+        weight = data.get("weight")
+        if weight is not None:
+            if isinstance(weight, (int, float)) and weight > 0:
+                limits.weight = float(weight)
+            else:
+                logger.warning(f"Ignoring invalid weight for {agent}")
+        if data.get("rateLimit") is not None:
+            limits.rate_limit = RateLimit.from_dict(agent, data["rateLimit"])
+        return limits
+
+
+def load_agent_limits(
+    configs: Optional[Dict[str, Any]] = None
+) -> Dict[str, AgentLimits]:
+    """Scheduling limits per configured agent (from agent-config.json by default)."""
+    if configs is None:
+        configs = load_agent_configs()
+    return {
+        agent: AgentLimits.from_dict(agent, data) for agent, data in configs.items()
+    }
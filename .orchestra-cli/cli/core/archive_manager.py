@@ -2,7 +2,7 @@
 
 import shutil
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Tuple, Optional
 
@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from cli.core.models import Task, TaskStatus
 from cli.core.repository import TaskRepository
 from cli.core.config import OrchestratorConfig
+from cli.core.serialization import decode_task, detect_format, encode_task
 from cli.utils.logger import logger
 
 
@@ -30,14 +31,20 @@ class ArchiveManager:
         now = datetime.now()
         archivable = []
 
-        for task in self.repo.load_all():
-            if task.status == TaskStatus.COMPLETE:
+        # The repository's completedAt index yields only tasks finished
+        # before each cutoff; the rest are never read.
+        groups = [
+            ((TaskStatus.COMPLETE,), self.config.archive.max_completed_age_days),
+            (
+                (TaskStatus.FAILED, TaskStatus.CANCELLED),
+                self.config.archive.max_failed_age_days,
+            ),
+        ]
+        for statuses, max_age_days in groups:
+            cutoff = now - timedelta(days=max_age_days)
+            for task in self.repo.iter_completed_before(cutoff, *statuses):
                 age = now - (task.completedAt or task.createdAt)
-                if age.days >= self.config.archive.max_completed_age_days:
-                    archivable.append(task)
-            elif task.status in (TaskStatus.FAILED, TaskStatus.CANCELLED):
-                age = now - (task.completedAt or task.createdAt)
-                if age.days >= self.config.archive.max_failed_age_days:
+                if age.days >= max_age_days:
                     archivable.append(task)
 
         return archivable
@@ -49,7 +56,7 @@ class ArchiveManager:
 
             # Archive task JSON
             archive_path = self.archive_dir / f"{task.taskId}.json"
-            archive_path.write_text(task.model_dump_json(indent=2))
+            archive_path.write_text(encode_task(task, self.config.storage.format))
 
             # Archive plan and log files
             for src in [Path(task.planFile), Path(task.logFile)]:
@@ -71,13 +78,15 @@ class ArchiveManager:
             return 0, 0
 
         tasks = self.get_archivable_tasks()
-        archived = sum(1 for t in tasks if self.archive_task(t))
+        # Copies happen per task; the deletes are group-committed at the end
+        with self.repo.transaction():
+            archived = sum(1 for t in tasks if self.archive_task(t))
         errors = len(tasks) - archived
         return archived, errors
 
     def check_queue_size(self) -> bool:
         """Check if queue size exceeds limit. Returns True if OK."""
-        current_size = len(self.repo.load_all())
+        current_size = sum(self.repo.count_by_status().values())
         limit = self.config.archive.max_queue_size
 
         if current_size >= limit:
@@ -88,6 +97,26 @@ class ArchiveManager:
             return False
         return True
 
+    def migrate_archive(self, task_format: str) -> int:
+        """Rewrite archived task files in ``task_format``. Returns files rewritten."""
+        if not self.archive_dir.exists():
+            return 0
+
+        migrated = 0
+        for path in sorted(self.archive_dir.glob("*.json")):
+            try:
+                data = path.read_text()
+                if detect_format(data) == task_format:
+                    continue
+                task = decode_task(data)
+                temp_path = path.with_suffix(".tmp")
+                temp_path.write_text(encode_task(task, task_format))
+                temp_path.replace(path)
+                migrated += 1
+            except Exception as e:
+                logger.warning(f"Skipping archived file {path}: {e}")
+        return migrated
+
     def get_archive_stats(self) -> dict:
         """Get statistics about archived tasks."""
         if not self.archive_dir.exists():
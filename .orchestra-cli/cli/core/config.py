@@ -42,11 +42,162 @@ class ArchiveConfig:
         }
 
 
+@dataclass
+class StorageConfig:
+    """Task storage backend settings."""
+
+    BACKENDS = ("json", "sqlite", "journal")
+    LAYOUTS = ("flat", "sharded")
+    FORMATS = ("json", "compact")
+
+    backend: str = "json"
+    layout: str = "flat"
+    format: str = "json"
+    sqlite_path: str = ".orchestra/tasks.db"
+    journal_dir: str = ".orchestra/journal"
+    journal_compact_every: int = 1000
+    # Threads reading task files on a cold load (0 = auto, 1 = sequential)
+    load_workers: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StorageConfig":
+        """Create from dictionary."""
+        return cls(
+            backend=data.get("backend", "json"),
+            layout=data.get("layout", "flat"),
+            format=data.get("format", "json"),
+            sqlite_path=data.get("sqlite_path", ".orchestra/tasks.db"),
+            journal_dir=data.get("journal_dir", ".orchestra/journal"),
+            journal_compact_every=data.get("journal_compact_every", 1000),
+            load_workers=data.get("load_workers", 0),
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "backend": self.backend,
+            "layout": self.layout,
+            "format": self.format,
+            "sqlite_path": self.sqlite_path,
+            "journal_dir": self.journal_dir,
+            "journal_compact_every": self.journal_compact_every,
+            "load_workers": self.load_workers,
+        }
+
+
+@dataclass
+class SchedulerConfig:
+    """Task scheduling settings."""
+
+    POLICIES = ("priority", "critical_path")
+
+    # Seconds of pending time that add one level of effective priority
+    # (0 = strict priority order, which can starve low-priority tasks)
+    aging_interval: int = 600
+    # critical_path: prefer ready tasks that gate the longest chains of
+    # dependent work; priority: order by priority and age only
+    policy: str = "critical_path"
+    # Seconds before its latest start time at which a task with a deadline
+    # is launched ahead of priority order (0 = deadlines are only flagged)
+    deadline_slack: int = 1800
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SchedulerConfig":
+        """Create from dictionary."""
+        return cls(
+            aging_interval=data.get("aging_interval", 600),
+            policy=data.get("policy", "critical_path"),
+            deadline_slack=data.get("deadline_slack", 1800),
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "aging_interval": self.aging_interval,
+            "policy": self.policy,
+            "deadline_slack": self.deadline_slack,
+        }
+
+
+@dataclass
+class AdmissionConfig:
+    """Load-aware admission control for task launches (0 = check off)."""
+
+    enabled: bool = True
+    # 1-minute load average divided by the CPU count
+    max_load_per_cpu: float = 2.0
+    # MemAvailable from /proc/meminfo
+    min_available_mb: int = 512
+    # PSI "some avg10": % of the last 10s in which some task was stalled
+    max_cpu_pressure: float = 0
+    max_memory_pressure: float = 20.0
+    max_io_pressure: float = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AdmissionConfig":
+        """Create from dictionary."""
+        return cls(
+            enabled=data.get("enabled", True),
+            max_load_per_cpu=data.get("max_load_per_cpu", 2.0),
+            min_available_mb=data.get("min_available_mb", 512),
+            max_cpu_pressure=data.get("max_cpu_pressure", 0),
+            max_memory_pressure=data.get("max_memory_pressure", 20.0),
+            max_io_pressure=data.get("max_io_pressure", 0),
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "enabled": self.enabled,
+            "max_load_per_cpu": self.max_load_per_cpu,
+            "min_available_mb": self.min_available_mb,
+            "max_cpu_pressure": self.max_cpu_pressure,
+            "max_memory_pressure": self.max_memory_pressure,
+            "max_io_pressure": self.max_io_pressure,
+        }
+
+
+@dataclass
+class CacheConfig:
+    """Result cache for tasks repeating earlier work (opt-in)."""
+
+    enabled: bool = False
+    # Seconds a stored result may be reused (0 = until evicted for size)
+    ttl_seconds: int = 604800
+    # Total size of stored logs and plans before the least recently used go
+    max_size_mb: int = 100
+    # Include git HEAD and uncommitted changes in the cache key
+    workspace_fingerprint: bool = True
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CacheConfig":
+        """Create from dictionary."""
+        return cls(
+            enabled=data.get("enabled", False),
+            ttl_seconds=data.get("ttl_seconds", 604800),
+            max_size_mb=data.get("max_size_mb", 100),
+            workspace_fingerprint=data.get("workspace_fingerprint", True),
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "max_size_mb": self.max_size_mb,
+            "workspace_fingerprint": self.workspace_fingerprint,
+        }
+
+
 @dataclass
 class OrchestratorConfig:
     """Main configuration."""
 
     archive: ArchiveConfig = field(default_factory=ArchiveConfig)
+    storage: StorageConfig = field(default_factory=StorageConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    admission: AdmissionConfig = field(default_factory=AdmissionConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
 
     @classmethod
     def load(cls, path: Optional[Path] = None) -> "OrchestratorConfig":
@@ -57,7 +208,15 @@ class OrchestratorConfig:
                 with open(config_path) as f:
                     data = json.load(f)
                     return cls(
-                        archive=ArchiveConfig.from_dict(data.get("archive", {}))
+                        archive=ArchiveConfig.from_dict(data.get("archive", {})),
+                        storage=StorageConfig.from_dict(data.get("storage", {})),
+                        scheduler=SchedulerConfig.from_dict(
+                            data.get("scheduler", {})
+                        ),
+                        admission=AdmissionConfig.from_dict(
+                            data.get("admission", {})
+                        ),
+                        cache=CacheConfig.from_dict(data.get("cache", {})),
                     )
             except Exception as e:
                 print(f"Warning: Failed to load config from {config_path}: {e}")
@@ -69,7 +228,17 @@ class OrchestratorConfig:
         config_path = path or Path(".orchestra/config.json")
         config_path.parent.mkdir(parents=True, exist_ok=True)
         with open(config_path, "w") as f:
-            json.dump({"archive": self.archive.to_dict()}, f, indent=2)
+            json.dump(self.to_dict(), f, indent=2)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "archive": self.archive.to_dict(),
+            "storage": self.storage.to_dict(),
+            "scheduler": self.scheduler.to_dict(),
+            "admission": self.admission.to_dict(),
+            "cache": self.cache.to_dict(),
+        }
 
     @classmethod
     def create_default(cls, path: Optional[Path] = None) -> "OrchestratorConfig":
@@ -3,16 +3,90 @@
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Set, Tuple, Optional
 
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.models import Task, TaskStatus
+from cli.core.models import Task, TaskHeader, TaskStatus
 from cli.core.repository import TaskRepository
 from cli.utils.logger import logger
 
 
+class DependencyGraph:
+    """
+    Pending tasks waiting on dependencies, with reverse edges.
+
+    Each waiting task has a counter of dependencies that are not complete
+    yet, and each such dependency lists the waiting tasks that depend on
+    it. When a dependency finishes only its direct dependents are touched,
+    so settling a completion is O(out-degree) however large the DAG is.
+    """
+
+    def __init__(self):
+        self.waiting: Dict[str, TaskHeader] = {}
+        # Waiting task ID -> number of dependencies not complete yet
+        self.remaining: Dict[str, int] = {}
+        # Dependency ID -> waiting tasks that depend on it
+        self.dependents: Dict[str, Set[str]] = {}
+        # Bumped on every change to the edges
+        self.version = 0
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.waiting
+
+    def __len__(self) -> int:
+        return len(self.waiting)
+
+    def add(self, header: TaskHeader, unmet: Iterable[str]):
+        """Start waiting on a task's unmet dependencies (non-empty)."""
+        self.discard(header.taskId)
+        unmet = set(unmet)
+        self.version += 1
+        self.waiting[header.taskId] = header
+        self.remaining[header.taskId] = len(unmet)
+        for dep_id in unmet:
+            self.dependents.setdefault(dep_id, set()).add(header.taskId)
+
+    def discard(self, task_id: str) -> Optional[TaskHeader]:
+        """Stop tracking a waiting task (no-op if it isn't waiting)."""
+        header = self.waiting.pop(task_id, None)
+        if header is None:
+            return None
+        self.version += 1
+        del self.remaining[task_id]
+        for dep_id in header.dependsOn:
+            dependents = self.dependents.get(dep_id)
+            if dependents is not None:
+                dependents.discard(task_id)
+                if not dependents:
+                    del self.dependents[dep_id]
+        return header
+
+    def open_dependencies(self) -> List[str]:
+        """IDs of the dependencies some waiting task still needs."""
+        return list(self.dependents)
+
+    def complete(self, dep_id: str) -> List[TaskHeader]:
+        """Record that a dependency completed; return the tasks it released."""
+        released = []
+        self.version += 1
+        for task_id in self.dependents.pop(dep_id, ()):
+            self.remaining[task_id] -= 1
+            if self.remaining[task_id] == 0:
+                released.append(self.discard(task_id))
+        return released
+
+    def drop_dependents(self, dep_id: str) -> List[TaskHeader]:
+        """
+        Stop tracking (and return) the tasks depending on a dependency.
+
+        Used when the dependency failed, was cancelled or disappeared, so
+        its dependents can be re-evaluated (and blocked).
+        """
+        return [self.discard(task_id) for task_id in self.dependents.pop(dep_id, ())]
+
+
 class DependencyResolver:
     """Resolves task dependencies and detects cycles."""
 
@@ -22,9 +96,9 @@ class DependencyResolver:
     def build_dependency_graph(self) -> Dict[str, Set[str]]:
         """Build a dependency graph from all tasks."""
         graph = defaultdict(set)
-        for task in self.repo.load_all():
-            for dep_id in task.dependsOn:
-                graph[task.taskId].add(dep_id)
+        for header in self.repo.load_headers():
+            for dep_id in header.dependsOn:
+                graph[header.taskId].add(dep_id)
         return graph
 
     def detect_cycle(self, new_task_id: Optional[str] = None, new_deps: Optional[List[str]] = None) -> Optional[List[str]]:
@@ -67,61 +141,116 @@ class DependencyResolver:
                 return result
         return None
 
+    def get_ready_headers(self) -> List[TaskHeader]:
+        """
+        Get headers of pending tasks whose dependencies are all satisfied.
+
+        Works on headers only; a full Task is loaded just for tasks that
+        become blocked (so the block can be saved).
+        """
+        # Only pending tasks are candidates; dependencies are looked up by ID
+        # (memoized) so indexed backends never need a full scan here.
+        pending = self.repo.load_headers(TaskStatus.PENDING)
+        lookup = self.header_lookup({h.taskId: h for h in pending})
+
+        # Blocked-task updates are written in one group commit
+        with self.repo.transaction():
+            return [h for h in pending if self.evaluate(h, lookup) == "ready"]
+
+    def header_lookup(
+        self, known: Optional[Dict[str, TaskHeader]] = None
+    ) -> Callable[[str], Optional[TaskHeader]]:
+        """Return a memoized task ID -> header lookup (seeded with ``known``)."""
+        known = dict(known or {})
+
+        def lookup(task_id: str) -> Optional[TaskHeader]:
+            if task_id not in known:
+                known[task_id] = self.repo.load_header(task_id)
+            return known[task_id]
+
+        return lookup
+
+    def evaluate(
+        self,
+        header: TaskHeader,
+        lookup: Optional[Callable[[str], Optional[TaskHeader]]] = None,
+    ) -> str:
+        """
+        Classify a pending task by its dependencies.
+
+        Returns "ready" (all dependencies complete), "waiting" (some still
+        pending or running) or "blocked". A failed, cancelled or missing
+        dependency blocks the task, which is saved.
+        """
+        unmet = self.unmet_dependencies(header, lookup)
+        if unmet is None:
+            return "blocked"
+        return "waiting" if unmet else "ready"
+
+    def unmet_dependencies(
+        self,
+        header: TaskHeader,
+        lookup: Optional[Callable[[str], Optional[TaskHeader]]] = None,
+    ) -> Optional[List[str]]:
+        """
+        IDs of a pending task's dependencies that are still pending or running.
+
+        Returns None if the task is blocked; a failed, cancelled or missing
+        dependency blocks it (and the block is saved).
+        """
+        # Skip if already blocked
+        if header.is_blocked:
+            return None
+
+        lookup = lookup or self.header_lookup()
+        unmet = []
+        for dep_id in dict.fromkeys(header.dependsOn):
+            dep = lookup(dep_id)
+            block_reason = None
+            if not dep:
+                logger.warning(f"Task {header.taskId} depends on missing task {dep_id}")
+                block_reason = f"Dependency {dep_id} not found"
+            elif dep.status == TaskStatus.COMPLETE:
+                continue
+            elif dep.status == TaskStatus.FAILED:
+                # Dependency failed - mark this task as blocked
+                block_reason = f"Dependency {dep_id} failed"
+            elif dep.status == TaskStatus.CANCELLED:
+                # Dependency cancelled - mark this task as blocked
+                block_reason = f"Dependency {dep_id} cancelled"
+
+            if block_reason:
+                self._block(header, dep_id, block_reason)
+                return None
+            # Dependency not yet complete
+            unmet.append(dep_id)
+
+        return unmet
+
     def get_ready_tasks(self) -> List[Task]:
         """Get tasks whose dependencies are all satisfied."""
-        ready = []
-        all_tasks = {t.taskId: t for t in self.repo.load_all()}
+        tasks = []
+        for header in self.get_ready_headers():
+            task = self.repo.load(header.taskId)
+            if task:
+                tasks.append(task)
+        return tasks
 
-        for task in all_tasks.values():
-            if task.status != TaskStatus.PENDING:
-                continue
+    def _block(self, header: TaskHeader, dep_id: str, reason: str):
+        """
+        Record that a pending task is blocked by a dependency.
 
-            # Skip if already blocked
-            if task.is_blocked:
-                continue
+        Saved with a version check, so a task cancelled or launched since
+        the header was read is left as it is.
+        """
+
+        def mutate(current: Task):
+            if current.status != TaskStatus.PENDING:
+                return False
+            current.blockedBy = dep_id
+            current.blockedReason = reason
 
-            # Check all dependencies
-            deps_satisfied = True
-            blocking_task = None
-
-            for dep_id in task.dependsOn:
-                dep_task = all_tasks.get(dep_id)
-                if not dep_task:
-                    logger.warning(
-                        f"Task {task.taskId} depends on missing task {dep_id}"
-                    )
-                    task.blockedBy = dep_id
-                    task.blockedReason = f"Dependency {dep_id} not found"
-                    self.repo.save(task)
-                    deps_satisfied = False
-                    break
-
-                if dep_task.status == TaskStatus.COMPLETE:
-                    continue
-                elif dep_task.status == TaskStatus.FAILED:
-                    # Dependency failed - mark this task as blocked
-                    task.blockedBy = dep_id
-                    task.blockedReason = f"Dependency {dep_id} failed"
-                    self.repo.save(task)
-                    deps_satisfied = False
-                    break
-                elif dep_task.status == TaskStatus.CANCELLED:
-                    # Dependency cancelled - mark this task as blocked
-                    task.blockedBy = dep_id
-                    task.blockedReason = f"Dependency {dep_id} cancelled"
-                    self.repo.save(task)
-                    deps_satisfied = False
-                    break
-                else:
-                    # Dependency not yet complete
-                    deps_satisfied = False
-                    blocking_task = dep_id
-                    break
-
-            if deps_satisfied:
-                ready.append(task)
-
-        return ready
+        self.repo.update(header.taskId, mutate)
 
     def validate_new_dependency(
         self, task_id: str, depends_on: List[str]
@@ -134,7 +263,7 @@ class DependencyResolver:
 
     def get_dependency_chain(self, task_id: str) -> List[str]:
         """Get the full dependency chain for a task."""
-        all_tasks = {t.taskId: t for t in self.repo.load_all()}
+        all_tasks = {h.taskId: h for h in self.repo.load_headers()}
         task = all_tasks.get(task_id)
         if not task:
             return []
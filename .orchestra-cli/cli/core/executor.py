@@ -1,18 +1,20 @@
 """Task execution - launching sub-agents."""
 
-import json
 import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.models import Task
+from cli.core.agents import load_agent_configs
+from cli.core.models import Task, TaskStatus
+from cli.core.rate_limit import RateLimiter
 from cli.core.repository import TaskRepository
-from cli.utils.process import get_os_name
+from cli.core.result_cache import ResultCache
+from cli.utils.process import get_os_name, kill_process
 from cli.utils.paths import AGENT_CONFIG_PATH
 from cli.utils.logger import logger
 
@@ -20,9 +22,18 @@ from cli.utils.logger import logger
 class Executor:
     """Executes tasks by launching sub-agents."""
 
-    def __init__(self, repo: TaskRepository):
+    def __init__(
+        self,
+        repo: TaskRepository,
+        cache: Optional[ResultCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         self.repo = repo
         self.agent_configs = self._load_agent_configs()
+        # Opt-in: None unless cache.enabled is set in the config
+        self.cache = cache or ResultCache.for_repository(repo)
+        # Launches take a token here (usually the scheduler's limiter)
+        self.rate_limiter = rate_limiter
 
     def _load_agent_configs(self) -> Dict[str, Any]:
         """Load agent configurations from JSON file."""
@@ -32,17 +43,12 @@ class Executor:
             )
             return {}
 
-        try:
-            with open(AGENT_CONFIG_PATH) as f:
-                config = json.load(f)
-                agents = config.get("agents", {})
-                logger.info(
-                    f"Loaded {len(agents)} agent configurations from {AGENT_CONFIG_PATH}"
-                )
-                return agents
-        except Exception as e:
-            logger.warning(f"Failed to load agent config: {e}")
-            return {}
+        agents = load_agent_configs()
+        if agents:
+            logger.info(
+                f"Loaded {len(agents)} agent configurations from {AGENT_CONFIG_PATH}"
+            )
+        return agents
 
     def _build_command(self, task: Task) -> List[str]:
         """
@@ -110,9 +116,30 @@ class Executor:
 
             return ["opencode", "run", prompt, "--agent", task.agent]
 
+    def cache_key(self, task: Task) -> str:
+        """
+        Result cache key of a task: its agent and rendered command.
+
+        The sentinel paths (whose shard directory depends on the ID in the
+        sharded layout) and then the task ID (which also names the plan and
+        log) are replaced by placeholders, so tasks that differ only in ID
+        share a key.
+        """
+        placeholders = {
+            str(self.repo.sentinel_path(task.taskId, kind)): f"{{{kind}File}}"
+            for kind in ("done", "error")
+        }
+        command = []
+        for arg in self._build_command(task):
+            for path, placeholder in placeholders.items():
+                arg = arg.replace(path, placeholder)
+            command.append(arg.replace(task.taskId, "{taskId}"))
+        return self.cache.key(task.agent, command)
+
     def _build_basic_prompt(self, task: Task) -> str:
         """Build basic prompt (current behavior)."""
-        return f"Your Task ID is {task.taskId}. Task: {task.prompt}. Signal completion by creating .orchestra/tasks/{task.taskId}.done"
+        done_file = self.repo.sentinel_path(task.taskId, "done")
+        return f"Your Task ID is {task.taskId}. Task: {task.prompt}. Signal completion by creating {done_file}"
 
     def _load_prompt_template(self, template_file: str, task: Task) -> str:
         """
@@ -150,6 +177,8 @@ class Executor:
         - {planFile}: Path to plan file
         - {logFile}: Path to log file
         - {agent}: Agent name
+        - {doneFile}: Path of the completion sentinel to create
+        - {errorFile}: Path of the error sentinel to create
 
         Args:
             template: Template string with {variable} placeholders
@@ -165,11 +194,121 @@ class Executor:
                 planFile=task.planFile,
                 logFile=task.logFile,
                 agent=task.agent,
+                doneFile=self.repo.sentinel_path(task.taskId, "done"),
+                errorFile=self.repo.sentinel_path(task.taskId, "error"),
             )
         except KeyError as e:
             logger.warning(f"Template variable {e} not found, using basic prompt")
             return self._build_basic_prompt(task)
 
+    def start_task(self, task: Task) -> bool:
+        """
+        Claim a pending task, launch it and record its PID.
+
+        The claim is a compare-and-swap from the version the task was loaded
+        at, so two launchers (daemon and ``run``) cannot both start it. If the
+        task is cancelled between launch and recording the PID, the new
+        process is killed.
+
+        With the result cache enabled, a task whose key matches a stored
+        result gets that log and plan and is completed without a launch
+        (``cachedFrom`` is set).
+
+        With a rate limiter, the launch takes a token from the agent's
+        bucket. If another launcher emptied it since the task was picked,
+        the claim is released and the task stays pending.
+
+        Returns:
+            True if the task was launched or completed from the cache, False
+            if another writer got there first (the task is left untouched)
+            or the agent's bucket is empty
+
+        Raises:
+            Exception: If the launch fails (the task is marked FAILED first)
+        """
+        expected = task.version
+        task.status = TaskStatus.RUNNING
+        task.startedAt = datetime.now()
+        if self.cache:
+            task.resultKey = self.cache_key(task)
+        if not self.repo.save_if_version(task, expected):
+            logger.info(f"Task {task.taskId} was claimed or changed; skipping")
+            return False
+
+        if self.cache and self._complete_from_cache(task):
+            return True
+
+        if self.rate_limiter and not self.rate_limiter.take(task.agent):
+            logger.info(f"Rate limit reached for {task.agent}; {task.taskId} waits")
+            self._release_claim(task)
+            return False
+
+        try:
+            pid = self.launch_task(task)
+        except Exception as e:
+
+            def mark_failed(current: Task):
+                if current.status != TaskStatus.RUNNING:
+                    return False
+                current.status = TaskStatus.FAILED
+                current.errorMessage = str(e)
+
+            self.repo.update(task.taskId, mark_failed)
+            raise
+
+        def record_pid(current: Task):
+            if current.status != TaskStatus.RUNNING:
+                return False
+            current.pid = pid
+
+        saved = self.repo.update(task.taskId, record_pid)
+        if saved is None:
+            logger.warning(f"Task {task.taskId} was stopped during launch; killing")
+            kill_process(pid)
+            return False
+        task.pid = pid
+        task.version = saved.version
+        return True
+
+    def _release_claim(self, task: Task):
+        """Put a claimed task that was not launched back to PENDING."""
+
+        def release(current: Task):
+            if current.status != TaskStatus.RUNNING or current.pid:
+                return False
+            current.status = TaskStatus.PENDING
+            current.startedAt = None
+
+        saved = self.repo.update(task.taskId, release)
+        if saved is not None:
+            task.status = TaskStatus.PENDING
+            task.startedAt = None
+            task.version = saved.version
+
+    def _complete_from_cache(self, task: Task) -> bool:
+        """Complete a claimed task from a stored result. Returns True on a hit."""
+        source = self.cache.restore(task.resultKey, task)
+        if source is None:
+            return False
+
+        def mark_complete(current: Task):
+            if current.status != TaskStatus.RUNNING:
+                return False
+            current.status = TaskStatus.COMPLETE
+            current.completedAt = datetime.now()
+            current.cachedFrom = source
+
+        saved = self.repo.update(task.taskId, mark_complete)
+        if saved is None:
+            logger.warning(f"Task {task.taskId} was stopped during cache restore")
+            return False
+        logger.info(f"Task {task.taskId} completed from the cached result of {source}")
+        task.status = saved.status
+        task.completedAt = saved.completedAt
+        task.cachedFrom = source
+        task.version = saved.version
+        return True
+
     def launch_task(self, task: Task) -> int:
         """
         Launch a task in a detached process and handle timeout.
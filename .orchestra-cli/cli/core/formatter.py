@@ -1,10 +1,11 @@
 """Formatting utilities for displaying task information."""
 
 import sys
-from typing import List, Dict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
 
 from .models import Task, TaskStatus
-from ..utils.time_utils import format_elapsed
+from ..utils.time_utils import format_duration, format_elapsed
 
 
 class Formatter:
@@ -33,21 +34,33 @@ class Formatter:
         """Check if console supports Unicode."""
         return sys.stdout.encoding.lower() not in ("cp1252", "ascii", "cp437")
 
-    def print_task_table(self, tasks: List[Task]):
-        """Print a formatted table of tasks."""
-        if not tasks:
-            print("\033[93mNo tasks found\033[0m")  # Yellow
-            return
-
-        # Table header
-        print("\n" + "=" * 120)
-        print(
-            f"{'ID':<22} {'Agent':<8} {'Status':<10} {'Prompt':<40} {'Time':<15} {'Retry':<8} {'Error/Info':<30}"
-        )
-        print("=" * 120)
+    def print_task_table(
+        self,
+        tasks: Iterable[Task],
+        effective_priority: Optional[Callable[[Task], float]] = None,
+        deadline_risk: Optional[Callable[[Task], Optional[str]]] = None,
+    ):
+        """
+        Print a formatted table of tasks, streaming rows as they arrive.
+
+        With ``effective_priority`` (e.g. Scheduler.effective_priority),
+        pending tasks whose priority has aged show both values. With
+        ``deadline_risk`` (e.g. Scheduler.deadline_risk), tasks that miss
+        their deadline are flagged in the info column.
+        """
+        printed_header = False
 
         # Table rows
         for task in tasks:
+            if not printed_header:
+                # Table header
+                print("\n" + "=" * 138)
+                print(
+                    f"{'ID':<30} {'Agent':<8} {'Status':<10} {'Pri':<9} {'Prompt':<40} {'Time':<15} {'Retry':<8} {'Error/Info':<30}"
+                )
+                print("=" * 138)
+                printed_header = True
+
             # Format ID (use ASCII arrow for Windows)
             retry_prefix = ">" if not self._supports_unicode() else "↻"
             task_id = f"{retry_prefix} {task.taskId}" if task.is_retry else task.taskId
@@ -67,6 +80,14 @@ class Formatter:
                 icon = icons.get(task.status, "?")
                 status_str = f"{icon} {task.status.value}"
 
+            # Format priority (with the aged priority of pending tasks)
+            priority_str = str(task.priority)
+            if effective_priority:
+                effective = effective_priority(task)
+                if effective >= task.priority + 0.1:
+                    arrow = "→" if self._supports_unicode() else "->"
+                    priority_str += f"{arrow}{effective:.1f}"
+
             # Format time
             time_str = (
                 format_elapsed(task) if task.status == TaskStatus.RUNNING else "-"
@@ -78,11 +99,22 @@ class Formatter:
             )
 
             # Format error/info
+            risk = deadline_risk(task) if deadline_risk else None
             info_str = ""
             if task.is_blocked:
                 info_str = task.blockedReason[:30] if task.blockedReason else "blocked"
             elif task.status == TaskStatus.FAILED and task.errorMessage:
                 info_str = task.errorMessage[:30]
+            elif risk:
+                icon = "⚠" if self._supports_unicode() else "!"
+                info_str = f"{icon} {risk}"
+            elif task.deadline and task.status in (
+                TaskStatus.PENDING,
+                TaskStatus.RUNNING,
+            ):
+                info_str = f"due {task.deadline.strftime('%m-%d %H:%M')}"
+            elif task.cachedFrom:
+                info_str = "cached result"
             elif task.autoRetry and task.status == TaskStatus.FAILED:
                 info_str = "auto-retry pending"
             elif task.dependsOn:
@@ -95,14 +127,18 @@ class Formatter:
 
             # Print row
             print(
-                f"{task_id:<22} {task.agent:<8} {status_str:<10} {prompt_str:<40} {time_str:<15} {retry_str:<8} {info_str:<30}"
+                f"{task_id:<30} {task.agent:<8} {status_str:<10} {priority_str:<9} {prompt_str:<40} {time_str:<15} {retry_str:<8} {info_str:<30}"
             )
 
-        print("=" * 120 + "\n")
+        if not printed_header:
+            print("\033[93mNo tasks found\033[0m")  # Yellow
+            return
+
+        print("=" * 138 + "\n")
 
-    def print_summary(self, tasks: List[Task]):
-        """Print summary statistics."""
-        stats = self._calculate_stats(tasks)
+    def print_summary(self, counts: Dict[TaskStatus, int]):
+        """Print summary statistics from per-status counts."""
+        stats = self._calculate_stats(counts)
 
         print("\033[1mSummary:\033[0m")  # Bold
         print(f"  Total: {stats['total']}")
@@ -113,27 +149,32 @@ class Formatter:
         print(f"  Cancelled: {stats['cancelled']}")
         print()
 
-    def _calculate_stats(self, tasks: List[Task]) -> Dict[str, int]:
+    def print_rate_limits(self, limiter):
+        """Print the token bucket of each rate-limited agent (if any)."""
+        if not limiter.limits:
+            return
+        now = datetime.now()
+        print("\033[1mRate limits:\033[0m")  # Bold
+        for agent, limit in sorted(limiter.limits.items()):
+            tokens = limiter.tokens(agent, now)
+            line = (
+                f"  {agent}: {tokens:.1f}/{limit.burst} launches available "
+                f"({limit.per_minute:g}/min)"
+            )
+            next_at = limiter.next_token_at(agent, now)
+            if next_at:
+                wait = format_duration(max(int((next_at - now).total_seconds()), 1))
+                line += f" \033[93m- empty, next in {wait}\033[0m"  # Yellow
+            print(line)
+        print()
+
+    def _calculate_stats(self, counts: Dict[TaskStatus, int]) -> Dict[str, int]:
         """Calculate task statistics."""
-        stats = {
-            "total": len(tasks),
-            "pending": 0,
-            "running": 0,
-            "completed": 0,
-            "failed": 0,
-            "cancelled": 0,
+        return {
+            "total": sum(counts.values()),
+            "pending": counts.get(TaskStatus.PENDING, 0),
+            "running": counts.get(TaskStatus.RUNNING, 0),
+            "completed": counts.get(TaskStatus.COMPLETE, 0),
+            "failed": counts.get(TaskStatus.FAILED, 0),
+            "cancelled": counts.get(TaskStatus.CANCELLED, 0),
         }
-
-        for task in tasks:
-            if task.status == TaskStatus.PENDING:
-                stats["pending"] += 1
-            elif task.status == TaskStatus.RUNNING:
-                stats["running"] += 1
-            elif task.status == TaskStatus.COMPLETE:
-                stats["completed"] += 1
-            elif task.status == TaskStatus.FAILED:
-                stats["failed"] += 1
-            elif task.status == TaskStatus.CANCELLED:
-                stats["cancelled"] += 1
-
-        return stats
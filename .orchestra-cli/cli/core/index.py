@@ -1,145 +1,450 @@
 """Task index for faster lookups in large queues."""
 
+import heapq
 import json
+import os
 import sys
+from bisect import bisect_left, insort
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.models import Task, TaskStatus
+from cli.core.models import Task, TaskHeader, TaskStatus
+from cli.utils.locking import file_lock
 from cli.utils.logger import logger
+from cli.utils.paths import INDEX_PATH
+
+# Bumped when the index starts being maintained or stored differently; an
+# index with another schema is rebuilt instead of trusted.
+INDEX_SCHEMA = 5
+
+IndexedTask = Union[Task, TaskHeader]
+
+# (status, agent, priority, createdAt, completedAt, retryAt) recorded per
+# task ID; times are ISO strings (see TaskHeader.indexed_time), retryAt None
+# unless the task is due for an automatic retry at some point
+Entry = Tuple[str, str, int, str, str, Optional[str]]
+
+# Position of each of TaskHeader.TIME_FIELDS in an Entry
+TIME_SLOTS = {"createdAt": 3, "completedAt": 4, "retryAt": 5}
 
 
 class TaskIndex:
-    """Maintains an index of tasks for fast queries."""
+    """
+    Maintains an index of tasks for fast queries.
 
-    def __init__(self, index_path: Path = None):
-        self.path = index_path or Path(".orchestra/tasks/index.json")
-        self.data = self._load()
+    In memory the index is a dict of task ID -> Entry plus one set of IDs
+    per status, agent and priority, so those changes are O(1). For each
+    status it also keeps (time, task ID) lists sorted on createdAt,
+    completedAt and retryAt, so time-range queries (ordered_by()) are
+    bisects. On disk only the per-task entries are stored; the sets and
+    sorted lists are derived on load.
 
-    def _load(self) -> dict:
-        """Load index from file."""
-        if self.path.exists():
-            try:
-                with open(self.path) as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load index: {e}")
-        
-        return {
-            "by_status": {},
-            "by_agent": {},
-            "by_priority": {},
-            "count": 0,
-            "last_updated": None,
-        }
+    The JSON repository updates the index on every save and delete (see
+    TaskRepository._commit). Changes are applied under a lock file on top
+    of the latest copy on disk and only recorded in memory; flush() (run
+    when the outermost batch() ends) appends the changed entries to a log
+    next to the index (index.log), so a save costs one small append rather
+    than rewriting every entry. Other processes replay just the new log
+    lines. Every ``compact_every`` records the entries are written to a
+    new snapshot (index.json) and the log is started afresh.
+
+    The snapshot and its log share a generation number (the log's first
+    line), so a log left over from an older snapshot is never replayed.
+    """
+
+    def __init__(
+        self,
+        index_path: Path = None,
+        lock_path: Path = None,
+        compact_every: int = 1000,
+    ):
+        self.path = index_path or INDEX_PATH
+        self.lock_path = lock_path or self.path.with_suffix(".lock")
+        self.log_path = self.path.with_suffix(".log")
+        self.compact_every = compact_every
+        self.last_updated: Optional[str] = None
+        self._stat = None
+        self._schema = None
+        self._generation = 0
+        self._log_ino = None
+        self._log_pos = 0
+        self._log_records = 0
+        # task ID -> new entry (None if removed) since the last flush
+        self._changes: Dict[str, Optional[Entry]] = {}
+        self._rewrite = False
+        self._batch_depth = 0
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        """Drop all entries (in memory only)."""
+        self._entries: Dict[str, Entry] = {}
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        self._by_agent: Dict[str, Set[str]] = defaultdict(set)
+        self._by_priority: Dict[int, Set[str]] = defaultdict(set)
+        # (field, status) -> sorted [(time, task ID)]
+        self._by_time: Dict[Tuple[str, str], List[Tuple[str, str]]] = defaultdict(
+            list
+        )
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
 
-    def _save(self):
-        """Save index to file."""
+    def _load(self):
+        """Load the snapshot and its log (an unreadable or old index loads empty)."""
+        self._reset()
+        self._changes = {}
+        self._rewrite = False
+        self._stat = self._file_stat()
+        self._schema = None
+        self._generation = 0
+        self._log_ino = None
+        self._log_pos = 0
+        self._log_records = 0
+        if not self._stat:
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load index: {e}")
+            return
+
+        self._schema = data.get("schema")
+        self.last_updated = data.get("last_updated")
+        if self._schema != INDEX_SCHEMA:
+            return
+        self._generation = data.get("generation", 0)
+        for task_id, entry in data["tasks"].items():
+            self._link(task_id, tuple(entry), ordered=False)
+        self._sort_times()
+        self._replay()
+
+    def _log_header(self) -> bytes:
+        return json.dumps({"generation": self._generation}).encode() + b"\n"
+
+    def _replay(self):
+        """Apply log records appended since the last load or replay."""
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if st.st_ino == self._log_ino and st.st_size == self._log_pos:
+                return
+            # A log of another generation is already in the snapshot (or is
+            # being replaced by a compaction)
+            if f.readline() != self._log_header():
+                return
+            if st.st_ino != self._log_ino or st.st_size < self._log_pos:
+                self._log_ino = st.st_ino
+                self._log_pos = f.tell()
+            f.seek(self._log_pos)
+            for line in f:
+                # A line without newline is an append still in progress
+                if not line.endswith(b"\n"):
+                    break
+                self._log_pos += len(line)
+                try:
+                    task_id, entry = json.loads(line)
+                except ValueError as e:
+                    logger.warning(f"Skipping corrupt record in {self.log_path}: {e}")
+                    continue
+                self._unlink(task_id)
+                if entry is not None:
+                    self._link(task_id, tuple(entry))
+                self._log_records += 1
+            self.last_updated = datetime.fromtimestamp(st.st_mtime).isoformat()
+
+    def refresh(self):
+        """Apply changes made by other processes since the last load."""
+        if self._changes or self._rewrite:
+            return
+        if self._file_stat() != self._stat:
+            self._load()
+        elif self._schema == INDEX_SCHEMA:
+            self._replay()
+
+    @property
+    def is_current(self) -> bool:
+        """True if the index exists and is maintained by the repository."""
+        self.refresh()
+        return self._stat is not None and self._schema == INDEX_SCHEMA
+
+    def flush(self):
+        """Persist changes made since the index was loaded or last flushed."""
+        if not self._changes and not self._rewrite:
+            return
         try:
             self.path.parent.mkdir(parents=True, exist_ok=True)
-            self.data["last_updated"] = datetime.now().isoformat()
-            with open(self.path, "w") as f:
-                json.dump(self.data, f, indent=2)
+            self.last_updated = datetime.now().isoformat()
+            if (
+                self._rewrite
+                or self._stat is None
+                or self._schema != INDEX_SCHEMA
+                or self._log_records + len(self._changes) >= self.compact_every
+            ):
+                self._compact()
+            else:
+                self._append()
+            self._changes = {}
+            self._rewrite = False
         except Exception as e:
             logger.error(f"Failed to save index: {e}")
 
-    def add(self, task: Task):
-        """Add task to index."""
-        task_id = task.taskId
-        status = task.status.value
-        agent = task.agent
-        priority = task.priority
-
-        # Add to status index
-        if status not in self.data["by_status"]:
-            self.data["by_status"][status] = []
-        if task_id not in self.data["by_status"][status]:
-            self.data["by_status"][status].append(task_id)
-
-        # Add to agent index
-        if agent not in self.data["by_agent"]:
-            self.data["by_agent"][agent] = []
-        if task_id not in self.data["by_agent"][agent]:
-            self.data["by_agent"][agent].append(task_id)
-
-        # Add to priority index
-        priority_key = str(priority)
-        if priority_key not in self.data["by_priority"]:
-            self.data["by_priority"][priority_key] = []
-        if task_id not in self.data["by_priority"][priority_key]:
-            self.data["by_priority"][priority_key].append(task_id)
-
-        self.data["count"] = self._count_unique_tasks()
-        self._save()
+    def _append(self):
+        """Append the changed entries to the log. Caller holds the lock."""
+        data = b"".join(
+            json.dumps([task_id, entry], separators=(",", ":")).encode() + b"\n"
+            for task_id, entry in self._changes.items()
+        )
+        try:
+            ino = os.stat(self.log_path).st_ino
+        except FileNotFoundError:
+            ino = None
+        if ino is not None and ino == self._log_ino:
+            with open(self.log_path, "ab") as f:
+                f.write(data)
+        else:
+            # No log for this snapshot yet (or one left by an older one)
+            temp_path = self.log_path.with_suffix(".tmp")
+            with open(temp_path, "wb") as f:
+                f.write(self._log_header() + data)
+            os.replace(temp_path, self.log_path)
+        st = os.stat(self.log_path)
+        self._log_ino = st.st_ino
+        self._log_pos = st.st_size
+        self._log_records += len(self._changes)
 
-    def remove(self, task_id: str):
-        """Remove task from index."""
-        # Remove from all indices
-        for status_list in self.data["by_status"].values():
-            if task_id in status_list:
-                status_list.remove(task_id)
+    def _compact(self):
+        """Write all entries to a new snapshot and drop the log."""
+        self._generation += 1
+        data = {
+            "schema": INDEX_SCHEMA,
+            "generation": self._generation,
+            "count": len(self._entries),
+            "last_updated": self.last_updated,
+            "tasks": self._entries,
+        }
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+        # The old log is in the snapshot now; readers skip it by generation
+        # even if we crash before removing it
+        try:
+            self.log_path.unlink()
+        except FileNotFoundError:
+            pass
+        self._stat = self._file_stat()
+        self._schema = INDEX_SCHEMA
+        self._log_ino = None
+        self._log_pos = 0
+        self._log_records = 0
+
+    @contextmanager
+    def batch(self):
+        """
+        Apply several changes atomically and flush once.
 
-        for agent_list in self.data["by_agent"].values():
-            if task_id in agent_list:
-                agent_list.remove(task_id)
+        Holds the index lock and starts from the latest copy on disk, so
+        changes made by other processes are not lost. Nested batches join
+        the outermost one. If the block raises, its changes are discarded.
+        """
+        if self._batch_depth:
+            yield self
+            return
 
-        for priority_list in self.data["by_priority"].values():
-            if task_id in priority_list:
-                priority_list.remove(task_id)
+        with file_lock(self.lock_path):
+            self.refresh()
+            self._batch_depth = 1
+            try:
+                yield self
+            except Exception:
+                self._load()
+                raise
+            finally:
+                self._batch_depth = 0
+            self.flush()
 
-        self.data["count"] = self._count_unique_tasks()
-        self._save()
+    @staticmethod
+    def _entry(task: IndexedTask) -> Entry:
+        """Index entry for a task or header."""
+        if not isinstance(task, TaskHeader):
+            task = TaskHeader.from_task(task)
+        retry_at = task.indexed_time("retryAt")
+        return (
+            task.status.value,
+            task.agent,
+            task.priority,
+            task.indexed_time("createdAt").isoformat(),
+            task.indexed_time("completedAt").isoformat(),
+            retry_at.isoformat() if retry_at else None,
+        )
 
-    def update_status(self, task_id: str, old_status: str, new_status: str):
-        """Update task status in index."""
-        # Remove from old status
-        if old_status in self.data["by_status"]:
-            if task_id in self.data["by_status"][old_status]:
-                self.data["by_status"][old_status].remove(task_id)
+    def _link(self, task_id: str, entry: Entry, ordered: bool = True):
+        """
+        Record an entry in the per-task dict and all lookups.
 
-        # Add to new status
-        if new_status not in self.data["by_status"]:
-            self.data["by_status"][new_status] = []
-        if task_id not in self.data["by_status"][new_status]:
-            self.data["by_status"][new_status].append(task_id)
+        Bulk loads pass ordered=False and call _sort_times() once at the end
+        instead of inserting into each sorted list.
+        """
+        status, agent, priority = entry[:3]
+        self._entries[task_id] = entry
+        self._by_status[status].add(task_id)
+        self._by_agent[agent].add(task_id)
+        self._by_priority[priority].add(task_id)
+        for field, slot in TIME_SLOTS.items():
+            if entry[slot] is None:
+                continue
+            times = self._by_time[(field, status)]
+            if ordered:
+                insort(times, (entry[slot], task_id))
+            else:
+                times.append((entry[slot], task_id))
 
-        self._save()
+    def _unlink(self, task_id: str) -> Optional[Entry]:
+        """Remove a task from all lookups; returns its old entry."""
+        entry = self._entries.pop(task_id, None)
+        if entry:
+            status, agent, priority = entry[:3]
+            self._by_status[status].discard(task_id)
+            self._by_agent[agent].discard(task_id)
+            self._by_priority[priority].discard(task_id)
+            for field, slot in TIME_SLOTS.items():
+                if entry[slot] is None:
+                    continue
+                times = self._by_time[(field, status)]
+                key = (entry[slot], task_id)
+                i = bisect_left(times, key)
+                if i < len(times) and times[i] == key:
+                    del times[i]
+        return entry
+
+    def _sort_times(self):
+        """Sort every time list (after a bulk load)."""
+        for times in self._by_time.values():
+            times.sort()
+
+    def add(self, task: IndexedTask):
+        """Add (or re-index) a task; unchanged entries leave the index clean."""
+        entry = self._entry(task)
+        with self.batch():
+            if self._entries.get(task.taskId) != entry:
+                self._unlink(task.taskId)
+                self._link(task.taskId, entry)
+                self._changes[task.taskId] = entry
+
+    def remove(self, task_id: str):
+        """Remove task from index."""
+        with self.batch():
+            if self._unlink(task_id):
+                self._changes[task_id] = None
+
+    def update_status(self, task_id: str, old_status: str, new_status: str):
+        """Update task status in index."""
+        with self.batch():
+            entry = self._entries.get(task_id)
+            if entry is None or entry[0] == new_status:
+                return
+            if entry[0] != old_status:
+                logger.debug(
+                    f"Index had {task_id} as {entry[0]}, expected {old_status}"
+                )
+            entry = (new_status,) + entry[1:]
+            self._unlink(task_id)
+            self._link(task_id, entry)
+            self._changes[task_id] = entry
 
     def get_by_status(self, status: str) -> List[str]:
         """Get task IDs by status."""
-        return self.data["by_status"].get(status, [])
+        self.refresh()
+        return list(self._by_status.get(status, ()))
 
     def get_by_agent(self, agent: str) -> List[str]:
         """Get task IDs by agent."""
-        return self.data["by_agent"].get(agent, [])
+        self.refresh()
+        return list(self._by_agent.get(agent, ()))
 
     def get_by_priority(self, priority: int) -> List[str]:
         """Get task IDs by priority."""
-        return self.data["by_priority"].get(str(priority), [])
-
-    def rebuild(self, tasks: List[Task]):
-        """Rebuild index from scratch."""
-        self.data = {
-            "by_status": {},
-            "by_agent": {},
-            "by_priority": {},
-            "count": 0,
-            "last_updated": None,
+        self.refresh()
+        return list(self._by_priority.get(int(priority), ()))
+
+    def ordered_by(
+        self,
+        field: str,
+        statuses: Sequence[str],
+        before: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        IDs of tasks in the given states, ordered by a time field.
+
+        Only tasks whose ``field`` (one of TaskHeader.TIME_FIELDS) is set
+        and, if ``before`` is given, strictly earlier than it are returned.
+        Each status is a bisect into its sorted list; the per-status runs
+        are merged.
+        """
+        self.refresh()
+        cutoff = (before.isoformat(),) if before else None
+        runs = []
+        for status in dict.fromkeys(statuses):
+            times = self._by_time.get((field, status), [])
+            runs.append(times[: bisect_left(times, cutoff)] if cutoff else times[:])
+        return [task_id for _, task_id in heapq.merge(*runs)]
+
+    def status_of(self, task_id: str) -> Optional[str]:
+        """Return the status a task is indexed under (None if not indexed)."""
+        self.refresh()
+        entry = self._entries.get(task_id)
+        return entry[0] if entry else None
+
+    def task_ids(self) -> Set[str]:
+        """Return every indexed task ID."""
+        self.refresh()
+        return set(self._entries)
+
+    def count_by_status(self) -> Dict[TaskStatus, int]:
+        """Count indexed tasks per status (every status is present, possibly 0)."""
+        self.refresh()
+        return {
+            status: len(self._by_status.get(status.value, ()))
+            for status in TaskStatus
         }
 
-        for task in tasks:
-            self.add(task)
+    def stats(self) -> dict:
+        """Task counts overall and per status, agent and priority."""
+        self.refresh()
+
+        def sizes(groups):
+            return {key: len(ids) for key, ids in groups.items() if ids}
 
-        logger.info(f"Rebuilt index with {len(tasks)} tasks")
+        return {
+            "count": len(self._entries),
+            "last_updated": self.last_updated,
+            "by_status": sizes(self._by_status),
+            "by_agent": sizes(self._by_agent),
+            "by_priority": sizes(self._by_priority),
+        }
 
-    def _count_unique_tasks(self) -> int:
-        """Count unique task IDs across all indices."""
-        all_ids = set()
-        for status_list in self.data["by_status"].values():
-            all_ids.update(status_list)
-        return len(all_ids)
+    def rebuild(self, tasks: Iterable[IndexedTask]):
+        """Rebuild index from scratch (tasks or headers)."""
+        with self.batch():
+            self._reset()
+            for task in tasks:
+                self._link(task.taskId, self._entry(task), ordered=False)
+            self._sort_times()
+            self._rewrite = True
 
+        logger.info(f"Rebuilt index with {len(self._entries)} tasks")
@@ -0,0 +1,416 @@
+"""Append-only journal storage backend for tasks.
+
+Instead of rewriting a task document on every change, each save appends one
+small record describing the transition (created, launched, completed,
+failed, cancelled, retried, updated, deleted) to ``events.log`` and fsyncs
+it. The full state lives in memory and is rebuilt on startup by replaying
+the journal on top of the latest snapshot.
+
+Every ``compact_every`` records the state is written to ``snapshot.json``
+and the log is rotated to ``events-<generation>.log``, so replay stays
+short while the rotated segments keep the exact history.
+
+Layout::
+
+    .orchestra/journal/
+    ├── snapshot.json          # {"generation", "seq", "tasks": {...}}
+    ├── events.log             # JSON lines with seq > snapshot seq
+    ├── events-000001.log      # rotated segments (history)
+    └── journal.lock
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from .models import Task, TaskHeader, TaskStatus
+from .repository import TaskRepository
+from ..utils.locking import file_lock
+
+
+# Event recorded when a save moves a task into a status
+STATUS_EVENTS = {
+    TaskStatus.RUNNING.value: "launched",
+    TaskStatus.COMPLETE.value: "completed",
+    TaskStatus.FAILED.value: "failed",
+    TaskStatus.CANCELLED.value: "cancelled",
+}
+
+
+class JournalTaskRepository(TaskRepository):
+    """Task repository backed by an append-only event journal."""
+
+    # Queries filter the replayed in-memory state instead of a TaskIndex
+    USES_INDEX = False
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        journal_dir: Optional[Path] = None,
+        compact_every: int = 1000,
+        layout: str = "flat",
+    ):
+        """
+        Initialize repository and replay the journal.
+
+        Args:
+            base_path: Optional custom base path (for testing)
+            journal_dir: Journal directory (defaults to journal/ next to tasks/)
+            compact_every: Records appended between snapshot compactions
+            layout: Sentinel file layout ("flat" or "sharded")
+        """
+        super().__init__(base_path, layout)
+        self.journal_dir = journal_dir or self.tasks_dir.parent / "journal"
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.journal_dir / "snapshot.json"
+        self.log_path = self.journal_dir / "events.log"
+        self.lock_path = self.journal_dir / "journal.lock"
+        self.compact_every = compact_every
+
+        # In-memory state (task documents in JSON form)
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._generation = 0
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._snapshot_stat = None
+        self._log_ino = None
+        self._log_pos = 0
+
+        self._catch_up()
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def _load_snapshot(self):
+        """(Re)load state from snapshot.json."""
+        self._tasks = {}
+        self._generation = 0
+        self._seq = 0
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path) as f:
+                    data = json.load(f)
+                self._tasks = data.get("tasks", {})
+                self._generation = data.get("generation", 0)
+                self._seq = data.get("seq", 0)
+            except Exception as e:
+                print(f"Warning: Failed to load {self.snapshot_path}: {e}")
+        self._snapshot_seq = self._seq
+        self._log_ino = None
+        self._log_pos = 0
+
+    def _catch_up(self):
+        """Apply snapshot changes and new journal records made by any process."""
+        try:
+            st = self.snapshot_path.stat()
+            snapshot_stat = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            snapshot_stat = None
+        if snapshot_stat != self._snapshot_stat:
+            self._load_snapshot()
+            self._snapshot_stat = snapshot_stat
+
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            ino = os.fstat(f.fileno()).st_ino
+            if ino != self._log_ino:
+                self._log_ino = ino
+                self._log_pos = 0
+            f.seek(self._log_pos)
+            for line in f:
+                # A line without newline is an append still in progress
+                if not line.endswith(b"\n"):
+                    break
+                self._log_pos += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    print(f"Warning: Skipping corrupt record in {self.log_path}: {e}")
+                    continue
+                if record.get("seq", 0) > self._seq:
+                    self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]):
+        """Apply one journal record to the in-memory state."""
+        task_id = record["taskId"]
+        if record["event"] == "deleted":
+            self._tasks.pop(task_id, None)
+        else:
+            self._tasks.setdefault(task_id, {}).update(record["fields"])
+        self._seq = record["seq"]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _event_for(old: Optional[Dict[str, Any]], fields: Dict[str, Any]) -> str:
+        """Classify a change to a task document as a journal event."""
+        if old is None:
+            return "created"
+        if "status" in fields and fields["status"] in STATUS_EVENTS:
+            return STATUS_EVENTS[fields["status"]]
+        if fields.get("retriedBy"):
+            return "retried"
+        return "updated"
+
+    def _append_locked(self, records: List[Dict[str, Any]]):
+        """Append records with a single write and fsync. Caller holds the lock."""
+        payload = b"".join(
+            json.dumps(r, separators=(",", ":"), default=str).encode() + b"\n"
+            for r in records
+        )
+        with open(self.log_path, "ab") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        for record in records:
+            self._apply(record)
+        # We caught up under the lock, so the log ends with our own records
+        st = os.stat(self.log_path)
+        self._log_ino = st.st_ino
+        self._log_pos = st.st_size
+
+        if self._seq - self._snapshot_seq >= self.compact_every:
+            self._compact_locked()
+
+    def _record(
+        self,
+        event: str,
+        task_id: str,
+        fields: Dict[str, Any],
+        seq: Optional[int] = None,
+    ) -> dict:
+        """Build a journal record (the next one unless seq is given)."""
+        return {
+            "seq": seq or self._seq + 1,
+            "ts": datetime.now().isoformat(),
+            "event": event,
+            "taskId": task_id,
+            "fields": fields,
+        }
+
+    def save(self, task: Task) -> None:
+        """Append the task's changed fields as one journal record."""
+        if self._transaction is not None:
+            self._transaction.save(task)
+            return
+        self._commit([task], [])
+
+    def _stored_version(self, task_id: str) -> int:
+        """Version in the replayed state (0 if missing). Caller holds the lock."""
+        return self._tasks.get(task_id, {}).get("version", 0)
+
+    def _commit(
+        self,
+        saves: List[Task],
+        deletes: List[str],
+        expected: Optional[Dict[str, int]] = None,
+        durable: bool = True,
+    ) -> None:
+        """
+        Append all changes with a single write and fsync.
+
+        Versions are checked and bumped under the journal lock. Saves that
+        change nothing are skipped and keep their version.
+        """
+        with file_lock(self.lock_path):
+            self._catch_up()
+            self._assign_versions(saves, expected or {})
+            records = []
+            seq = self._seq
+            for task in saves:
+                doc = task.model_dump(mode="json")
+                old = self._tasks.get(task.taskId)
+                if old is None:
+                    fields = doc
+                else:
+                    fields = {k: v for k, v in doc.items() if old.get(k) != v}
+                    if set(fields) <= {"version"}:
+                        task.version = self._stored_version(task.taskId)
+                        continue
+                seq += 1
+                event = self._event_for(old, fields)
+                records.append(self._record(event, task.taskId, fields, seq))
+            for task_id in deletes:
+                if task_id in self._tasks:
+                    seq += 1
+                    records.append(self._record("deleted", task_id, {}, seq))
+            if records:
+                self._append_locked(records)
+
+        for task_id in deletes:
+            TaskRepository.delete(self, task_id)
+
+    def delete(self, task_id: str) -> bool:
+        """
+        Record the deletion and remove all related files.
+
+        Returns True if anything was deleted.
+        """
+        if self._transaction is not None:
+            self._transaction.delete(task_id)
+            return True
+        existed = False
+        with file_lock(self.lock_path):
+            self._catch_up()
+            if task_id in self._tasks:
+                existed = True
+                self._append_locked([self._record("deleted", task_id, {})])
+        deleted_files = super().delete(task_id)
+        return existed or deleted_files
+
+    def migrate_format(self, task_format: str) -> int:
+        """Journal records are field diffs, not task files: nothing to migrate."""
+        return 0
+
+    def compact(self):
+        """Write a snapshot of the current state and rotate the journal."""
+        with file_lock(self.lock_path):
+            self._catch_up()
+            self._compact_locked()
+
+    def _compact_locked(self):
+        """Snapshot + rotate. Caller holds the lock."""
+        generation = self._generation + 1
+        temp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(
+                {"generation": generation, "seq": self._seq, "tasks": self._tasks},
+                f,
+                separators=(",", ":"),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+        # Records up to seq are in the snapshot; replay skips them even if we
+        # crash before the rotation below.
+        if self.log_path.exists():
+            os.replace(
+                self.log_path, self.journal_dir / f"events-{self._generation:06d}.log"
+            )
+
+        self._generation = generation
+        self._snapshot_seq = self._seq
+        st = self.snapshot_path.stat()
+        self._snapshot_stat = (st.st_ino, st.st_mtime_ns, st.st_size)
+        self._log_ino = None
+        self._log_pos = 0
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _validate(self, docs) -> List[Task]:
+        """Validate task documents, skipping (with warning) any that fail."""
+        tasks = []
+        for doc in docs:
+            try:
+                tasks.append(Task.model_validate(doc))
+            except Exception as e:
+                print(f"Warning: Failed to load {doc.get('taskId')} from journal: {e}")
+        tasks.sort(key=lambda t: t.createdAt)
+        return tasks
+
+    def load(self, task_id: str) -> Optional[Task]:
+        """Load a task from the replayed state."""
+        self._catch_up()
+        doc = self._tasks.get(task_id)
+        if doc is None:
+            return None
+        tasks = self._validate([doc])
+        return tasks[0] if tasks else None
+
+    def _load_streamed(self, task_id: str) -> Optional[Task]:
+        """Validate a single replayed document for iter_tasks()."""
+        return self.load(task_id)
+
+    def load_all(self) -> List[Task]:
+        """Load all tasks, sorted by creation time (oldest first)."""
+        self._catch_up()
+        return self._validate(list(self._tasks.values()))
+
+    def load_by_status(self, *statuses: TaskStatus) -> List[Task]:
+        """Load tasks in the given states (filtered before validation)."""
+        self._catch_up()
+        wanted = {s.value for s in statuses}
+        return self._validate(
+            [d for d in self._tasks.values() if d.get("status") in wanted]
+        )
+
+    def _headers(self, docs) -> List[TaskHeader]:
+        """Build headers from task documents, skipping (with warning) bad ones."""
+        headers = []
+        for doc in docs:
+            try:
+                headers.append(TaskHeader.from_dict(doc))
+            except Exception as e:
+                print(f"Warning: Failed to load {doc.get('taskId')} from journal: {e}")
+        headers.sort(key=lambda h: h.createdAt)
+        return headers
+
+    def load_header(self, task_id: str) -> Optional[TaskHeader]:
+        """Load a task's scheduling header from the replayed state."""
+        self._catch_up()
+        doc = self._tasks.get(task_id)
+        headers = self._headers([doc]) if doc is not None else []
+        return headers[0] if headers else None
+
+    def load_headers(self, *statuses: TaskStatus) -> List[TaskHeader]:
+        """Load scheduling headers (optionally by status) without validation."""
+        self._catch_up()
+        docs = self._tasks.values()
+        if statuses:
+            wanted = {s.value for s in statuses}
+            docs = [d for d in docs if d.get("status") in wanted]
+        return self._headers(docs)
+
+    def task_ids(self, *statuses: TaskStatus) -> Set[str]:
+        """IDs of tasks in the given states (all if omitted), from replayed state."""
+        self._catch_up()
+        if not statuses:
+            return set(self._tasks)
+        wanted = {s.value for s in statuses}
+        return {i for i, d in self._tasks.items() if d.get("status") in wanted}
+
+    def count_by_status(self) -> Dict[TaskStatus, int]:
+        """Count tasks per status from the replayed state."""
+        self._catch_up()
+        counts = {status: 0 for status in TaskStatus}
+        for doc in self._tasks.values():
+            try:
+                counts[TaskStatus(doc.get("status"))] += 1
+            except ValueError:
+                pass
+        return counts
+
+    def history(self, task_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return journal records in order, optionally for a single task.
+
+        Reads the rotated segments and the live log, so the full history is
+        available even after compaction.
+        """
+        records = []
+        segments = sorted(self.journal_dir.glob("events-*.log"))
+        for path in segments + [self.log_path]:
+            if not path.exists():
+                continue
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if task_id is None or record.get("taskId") == task_id:
+                        records.append(record)
+        return records
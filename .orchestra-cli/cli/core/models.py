@@ -1,8 +1,8 @@
 """Data models for the agent orchestrator using Pydantic."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from pydantic import BaseModel, Field
 
@@ -17,6 +17,31 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+def retry_due_at(
+    status: TaskStatus,
+    completed_at: Optional[datetime],
+    auto_retry: bool,
+    retry_count: int,
+    max_retries: int,
+    retried_by: Optional[str],
+) -> Optional[datetime]:
+    """
+    When a failed task becomes due for an automatic retry (None if never).
+
+    Backoff is exponential: 2^retryCount seconds after the task failed. A
+    task that has already been retried (retriedBy is set) is never due again.
+    """
+    if (
+        status != TaskStatus.FAILED
+        or not auto_retry
+        or retried_by
+        or retry_count >= max_retries
+        or completed_at is None
+    ):
+        return None
+    return completed_at + timedelta(seconds=2**retry_count)
+
+
 class RetryHistoryEntry(BaseModel):
     """Record of a retry attempt."""
 
@@ -58,12 +83,21 @@ class Task(BaseModel):
     priority: int = 5
     timeout: Optional[int] = None
     timeoutWarning: Optional[int] = None
+    # When the result is needed (earliest-deadline-first scheduling)
+    deadline: Optional[datetime] = None
+
+    # Result cache: key of this run's result, and the task it was reused from
+    resultKey: Optional[str] = None
+    cachedFrom: Optional[str] = None
 
     # Dependencies
     dependsOn: List[str] = Field(default_factory=list)
     blockedBy: Optional[str] = None
     blockedReason: Optional[str] = None
 
+    # Optimistic concurrency (bumped by every save)
+    version: int = 0
+
     # Computed properties
     @property
     def is_retry(self) -> bool:
@@ -92,7 +126,152 @@ class Task(BaseModel):
             and self.retryCount < self.maxRetries
         )
 
+    @property
+    def retry_due_at(self) -> Optional[datetime]:
+        """When this task is due for an automatic retry (None if never)."""
+        return retry_due_at(
+            self.status,
+            self.completedAt,
+            self.autoRetry,
+            self.retryCount,
+            self.maxRetries,
+            self.retriedBy,
+        )
+
     class Config:
         """Pydantic configuration."""
 
         use_enum_values = False  # Keep enum types
+
+
+class TaskHeader:
+    """
+    Scheduling fields of a task, parsed without Pydantic validation.
+
+    The scheduler, dependency resolver and reconciler only need these
+    fields; the full Task is loaded when a task is launched or displayed.
+    retryAt is derived (see retry_due_at()) rather than stored.
+    """
+
+    FIELDS = (
+        "taskId",
+        "status",
+        "priority",
+        "createdAt",
+        "dependsOn",
+        "pid",
+        "blockedBy",
+        "version",
+        "agent",
+        "completedAt",
+        "retryAt",
+        "deadline",
+    )
+
+    __slots__ = FIELDS
+
+    # Time fields the task index keeps sorted per status
+    TIME_FIELDS = ("createdAt", "completedAt", "retryAt")
+
+    def __init__(
+        self,
+        taskId: str,
+        status: TaskStatus,
+        priority: int,
+        createdAt: datetime,
+        dependsOn: List[str],
+        pid: Optional[int] = None,
+        blockedBy: Optional[str] = None,
+        version: int = 0,
+        agent: str = "",
+        completedAt: Optional[datetime] = None,
+        retryAt: Optional[datetime] = None,
+        deadline: Optional[datetime] = None,
+    ):
+        self.taskId = taskId
+        self.status = status
+        self.priority = priority
+        self.createdAt = createdAt
+        self.dependsOn = dependsOn
+        self.pid = pid
+        self.blockedBy = blockedBy
+        self.version = version
+        self.agent = agent
+        self.completedAt = completedAt
+        self.retryAt = retryAt
+        self.deadline = deadline
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskHeader":
+        """Build a header from a task document (raises on missing/invalid keys)."""
+        created_at = data["createdAt"]
+        if not isinstance(created_at, datetime):
+            created_at = datetime.fromisoformat(created_at)
+        completed_at = data.get("completedAt")
+        if completed_at is not None and not isinstance(completed_at, datetime):
+            completed_at = datetime.fromisoformat(completed_at)
+        deadline = data.get("deadline")
+        if deadline is not None and not isinstance(deadline, datetime):
+            deadline = datetime.fromisoformat(deadline)
+        status = TaskStatus(data["status"])
+        return cls(
+            taskId=data["taskId"],
+            status=status,
+            priority=data.get("priority", 5),
+            createdAt=created_at,
+            dependsOn=data.get("dependsOn") or [],
+            pid=data.get("pid"),
+            blockedBy=data.get("blockedBy"),
+            version=data.get("version", 0),
+            agent=data.get("agent", ""),
+            completedAt=completed_at,
+            retryAt=retry_due_at(
+                status,
+                completed_at,
+                data.get("autoRetry", False),
+                data.get("retryCount", 0),
+                data.get("maxRetries", 3),
+                data.get("retriedBy"),
+            ),
+            deadline=deadline,
+        )
+
+    @classmethod
+    def from_task(cls, task: Task) -> "TaskHeader":
+        """Build a header from a loaded Task."""
+        return cls(
+            task.taskId,
+            task.status,
+            task.priority,
+            task.createdAt,
+            list(task.dependsOn),
+            task.pid,
+            task.blockedBy,
+            task.version,
+            task.agent,
+            task.completedAt,
+            task.retry_due_at,
+            task.deadline,
+        )
+
+    def indexed_time(self, field: str) -> Optional[datetime]:
+        """
+        Value of one of TIME_FIELDS, as ordered by the task index.
+
+        completedAt falls back to createdAt, so finished tasks that never
+        recorded a completion time still age out.
+        """
+        if field == "completedAt":
+            return self.completedAt or self.createdAt
+        return getattr(self, field)
+
+    @property
+    def is_blocked(self) -> bool:
+        """Check if task is blocked by dependencies."""
+        return bool(self.blockedBy)
+
+    def __repr__(self) -> str:
+        return (
+            f"TaskHeader({self.taskId!r}, {self.status.value!r}, "
+            f"priority={self.priority})"
+        )
@@ -0,0 +1,173 @@
+"""Per-agent token-bucket launch rate limits."""
+
+import json
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.repository import TaskRepository
+from cli.utils.locking import file_lock
+from cli.utils.logger import logger
+
+
+@dataclass
+class RateLimit:
+    """Launches per minute, with bursts of up to ``burst`` launches."""
+
+    per_minute: float
+    burst: int = 1
+
+    @classmethod
+    def from_dict(cls, agent: str, data: dict) -> Optional["RateLimit"]:
+        """Create from a rateLimit config entry (None, with a warning, if invalid)."""
+        per_minute = data.get("perMinute") if isinstance(data, dict) else None
+        burst = data.get("burst", 1) if isinstance(data, dict) else None
+        if (
+            not isinstance(per_minute, (int, float))
+            or per_minute <= 0
+            or not isinstance(burst, int)
+            or burst < 1
+        ):
+            logger.warning(f"Ignoring invalid rateLimit for {agent}")
+            return None
+        return cls(float(per_minute), burst)
+
+
+@dataclass
+class BucketState:
+    """Tokens left in an agent's bucket as of ``updated``."""
+
+    tokens: float
+    updated: datetime
+
+
+class RateLimiter:
+    """
+    Token buckets limiting how fast each agent's tasks are launched.
+
+    A bucket holds up to ``burst`` tokens and refills at ``per_minute``
+    tokens per minute; each launch takes one. Bucket state is kept in a
+    small JSON file next to the tasks, so the daemon, ``run`` and
+    ``status`` all see the same buckets. A launcher takes a token just
+    before launching (see take()); the check and the decrement happen
+    under a lock file, so concurrent launchers can never take more tokens
+    than the bucket holds. Reading the buckets never writes.
+    """
+
+    def __init__(
+        self, limits: Dict[str, RateLimit], path: Path, lock_path: Path = None
+    ):
+        self.limits = limits
+        self.path = path
+        self.lock_path = lock_path or path.with_suffix(".lock")
+        self._states: Dict[str, BucketState] = {}
+        self._stat = None
+
+    @classmethod
+    def for_repository(
+        cls, repo: TaskRepository, limits: Dict[str, RateLimit]
+    ) -> "RateLimiter":
+        """Use the bucket state stored next to a repository's tasks."""
+        base = repo.tasks_dir.parent
+        return cls(
+            limits, base / "rate-limits.json", base / "locks" / "rate-limits.lock"
+        )
+
+    def _file_stat(self):
+        try:
+            st = self.path.stat()
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _refresh(self):
+        """Reload bucket state if another process changed it."""
+        stat = self._file_stat()
+        if stat == self._stat:
+            return
+        self._stat = stat
+        self._states = {}
+        if stat is None:
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            for agent, entry in data.get("agents", {}).items():
+                self._states[agent] = BucketState(
+                    float(entry["tokens"]), datetime.fromisoformat(entry["updated"])
+                )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Failed to load rate limit state: {e}")
+
+    def _save(self):
+        """Write bucket state atomically."""
+        data = {
+            "agents": {
+                agent: {"tokens": state.tokens, "updated": state.updated.isoformat()}
+                for agent, state in self._states.items()
+            }
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.path)
+            self._stat = self._file_stat()
+        except OSError as e:
+            logger.error(f"Failed to save rate limit state: {e}")
+
+    def tokens(self, agent: str, now: Optional[datetime] = None) -> Optional[float]:
+        """Tokens available to an agent now (None if it isn't rate limited)."""
+        limit = self.limits.get(agent)
+        if limit is None:
+            return None
+        self._refresh()
+        state = self._states.get(agent)
+        if state is None:
+            return float(limit.burst)
+        elapsed = ((now or datetime.now()) - state.updated).total_seconds()
+        refill = max(elapsed, 0) * limit.per_minute / 60
+        return min(float(limit.burst), state.tokens + refill)
+
+    def available(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Whole launches each rate-limited agent may make now."""
+        return {agent: int(self.tokens(agent, now)) for agent in self.limits}
+
+    def next_token_at(
+        self, agent: str, now: Optional[datetime] = None
+    ) -> Optional[datetime]:
+        """When an empty bucket next holds a whole token (None if not empty)."""
+        now = now or datetime.now()
+        tokens = self.tokens(agent, now)
+        if tokens is None or tokens >= 1:
+            return None
+        seconds = (1 - tokens) * 60 / self.limits[agent].per_minute
+        return now + timedelta(seconds=seconds)
+
+    def take(self, agent: str, now: Optional[datetime] = None) -> bool:
+        """
+        Take a token for a launch by an agent.
+
+        Returns False, taking nothing, if the agent's bucket holds less than
+        a whole token (the launch must wait). Agents without a rate limit
+        always get True.
+        """
+        if agent not in self.limits:
+            return True
+        now = now or datetime.now()
+        # Check and take under the lock so concurrent launchers cannot both
+        # spend the last token
+        with file_lock(self.lock_path):
+            tokens = self.tokens(agent, now)
+            if tokens < 1:
+                return False
+            self._states[agent] = BucketState(tokens - 1, now)
+            self._save()
+        return True
@@ -0,0 +1,314 @@
+"""Priority queues of tasks that are ready to launch."""
+
+import heapq
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from .models import TaskHeader
+
+# heapq pops the smallest key first. Without aging the key is
+# (-priority, -downstream, createdAt, taskId): highest priority, then the
+# longest downstream path, then oldest. With aging it starts with
+# createdAt - priority * aging_interval - downstream (see ReadyQueue). The
+# task ID is always last.
+ReadyKey = Tuple
+
+
+class ReadyQueue:
+    """
+    Heap of ready task IDs ordered by priority (highest first), then age.
+
+    With an aging interval, a task's effective priority is its priority
+    plus one level per ``aging_interval`` seconds pending. Since every
+    task ages at the same rate, ordering by effective priority is the same
+    as ordering by createdAt - priority * aging_interval, which never
+    changes; so aging needs no re-sorting and the heap stays O(log n).
+
+    A task may also carry the estimated seconds of downstream work it
+    gates (its critical path, see Scheduler.downstream_seconds). Without
+    aging it breaks ties between equal priorities; with aging it counts as
+    time already spent pending.
+
+    Tasks with a deadline are also kept in a second heap by latest start
+    time (deadline minus expected run time). Once the earliest latest
+    start is within ``deadline_slack`` seconds, that task is popped ahead
+    of the priority order (earliest deadline first). A task whose latest
+    start has passed can no longer make its deadline; it leaves the
+    deadline heap and waits in priority order, so it doesn't take slots
+    from tasks that still can.
+
+    push() and discard() are O(log n) and O(1). Removal is lazy: replaced
+    or discarded keys stay in the heaps and are skipped when popped, and
+    the heaps are compacted once stale keys outnumber live ones.
+    """
+
+    def __init__(self, aging_interval: int = 0, deadline_slack: int = 0):
+        self.aging_interval = aging_interval
+        self.deadline_slack = deadline_slack
+        self._heap: List[ReadyKey] = []
+        self._keys: Dict[str, ReadyKey] = {}
+        self._deadlines: List[Tuple[datetime, str]] = []
+        self._latest_start: Dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over queued task IDs (in no particular order)."""
+        return iter(list(self._keys))
+
+    def key(self, header: TaskHeader, downstream: float = 0) -> ReadyKey:
+        """Heap key for a task gating ``downstream`` seconds of work."""
+        if not self.aging_interval:
+            return (-header.priority, -downstream, header.createdAt, header.taskId)
+        boost = timedelta(
+            seconds=header.priority * self.aging_interval + downstream
+        )
+        return (header.createdAt - boost, -header.priority, header.taskId)
+
+    def push(
+        self,
+        header: TaskHeader,
+        downstream: float = 0,
+        latest_start: Optional[datetime] = None,
+    ) -> None:
+        """
+        Queue a task, or re-queue it if its priority or downstream changed.
+
+        ``latest_start`` is when a task with a deadline must start to meet it.
+        """
+        task_id = header.taskId
+        if latest_start != self._latest_start.get(task_id):
+            if latest_start is None:
+                del self._latest_start[task_id]
+            else:
+                self._latest_start[task_id] = latest_start
+                heapq.heappush(self._deadlines, (latest_start, task_id))
+        key = self.key(header, downstream)
+        if self._keys.get(task_id) == key:
+            return
+        self._keys[task_id] = key
+        heapq.heappush(self._heap, key)
+        self._compact()
+
+    def discard(self, task_id: str) -> None:
+        """Remove a task if it is queued."""
+        self._latest_start.pop(task_id, None)
+        if self._keys.pop(task_id, None) is not None:
+            self._compact()
+
+    def next_urgent(self, now: datetime) -> Optional[datetime]:
+        """
+        Latest start of the most urgent task due within deadline_slack.
+
+        Returns None if no queued task that can still make its deadline has
+        to start that soon (or deadlines are off).
+        """
+        if not self.deadline_slack:
+            return None
+        horizon = now + timedelta(seconds=self.deadline_slack)
+        while self._deadlines:
+            latest_start, task_id = self._deadlines[0]
+            if self._latest_start.get(task_id) != latest_start:
+                heapq.heappop(self._deadlines)  # Stale entry
+            elif latest_start < now:
+                # Too late to make the deadline: back to priority order
+                heapq.heappop(self._deadlines)
+                del self._latest_start[task_id]
+            else:
+                return latest_start if latest_start <= horizon else None
+        return None
+
+    def pop(self, now: Optional[datetime] = None) -> Optional[str]:
+        """Remove and return the next task ID (None if the queue is empty)."""
+        if self.next_urgent(now or datetime.now()) is not None:
+            _, task_id = heapq.heappop(self._deadlines)
+            del self._latest_start[task_id]
+            del self._keys[task_id]
+            return task_id
+        while self._heap:
+            key = heapq.heappop(self._heap)
+            if self._keys.get(key[-1]) == key:
+                del self._keys[key[-1]]
+                self._latest_start.pop(key[-1], None)
+                return key[-1]
+        return None
+
+    def peek(self, n: int) -> List[str]:
+        """Return the next ``n`` task IDs without removing them."""
+        live = (key for key in self._heap if self._keys.get(key[-1]) == key)
+        return [key[-1] for key in heapq.nsmallest(n, live)]
+
+    def clear(self) -> None:
+        """Remove every task."""
+        self._heap.clear()
+        self._keys.clear()
+        self._deadlines.clear()
+        self._latest_start.clear()
+
+    def _compact(self) -> None:
+        """Drop stale heap keys once they outnumber the live ones."""
+        if len(self._heap) > 2 * len(self._keys) + 64:
+            self._heap = list(self._keys.values())
+            heapq.heapify(self._heap)
+        if len(self._deadlines) > 2 * len(self._latest_start) + 64:
+            self._deadlines = [(t, i) for i, t in self._latest_start.items()]
+            heapq.heapify(self._deadlines)
+
+
+class FairQueue:
+    """
+    One ReadyQueue per agent, served by deficit round robin.
+
+    Agents with ready tasks take turns. At the start of its turn an agent's
+    deficit grows by its weight, and each task it launches costs 1, so over
+    time agents get launch slots in proportion to their weights (and a
+    weight of 0.5 means one task every other turn). Within an agent, tasks
+    still come out by priority, then age. The rotation and deficits persist
+    between pop() calls, so fairness holds across daemon cycles.
+
+    A task that must start within the deadline slack to meet its deadline
+    is launched before the round robin, whichever agent's turn it is; it
+    still costs its agent 1 deficit, so urgent work counts against the
+    agent's share.
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        aging_interval: int = 0,
+        deadline_slack: int = 0,
+    ):
+        self.weights = weights or {}
+        self.aging_interval = aging_interval
+        self.deadline_slack = deadline_slack
+        self._queues: Dict[str, ReadyQueue] = {}
+        self._agent_of: Dict[str, str] = {}
+        self._rotation: Deque[str] = deque()
+        self._deficit: Dict[str, float] = {}
+        self._in_turn: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._agent_of)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._agent_of
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over queued task IDs (in no particular order)."""
+        return iter(list(self._agent_of))
+
+    def push(
+        self,
+        header: TaskHeader,
+        downstream: float = 0,
+        latest_start: Optional[datetime] = None,
+    ) -> None:
+        """Queue a task under its agent, or re-queue it if its key changed."""
+        agent = header.agent
+        if self._agent_of.get(header.taskId, agent) != agent:
+            self.discard(header.taskId)
+        if agent not in self._queues:
+            self._queues[agent] = ReadyQueue(
+                self.aging_interval, self.deadline_slack
+            )
+        if agent not in self._deficit:
+            self._rotation.append(agent)
+            self._deficit[agent] = 0.0
+        self._queues[agent].push(header, downstream, latest_start)
+        self._agent_of[header.taskId] = agent
+
+    def discard(self, task_id: str) -> None:
+        """Remove a task if it is queued."""
+        agent = self._agent_of.pop(task_id, None)
+        if agent is not None:
+            self._queues[agent].discard(task_id)
+
+    def pop(
+        self,
+        capacity: Optional[Dict[str, int]] = None,
+        now: Optional[datetime] = None,
+    ) -> Optional[str]:
+        """
+        Remove and return the next task ID (None if nothing can run).
+
+        Args:
+            capacity: Free slots per agent; agents at 0 are skipped (and
+                forfeit their deficit), agents not listed are unlimited.
+                The popped task's agent is decremented in place.
+            now: Current time for deadline checks (defaults to now)
+        """
+        capacity = {} if capacity is None else capacity
+        now = now or datetime.now()
+        if self.deadline_slack:
+            task_id = self._pop_urgent(capacity, now)
+            if task_id is not None:
+                return task_id
+
+        capped = 0
+        while self._rotation and capped < len(self._rotation):
+            agent = self._rotation[0]
+            if not self._queues[agent]:
+                # No ready tasks: leave the rotation (and lose any deficit)
+                self._rotation.popleft()
+                del self._deficit[agent]
+                self._in_turn = None
+                continue
+            if capacity.get(agent, 1) <= 0:
+                self._end_turn(agent, forfeit=True)
+                capped += 1
+                continue
+            capped = 0
+
+            if self._in_turn != agent:
+                self._deficit[agent] += self.weights.get(agent, 1.0)
+                self._in_turn = agent
+            if self._deficit[agent] < 1:
+                self._end_turn(agent)
+                continue
+
+            return self._take(agent, capacity, now)
+        return None
+
+    def _pop_urgent(self, capacity: Dict[str, int], now: datetime) -> Optional[str]:
+        """Pop the task with the earliest latest start due within the slack."""
+        urgent = None
+        for agent, queue in self._queues.items():
+            if capacity.get(agent, 1) <= 0:
+                continue
+            latest_start = queue.next_urgent(now)
+            if latest_start is None:
+                continue
+            if urgent is None or latest_start < urgent[0]:
+                urgent = (latest_start, agent)
+        if urgent is None:
+            return None
+        return self._take(urgent[1], capacity, now)
+
+    def _take(self, agent: str, capacity: Dict[str, int], now: datetime) -> str:
+        """Pop an agent's next task, charging its deficit and capacity."""
+        self._deficit[agent] -= 1
+        task_id = self._queues[agent].pop(now)
+        del self._agent_of[task_id]
+        if agent in capacity:
+            capacity[agent] -= 1
+        return task_id
+
+    def _end_turn(self, agent: str, forfeit: bool = False) -> None:
+        """Move the agent at the head of the rotation to the back."""
+        self._rotation.rotate(-1)
+        self._in_turn = None
+        if forfeit:
+            self._deficit[agent] = 0.0
+
+    def clear(self) -> None:
+        """Remove every task."""
+        self._queues.clear()
+        self._agent_of.clear()
+        self._rotation.clear()
+        self._deficit.clear()
+        self._in_turn = None
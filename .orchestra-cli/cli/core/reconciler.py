@@ -1,59 +1,71 @@
 """State reconciliation for tasks based on sentinel files and process health."""
 
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
-from .models import Task, TaskStatus
+from .models import Task, TaskHeader, TaskStatus
 from .repository import TaskRepository
+from .result_cache import ResultCache
+from .runtime_stats import RuntimeStats
+from ..utils.logger import logger
 from ..utils.process import is_process_alive
 
 
 class Reconciler:
     """Reconciles task status based on sentinel files and process state."""
 
-    def __init__(self, repo: TaskRepository):
+    # A running task gets its PID right after launch (see Executor.start_task);
+    # one still without a PID this long after starting lost its launcher
+    LAUNCH_GRACE_SECONDS = 60
+
+    def __init__(
+        self,
+        repo: TaskRepository,
+        stats: Optional[RuntimeStats] = None,
+        cache: Optional[ResultCache] = None,
+    ):
         self.repo = repo
+        # Completed run times feed the scheduler's critical-path estimates
+        self.stats = stats or RuntimeStats.for_repository(repo)
+        # Completed results are stored for reuse (if the cache is enabled)
+        self.cache = cache or ResultCache.for_repository(repo)
 
     def reconcile_task(self, task: Task) -> bool:
         """
         Update task status based on sentinel files and process health.
 
+        The save is a compare-and-swap on the version the task was loaded
+        at: if another writer (e.g. cancel) changed it meanwhile, nothing is
+        saved and the sentinels are kept for the next pass.
+
         Returns True if status changed.
         """
         if task.status != TaskStatus.RUNNING:
             return False
 
+        expected_version = task.version
         sentinels = self.repo.get_sentinel_files(task.taskId)
-        changed = False
+        cleanup = []
 
         # Check completion sentinel
         if sentinels["done"]:
             task.status = TaskStatus.COMPLETE
             task.completedAt = datetime.now()
-            self._cleanup_sentinel(task.taskId, "done")
-            self._cleanup_sentinel(task.taskId, "exitcode")
-            self._cleanup_sentinel(task.taskId, "pid")
-            changed = True
+            cleanup = ["done", "exitcode", "pid"]
 
         # Check error sentinel
         elif sentinels["error"]:
             task.status = TaskStatus.FAILED
             task.errorMessage = self._read_error_sentinel(task.taskId)
             task.completedAt = datetime.now()
-            self._cleanup_sentinel(task.taskId, "error")
-            self._cleanup_sentinel(task.taskId, "exitcode")
-            self._cleanup_sentinel(task.taskId, "pid")
-            changed = True
+            cleanup = ["error", "exitcode", "pid"]
 
         # Check cancellation sentinel
         elif sentinels["cancelled"]:
             task.status = TaskStatus.CANCELLED
             task.completedAt = datetime.now()
-            self._cleanup_sentinel(task.taskId, "cancelled")
-            self._cleanup_sentinel(task.taskId, "exitcode")
-            self._cleanup_sentinel(task.taskId, "pid")
-            changed = True
+            cleanup = ["cancelled", "exitcode", "pid"]
 
         # Check timeout sentinel
         elif sentinels["timeout"]:
@@ -64,16 +76,11 @@ class Reconciler:
             )
             task.timedOutAt = self._parse_timestamp(timeout_info.get("timestamp"))
             task.completedAt = task.timedOutAt or datetime.now()
-            self._cleanup_sentinel(task.taskId, "timeout")
-            self._cleanup_sentinel(task.taskId, "exitcode")
-            self._cleanup_sentinel(task.taskId, "pid")
-            changed = True
+            cleanup = ["timeout", "exitcode", "pid"]
 
         # Check process health
         elif task.pid:
-            pid_file = (
-                self.repo.tasks_dir / f"{task.taskId}.pid" if sentinels["pid"] else None
-            )
+            pid_file = self.repo.find_sentinel(task.taskId, "pid")
             if not is_process_alive(task.pid, pid_file):
                 # Process died - check exit code
                 exitcode = self._read_exitcode(task.taskId)
@@ -88,14 +95,29 @@ class Reconciler:
                     task.status = TaskStatus.FAILED
                     task.errorMessage = "Process terminated unexpectedly"
                 task.completedAt = datetime.now()
-                self._cleanup_sentinel(task.taskId, "exitcode")
-                self._cleanup_sentinel(task.taskId, "pid")
-                changed = True
+                cleanup = ["exitcode", "pid"]
 
-        if changed:
-            self.repo.save(task)
+        # Launcher died between claiming the task and recording its PID
+        elif self._launch_abandoned(task):
+            task.status = TaskStatus.FAILED
+            task.errorMessage = "Launcher exited before recording a PID"
+            task.completedAt = datetime.now()
+            cleanup = ["exitcode", "pid"]
 
-        return changed
+        if not cleanup:
+            return False
+
+        if not self.repo.save_if_version(task, expected_version):
+            logger.info(f"Task {task.taskId} changed while reconciling; will retry")
+            return False
+
+        for suffix in cleanup:
+            self._cleanup_sentinel(task.taskId, suffix)
+        if task.status == TaskStatus.COMPLETE:
+            self.stats.record(task)
+            if self.cache and task.resultKey:
+                self.cache.store(task.resultKey, task)
+        return True
 
     def reconcile_all(self) -> int:
         """
@@ -103,13 +125,37 @@ class Reconciler:
 
         Returns count of tasks that changed status.
         """
-        tasks = self.repo.load_all()
         changed_count = 0
-        for task in tasks:
-            if self.reconcile_task(task):
+        for header in self.repo.load_headers(TaskStatus.RUNNING):
+            # Only tasks with something to reconcile are fully loaded
+            if not self._needs_reconcile(header):
+                continue
+            task = self.repo.load(header.taskId)
+            if task and self.reconcile_task(task):
                 changed_count += 1
         return changed_count
 
+    def _needs_reconcile(self, header: TaskHeader) -> bool:
+        """Check whether a running task has a sentinel, a dead process or no PID."""
+        sentinels = self.repo.get_sentinel_files(header.taskId)
+        if any(sentinels[s] for s in ("done", "error", "cancelled", "timeout")):
+            return True
+        if header.pid:
+            pid_file = self.repo.find_sentinel(header.taskId, "pid")
+            return not is_process_alive(header.pid, pid_file)
+        # Headers have no startedAt; tasks are PID-less only while launching,
+        # so loading them to check the grace period is cheap
+        return True
+
+    def _launch_abandoned(self, task: Task) -> bool:
+        """Check whether a running task never got a PID within the grace period."""
+        if task.pid:
+            return False
+        if task.startedAt is None:
+            return True
+        grace = timedelta(seconds=self.LAUNCH_GRACE_SECONDS)
+        return datetime.now() - task.startedAt > grace
+
     def _read_error_sentinel(self, task_id: str) -> str:
         """Read error message from .error sentinel file."""
         content = self.repo.read_sentinel_file(task_id, "error")
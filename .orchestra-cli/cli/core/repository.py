@@ -1,22 +1,151 @@
 """Repository pattern for task CRUD operations."""
 
 import json
+import os
+import platform
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from .models import Task
-from ..utils.paths import TASKS_DIR, PLANS_DIR, LOGS_DIR
+from .config import OrchestratorConfig
+from .index import TaskIndex
+from .models import Task, TaskHeader, TaskStatus
+from .serialization import FORMATS, decode_task, detect_format, encode_task
+from ..utils.fs import fsync_dir, fsync_file
+from ..utils.locking import file_lock
+from ..utils.paths import (
+    TASKS_DIR,
+    PLANS_DIR,
+    LOGS_DIR,
+    TASK_LAYOUTS,
+    is_shard_name,
+    task_shard,
+)
+
+
+# (inode, mtime_ns, size) - a task file is re-parsed only when this changes
+StatKey = Tuple[int, int, int]
+
+SENTINEL_SUFFIXES = [".done", ".error", ".cancelled", ".timeout", ".exitcode", ".pid"]
+
+# Attempts update() makes before giving up on a contended task
+UPDATE_RETRIES = 10
+
+# Cold loads with at least this many unparsed files read them on a thread
+# pool, in chunks of READ_CHUNK files per job
+PARALLEL_LOAD_MIN = 256
+READ_CHUNK = 256
+
+
+def _is_task_file(name: str) -> bool:
+    """Check a file name is a task document (e.g. not a legacy tasks/index.json)."""
+    return name.startswith("task_") and name.endswith(".json")
+
+
+class VersionConflict(Exception):
+    """A compare-and-swap save found the task changed by another writer."""
+
+    def __init__(self, task_id: str, expected: int, actual: int):
+        super().__init__(
+            f"Task {task_id} is at version {actual}, expected {expected}"
+        )
+        self.task_id = task_id
+        self.expected = expected
+        self.actual = actual
+
+
+class TaskTransaction:
+    """Task writes and deletes staged for a single all-or-nothing commit."""
+
+    def __init__(self):
+        self.saves: Dict[str, Task] = {}
+        self.deletes: Dict[str, None] = {}  # Ordered set
+        self.expected: Dict[str, int] = {}  # taskId -> version for CAS saves
+        # taskId -> the caller's object, given the committed version
+        self.originals: Dict[str, Task] = {}
+
+    def save(self, task: Task, expected_version: Optional[int] = None) -> None:
+        """
+        Stage a task write (a later save of the same task replaces it).
+
+        With ``expected_version`` the commit fails with VersionConflict
+        unless the stored task is still at that version. After a successful
+        commit the task's version is bumped in place, as with a direct save.
+        """
+        self.deletes.pop(task.taskId, None)
+        self.saves[task.taskId] = task.model_copy()
+        self.originals[task.taskId] = task
+        if expected_version is not None:
+            self.expected[task.taskId] = expected_version
+
+    def delete(self, task_id: str) -> None:
+        """Stage a task deletion."""
+        self.saves.pop(task_id, None)
+        self.expected.pop(task_id, None)
+        self.originals.pop(task_id, None)
+        self.deletes[task_id] = None
+
+    def publish_versions(self) -> None:
+        """Copy the committed versions back to the callers' task objects."""
+        for task_id, task in self.saves.items():
+            self.originals[task_id].version = task.version
 
 
 class TaskRepository:
-    """Repository for managing task persistence."""
+    """Repository for managing task persistence.
 
-    def __init__(self, base_path: Optional[Path] = None):
+    Parsed tasks are cached per file and revalidated with a stat call, so
+    repeated loads within a process only re-parse files that changed. Cached
+    tasks are handed out as shallow copies: reassigning fields is safe, but
+    nested lists (dependsOn, retryHistory) must not be mutated in place.
+
+    Every save bumps the task's ``version``. save_if_version() and update()
+    use it for optimistic concurrency: a writer that loaded an older version
+    fails (and retries) instead of overwriting another writer's change.
+    Writes are serialized per task by striped lock files in .orchestra/locks.
+
+    Task JSON and sentinel files are written in the configured layout (flat
+    or sharded, see utils.paths) but found in either, so a queue can be
+    resharded while the daemon and agents keep running.
+
+    Every write also updates a TaskIndex (.orchestra/index.json), so status
+    queries (load_headers with statuses, count_by_status) read only the
+    matching files instead of scanning the whole queue.
+    """
+
+    # Backends with their own indexed queries set this to False
+    USES_INDEX = True
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        layout: str = "flat",
+        task_format: str = "json",
+        load_workers: int = 0,
+    ):
         """
         Initialize repository.
 
         Args:
             base_path: Optional custom base path (for testing)
+            layout: Task file layout for new writes ("flat" or "sharded")
+            task_format: Encoding for new writes ("json" or "compact");
+                both are always readable
+            load_workers: Threads reading files on cold loads (0 = auto,
+                1 = sequential)
         """
         if base_path:
             self.tasks_dir = base_path / "tasks"
@@ -27,6 +156,31 @@ class TaskRepository:
             self.plans_dir = PLANS_DIR
             self.logs_dir = LOGS_DIR
 
+        self._cache: Dict[str, Tuple[StatKey, Task]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._transaction: Optional[TaskTransaction] = None
+        # Headers parsed without validation, for files not in _cache
+        self._header_cache: Dict[str, Tuple[StatKey, TaskHeader]] = {}
+        self.load_workers = load_workers
+        self.index: Optional[TaskIndex] = None
+        if self.USES_INDEX:
+            self.index = TaskIndex(
+                self.tasks_dir.parent / "index.json",
+                self.tasks_dir.parent / "locks" / "index.lock",
+            )
+
+        if layout not in TASK_LAYOUTS:
+            print(f"Warning: Unknown task layout '{layout}', using flat")
+            layout = "flat"
+        self.layout = layout
+        self._shards_made = set()
+
+        if task_format not in FORMATS:
+            print(f"Warning: Unknown task format '{task_format}', using json")
+            task_format = "json"
+        self.task_format = task_format
+
         self._ensure_dirs()
 
     def _ensure_dirs(self):
@@ -35,81 +189,766 @@ class TaskRepository:
         self.plans_dir.mkdir(parents=True, exist_ok=True)
         self.logs_dir.mkdir(parents=True, exist_ok=True)
 
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def task_dir(self, task_id: str) -> Path:
+        """Directory for a task's JSON and sentinel files in the active layout."""
+        if self.layout == "sharded":
+            return self.tasks_dir / task_shard(task_id)
+        return self.tasks_dir
+
+    def _other_dir(self, task_id: str) -> Path:
+        """Directory the task's files live in under the other layout."""
+        if self.layout == "sharded":
+            return self.tasks_dir
+        return self.tasks_dir / task_shard(task_id)
+
+    def _writable_dir(self, task_id: str) -> Path:
+        """task_dir(), created on first use."""
+        directory = self.task_dir(task_id)
+        if directory != self.tasks_dir and directory not in self._shards_made:
+            directory.mkdir(exist_ok=True)
+            self._shards_made.add(directory)
+        return directory
+
+    def _find(self, task_id: str, suffix: str) -> Optional[Path]:
+        """Existing task file with ``suffix`` in either layout, or None."""
+        for directory in (self.task_dir(task_id), self._other_dir(task_id)):
+            path = directory / f"{task_id}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _stat_task_file(self, task_id: str) -> Optional[Tuple[Path, StatKey]]:
+        """Locate a task's JSON file in either layout and stat it."""
+        for directory in (self.task_dir(task_id), self._other_dir(task_id)):
+            path = directory / f"{task_id}.json"
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            return path, (st.st_ino, st.st_mtime_ns, st.st_size)
+        return None
+
+    def _scan_task_files(self) -> List[os.DirEntry]:
+        """
+        List task JSON files in both layouts, one entry per file name.
+
+        When a file exists in both places (mid-reshard), the copy in the
+        active layout wins. Sorted by file name.
+        """
+        flat, sharded = [], []
+        with os.scandir(self.tasks_dir) as it:
+            for entry in it:
+                if _is_task_file(entry.name):
+                    if entry.is_file():
+                        flat.append(entry)
+                elif is_shard_name(entry.name) and entry.is_dir():
+                    with os.scandir(entry.path) as shard:
+                        sharded.extend(
+                            e for e in shard if _is_task_file(e.name) and e.is_file()
+                        )
+
+        groups = (sharded, flat) if self.layout == "sharded" else (flat, sharded)
+        entries = {}
+        for group in groups:
+            for entry in group:
+                entries.setdefault(entry.name, entry)
+        return [entries[name] for name in sorted(entries)]
+
+    def reshard(self, layout: str) -> int:
+        """
+        Move every task JSON and sentinel file into ``layout``.
+
+        Safe while other processes run: each file is moved with an atomic
+        rename and readers look in both layouts. Returns the number of
+        files moved.
+        """
+        self.layout = layout
+        suffixes = (".json", *SENTINEL_SUFFIXES)
+        moved = 0
+
+        directories = [self.tasks_dir] + sorted(
+            p for p in self.tasks_dir.iterdir() if is_shard_name(p.name) and p.is_dir()
+        )
+        for directory in directories:
+            for path in list(directory.iterdir()):
+                if not (path.name.startswith("task_") and path.suffix in suffixes):
+                    continue
+                target = self._writable_dir(path.stem) / path.name
+                if target != path:
+                    os.replace(path, target)
+                    moved += 1
+            if directory != self.tasks_dir and layout == "flat":
+                try:
+                    directory.rmdir()
+                except OSError:
+                    pass  # New files appeared; leave the shard in place
+
+        self._cache.clear()
+        self._header_cache.clear()
+        return moved
+
+    def migrate_format(self, task_format: str) -> int:
+        """
+        Rewrite every stored task in ``task_format``, one file at a time.
+
+        Files already in the target format are skipped. Returns the number
+        of tasks rewritten.
+        """
+        self.task_format = task_format
+        migrated = 0
+        for entry in self._scan_task_files():
+            try:
+                with open(entry.path) as f:
+                    data = f.read()
+                if detect_format(data) == task_format:
+                    continue
+                task = decode_task(data)
+            except Exception as e:
+                print(f"Warning: Skipping {entry.path}: {e}")
+                continue
+            self.save(task)
+            migrated += 1
+        return migrated
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
     def save(self, task: Task) -> None:
         """
         Save task to JSON file atomically.
 
         Uses atomic write pattern: write to temp file, then rename.
         This prevents corruption if the process is interrupted.
+        Inside transaction() the write is staged until commit instead.
+        """
+        if self._transaction is not None:
+            self._transaction.save(task)
+            return
+
+        self._commit([task], [], durable=False)
+
+    def save_if_version(self, task: Task, expected_version: int) -> bool:
+        """
+        Save ``task`` only if the stored copy is still at ``expected_version``.
+
+        On success the task's version is bumped (in place) and True is
+        returned. Returns False if another writer saved the task first.
+        Inside transaction() the check happens at commit, which raises
+        VersionConflict instead.
+        """
+        if self._transaction is not None:
+            self._transaction.save(task, expected_version)
+            return True
+        try:
+            self._commit([task], [], {task.taskId: expected_version}, durable=False)
+        except VersionConflict:
+            return False
+        return True
+
+    def update(
+        self, task_id: str, mutate: Callable[[Task], Optional[bool]]
+    ) -> Optional[Task]:
+        """
+        Load a task, apply ``mutate`` and save it, retrying on conflicts.
+
+        ``mutate`` may run several times, each on a freshly loaded copy, so
+        it must not have side effects. If it returns False the task is left
+        unchanged. Returns the saved task, or None if the task is missing or
+        ``mutate`` declined.
+
+        Raises:
+            VersionConflict: If the task kept changing for UPDATE_RETRIES tries
         """
-        import platform
+        for _ in range(UPDATE_RETRIES):
+            task = self.load(task_id)
+            if task is None:
+                return None
+            expected = task.version
+            if mutate(task) is False:
+                return None
+            if self.save_if_version(task, expected):
+                return task
+        current = self.load(task_id)
+        raise VersionConflict(task_id, expected, current.version if current else -1)
 
-        json_path = self.tasks_dir / f"{task.taskId}.json"
-        temp_path = json_path.with_suffix(".tmp")
+    def _lock_path(self, task_id: str) -> Path:
+        """Striped lock file serializing writes to a task."""
+        return self.tasks_dir.parent / "locks" / f"{task_shard(task_id)}.lock"
 
-        # Write to temp file
-        with open(temp_path, "w") as f:
-            # Use model_dump_json with custom serialization
-            json_data = task.model_dump(mode="json")
-            # Convert datetime objects to ISO format strings
-            json_str = json.dumps(json_data, indent=2, default=str)
-            f.write(json_str)
+    @contextmanager
+    def _write_locks(self, task_ids: Iterable[str]):
+        """Hold the write locks for all given tasks (taken in a fixed order)."""
+        with ExitStack() as stack:
+            for lock_path in sorted({self._lock_path(i) for i in task_ids}):
+                stack.enter_context(file_lock(lock_path))
+            yield
+
+    def _stored_version(self, task_id: str) -> int:
+        """Version of the stored task (0 if missing). Caller holds its lock."""
+        header = self.load_header(task_id)
+        return header.version if header else 0
+
+    def _assign_versions(self, saves: List[Task], expected: Dict[str, int]) -> None:
+        """Check expected versions and give each saved task the next version."""
+        current = {task.taskId: self._stored_version(task.taskId) for task in saves}
+        for task_id, wanted in expected.items():
+            if task_id in current and current[task_id] != wanted:
+                raise VersionConflict(task_id, wanted, current[task_id])
+        for task in saves:
+            task.version = current[task.taskId] + 1
+
+    def _write_temp(self, task: Task, durable: bool = False) -> Path:
+        """Write a task to its temp file (fsynced if durable) and return the path."""
+        temp_path = self._writable_dir(task.taskId) / f"{task.taskId}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(encode_task(task, self.task_format))
+                if durable:
+                    fsync_file(f)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return temp_path
+
+    def _install(self, temp_path: Path, task: Task) -> None:
+        """Rename a written temp file over the task's JSON file."""
+        json_path = self.task_dir(task.taskId) / f"{task.taskId}.json"
 
         # Atomic rename (Windows requires removing target first)
         if platform.system() == "Windows" and json_path.exists():
             json_path.unlink()
         temp_path.rename(json_path)
+        # Drop a stale copy left in the other layout
+        (self._other_dir(task.taskId) / json_path.name).unlink(missing_ok=True)
 
-    def load(self, task_id: str) -> Optional[Task]:
+        # Write-through: the next load of this file is a cache hit
+        st = os.stat(json_path)
+        self._cache[json_path.name] = (
+            (st.st_ino, st.st_mtime_ns, st.st_size),
+            task.model_copy(),
+        )
+        self._header_cache.pop(json_path.name, None)
+
+    @contextmanager
+    def transaction(self) -> Iterator[TaskTransaction]:
         """
-        Load task from JSON file.
+        Stage task writes and deletes and commit them together on exit.
 
-        Returns None if task doesn't exist or cannot be loaded.
+        save() and delete() calls made inside the block (directly or through
+        the returned transaction) are buffered. Nothing is written if the
+        block raises. Nested transactions join the outermost one.
+
+        Example:
+            with repo.transaction():
+                repo.save(retry_task)
+                repo.save(original_task)
         """
-        json_path = self.tasks_dir / f"{task_id}.json"
-        if not json_path.exists():
-            return None
+        if self._transaction is not None:
+            yield self._transaction
+            return
 
+        self._transaction = TaskTransaction()
         try:
-            with open(json_path) as f:
-                return Task.model_validate_json(f.read())
+            yield self._transaction
+            staged = self._transaction
+        finally:
+            self._transaction = None
+        if staged.saves or staged.deletes:
+            self._commit(
+                list(staged.saves.values()), list(staged.deletes), staged.expected
+            )
+            staged.publish_versions()
+
+    def save_many(self, tasks: Iterable[Task]) -> None:
+        """Save several tasks in one group commit."""
+        with self.transaction() as tx:
+            for task in tasks:
+                tx.save(task)
+
+    def delete_many(self, task_ids: Iterable[str]) -> None:
+        """Delete several tasks (and their files) in one group commit."""
+        with self.transaction() as tx:
+            for task_id in task_ids:
+                tx.delete(task_id)
+
+    def _commit(
+        self,
+        saves: List[Task],
+        deletes: List[str],
+        expected: Optional[Dict[str, int]] = None,
+        durable: bool = True,
+    ) -> None:
+        """
+        Write and delete tasks under their write locks.
+
+        Versions are checked (VersionConflict if any expected version is
+        stale) and bumped first. All temp files are then written (and
+        fsynced if durable); if any write fails the temps are removed and no
+        task file changes. Finally every temp file is renamed into place and,
+        if durable, each touched directory is fsynced once.
+        """
+        index = self._index_ready()
+        with self._write_locks([t.taskId for t in saves] + list(deletes)):
+            self._assign_versions(saves, expected or {})
+
+            staged = []
+            try:
+                for task in saves:
+                    staged.append((self._write_temp(task, durable), task))
+            except Exception:
+                for temp_path, _ in staged:
+                    temp_path.unlink(missing_ok=True)
+                raise
+
+            touched = set()
+            for temp_path, task in staged:
+                self._install(temp_path, task)
+                touched.add(temp_path.parent)
+            for task_id in deletes:
+                self._unlink_task_file(task_id)
+                touched.add(self.task_dir(task_id))
+            if durable:
+                for directory in touched:
+                    fsync_dir(directory)
+
+            if index is not None:
+                with index.batch():
+                    for task in saves:
+                        index.add(task)
+                    for task_id in deletes:
+                        index.remove(task_id)
+
+        for task_id in deletes:
+            self._delete_related_files(task_id)
+
+    def _load_cached(
+        self, path: Path, stat_key: StatKey, data: Union[bytes, OSError, None] = None
+    ) -> Optional[Task]:
+        """
+        Return the task stored in ``path``, re-parsing only if its stat changed.
+
+        ``data`` is the file content (or the error reading it) when it was
+        already read by _read_files(). Prints a warning and returns None if
+        the file cannot be loaded.
+        """
+        cached = self._cache.get(path.name)
+        if cached and cached[0] == stat_key:
+            self.cache_hits += 1
+            return cached[1].model_copy()
+
+        self.cache_misses += 1
+        try:
+            task = decode_task(self._file_bytes(path, data))
         except Exception as e:
             # Log error but don't crash
-            print(f"Warning: Failed to load {json_path}: {e}")
+            self._cache.pop(path.name, None)
+            print(f"Warning: Failed to load {path}: {e}")
+            return None
+
+        self._cache[path.name] = (stat_key, task)
+        return task.model_copy()
+
+    def load(self, task_id: str) -> Optional[Task]:
+        """
+        Load task from JSON file.
+
+        Returns None if task doesn't exist or cannot be loaded.
+        """
+        found = self._stat_task_file(task_id)
+        if not found:
+            self._cache.pop(f"{task_id}.json", None)
             return None
 
+        return self._load_cached(*found)
+
     def load_all(self) -> List[Task]:
         """
         Load all tasks, sorted by creation time (oldest first).
 
+        Uses one os.scandir pass (per shard); only new or changed files are
+        parsed. On a cold load their bytes are read on a thread pool first
+        (see load_workers), then validated in scan order.
         Skips tasks that cannot be loaded (with warning).
         """
+        files = self._stat_entries(self._scan_task_files())
+        preloaded = self._read_files(
+            [path for path, stat_key in files if not self._is_cached(path, stat_key)]
+        )
+
         tasks = []
-        for json_file in sorted(self.tasks_dir.glob("*.json")):
-            try:
-                with open(json_file) as f:
-                    task = Task.model_validate_json(f.read())
-                    tasks.append(task)
-            except Exception as e:
-                print(f"Warning: Failed to load {json_file}: {e}")
+        seen = set()
+        for path, stat_key in files:
+            seen.add(path.name)
+            task = self._load_cached(path, stat_key, preloaded.get(path))
+            if task:
+                tasks.append(task)
+
+        # Forget files that no longer exist
+        for name in set(self._cache) - seen:
+            del self._cache[name]
 
         # Sort by creation time
         tasks.sort(key=lambda t: t.createdAt)
         return tasks
 
+    def _load_header_cached(
+        self, path: Path, stat_key: StatKey, data: Union[bytes, OSError, None] = None
+    ) -> Optional[TaskHeader]:
+        """
+        Return the scheduling header stored in ``path`` without validating it.
+
+        Uses the full-task cache when it is current, otherwise parses only
+        the JSON (``data`` as for _load_cached). Prints a warning and returns
+        None if the file is invalid.
+        """
+        cached = self._cache.get(path.name)
+        if cached and cached[0] == stat_key:
+            return TaskHeader.from_task(cached[1])
+
+        cached_header = self._header_cache.get(path.name)
+        if cached_header and cached_header[0] == stat_key:
+            return cached_header[1]
+
+        try:
+            header = TaskHeader.from_dict(json.loads(self._file_bytes(path, data)))
+        except Exception as e:
+            self._header_cache.pop(path.name, None)
+            print(f"Warning: Failed to load {path}: {e}")
+            return None
+
+        self._header_cache[path.name] = (stat_key, header)
+        return header
+
+    def load_header(self, task_id: str) -> Optional[TaskHeader]:
+        """Load a task's scheduling header. Returns None if missing or invalid."""
+        found = self._stat_task_file(task_id)
+        if not found:
+            self._header_cache.pop(f"{task_id}.json", None)
+            return None
+        return self._load_header_cached(*found)
+
+    def load_headers(self, *statuses: TaskStatus) -> List[TaskHeader]:
+        """
+        Load scheduling headers, optionally only for the given states.
+
+        Much cheaper than load_all(): documents are not validated and the
+        prompt, retry history and most timestamps are never converted.
+        With statuses, only the tasks the index lists under them are read.
+        Sorted by creation time (oldest first).
+        """
+        index = self._index_ready() if statuses else None
+        if index is None:
+            return self._scan_headers(*statuses)
+
+        headers = []
+        for status in set(statuses):
+            for task_id in index.get_by_status(status.value):
+                header = self.load_header(task_id)
+                # The file is authoritative if it disagrees with the index
+                if header and header.status in statuses:
+                    headers.append(header)
+        headers.sort(key=lambda h: h.createdAt)
+        return headers
+
+    def _scan_headers(self, *statuses: TaskStatus) -> List[TaskHeader]:
+        """Load headers by scanning every task file (see load_headers)."""
+        files = self._stat_entries(self._scan_task_files())
+        preloaded = self._read_files(
+            [
+                path
+                for path, stat_key in files
+                if not self._is_cached(path, stat_key)
+                and not self._is_cached(path, stat_key, self._header_cache)
+            ]
+        )
+
+        headers = []
+        seen = set()
+        for path, stat_key in files:
+            seen.add(path.name)
+            header = self._load_header_cached(path, stat_key, preloaded.get(path))
+            if header and (not statuses or header.status in statuses):
+                headers.append(header)
+
+        for name in set(self._header_cache) - seen:
+            del self._header_cache[name]
+
+        headers.sort(key=lambda h: h.createdAt)
+        return headers
+
+    @staticmethod
+    def _stat_entries(entries: List[os.DirEntry]) -> List[Tuple[Path, StatKey]]:
+        """Stat scanned task files, dropping any deleted since the scan."""
+        files = []
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue  # Deleted since the scan
+            stat_key = (entry.inode(), st.st_mtime_ns, st.st_size)
+            files.append((Path(entry.path), stat_key))
+        return files
+
+    def _is_cached(self, path: Path, stat_key: StatKey, cache=None) -> bool:
+        """Check whether ``path`` is current in ``cache`` (default: task cache)."""
+        cached = (self._cache if cache is None else cache).get(path.name)
+        return bool(cached) and cached[0] == stat_key
+
+    def _read_files(self, paths: List[Path]) -> Dict[Path, Union[bytes, OSError]]:
+        """
+        Read many task files on a thread pool.
+
+        File reads release the GIL, so on a cold start they overlap while
+        validation stays in the calling thread. Returns {} (callers read
+        lazily) for small batches or when load_workers is 1. Read errors are
+        returned in place of the content so warnings keep scan order.
+        """
+        if len(paths) < PARALLEL_LOAD_MIN or self.load_workers == 1:
+            return {}
+
+        def read_chunk(chunk: List[Path]) -> List[Union[bytes, OSError]]:
+            results = []
+            for path in chunk:
+                try:
+                    with open(path, "rb") as f:
+                        results.append(f.read())
+                except OSError as e:
+                    results.append(e)
+            return results
+
+        chunks = [paths[i : i + READ_CHUNK] for i in range(0, len(paths), READ_CHUNK)]
+        with ThreadPoolExecutor(max_workers=self.load_workers or None) as pool:
+            results = list(pool.map(read_chunk, chunks))
+        return dict(zip(paths, (data for chunk in results for data in chunk)))
+
+    @staticmethod
+    def _file_bytes(path: Path, data: Union[bytes, OSError, None]) -> bytes:
+        """Return preloaded file content, reading the file if there is none."""
+        if isinstance(data, OSError):
+            raise data
+        if data is None:
+            with open(path, "rb") as f:
+                return f.read()
+        return data
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return parsed-task cache counters (hits, misses, cached entries)."""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+        }
+
+    def load_by_status(self, *statuses: TaskStatus) -> List[Task]:
+        """
+        Load tasks in any of the given states, sorted by creation time.
+
+        The JSON backend filters on headers and only validates matching
+        tasks; indexed backends override this.
+        """
+        tasks = []
+        for header in self.load_headers(*statuses):
+            task = self.load(header.taskId)
+            if task:
+                tasks.append(task)
+        return tasks
+
+    def iter_tasks(
+        self,
+        *statuses: TaskStatus,
+        agent: Optional[str] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Yield tasks lazily, oldest first, filtering before full decoding.
+
+        Filters are applied to the unvalidated headers, so only matching
+        tasks are parsed into Task models, one at a time.
+
+        Args:
+            *statuses: Only tasks in these states (all if omitted)
+            agent: Only tasks for this agent
+            created_before: Only tasks created strictly before this time
+            limit: Stop after yielding this many tasks
+        """
+        return self._iter_by_time(
+            "createdAt", statuses, created_before, agent=agent, limit=limit
+        )
+
+    def iter_completed_before(
+        self, before: datetime, *statuses: TaskStatus
+    ) -> Iterator[Task]:
+        """
+        Yield finished tasks whose completedAt is before ``before``, oldest first.
+
+        Tasks without a completedAt count as completed when created. Used by
+        archival: with the index this is one bisect per status.
+        """
+        statuses = statuses or (
+            TaskStatus.COMPLETE,
+            TaskStatus.FAILED,
+            TaskStatus.CANCELLED,
+        )
+        return self._iter_by_time("completedAt", statuses, before)
+
+    def iter_retry_due(self, now: Optional[datetime] = None) -> Iterator[Task]:
+        """
+        Yield failed tasks whose retry backoff expired before ``now``.
+
+        Only tasks that are due for an automatic retry at all (see
+        retry_due_at()) are indexed under retryAt, so the scan touches just
+        the eligible tasks.
+        """
+        return self._iter_by_time(
+            "retryAt", (TaskStatus.FAILED,), now or datetime.now()
+        )
+
+    def _iter_by_time(
+        self,
+        field: str,
+        statuses: Sequence[TaskStatus],
+        before: Optional[datetime],
+        agent: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Yield tasks ordered by a time field, filtering on unvalidated headers.
+
+        With statuses and an index, the candidates come from the index's
+        sorted lists; otherwise every header is loaded and sorted. Each
+        candidate's header is re-checked, since the file is authoritative.
+        """
+        if limit is not None and limit <= 0:
+            return
+        index = self._index_ready() if statuses else None
+        if index is not None:
+            ids = index.ordered_by(field, [s.value for s in statuses], before)
+            candidates = (self.load_header(task_id) for task_id in ids)
+        else:
+            candidates = sorted(
+                (h for h in self.load_headers(*statuses) if h.indexed_time(field)),
+                key=lambda h: h.indexed_time(field),
+            )
+
+        yielded = 0
+        for header in candidates:
+            if header is None or (statuses and header.status not in statuses):
+                continue
+            value = header.indexed_time(field)
+            if value is None or (before and value >= before):
+                if index is None:
+                    return  # Candidates are sorted on this field
+                continue
+            if agent and header.agent != agent:
+                continue
+            task = self._load_streamed(header.taskId)
+            if task:
+                yield task
+                yielded += 1
+                if yielded == limit:
+                    return
+
+    def _load_streamed(self, task_id: str) -> Optional[Task]:
+        """Load a task for iter_tasks() without adding it to the parse cache."""
+        found = self._stat_task_file(task_id)
+        if not found:
+            return None
+        path, stat_key = found
+        cached = self._cache.get(path.name)
+        if cached and cached[0] == stat_key:
+            return cached[1].model_copy()
+        try:
+            with open(path) as f:
+                return decode_task(f.read())
+        except Exception as e:
+            print(f"Warning: Failed to load {path}: {e}")
+            return None
+
+    def count_by_status(self) -> Dict[TaskStatus, int]:
+        """Count tasks per status (every status is present, possibly 0)."""
+        index = self._index_ready()
+        if index is not None:
+            return index.count_by_status()
+        counts = {status: 0 for status in TaskStatus}
+        for header in self._scan_headers():
+            counts[header.status] += 1
+        return counts
+
+    def task_ids(self, *statuses: TaskStatus) -> Set[str]:
+        """
+        IDs of tasks in any of the given states (all tasks if omitted).
+
+        Answered from the index without reading any task file.
+        """
+        index = self._index_ready()
+        if index is None:
+            return {h.taskId for h in self._scan_headers(*statuses)}
+        if not statuses:
+            return index.task_ids()
+        ids = set()
+        for status in statuses:
+            ids.update(index.get_by_status(status.value))
+        return ids
+
+    def _index_ready(self) -> Optional[TaskIndex]:
+        """Return the task index, rebuilding it first if missing or outdated."""
+        if self.index is None:
+            return None
+        if not self.index.is_current:
+            self.rebuild_index()
+        return self.index
+
+    def rebuild_index(self) -> int:
+        """Rebuild the task index from a full scan. Returns tasks indexed."""
+        if self.index is None:
+            return 0
+        # Scan under the index lock so concurrent writes are applied after it
+        with self.index.batch():
+            headers = self._scan_headers()
+            self.index.rebuild(headers)
+        return len(headers)
+
     def delete(self, task_id: str) -> bool:
         """
         Delete all files related to a task.
 
-        Returns True if any files were deleted.
+        Returns True if any files were deleted. Inside transaction() the
+        delete is staged until commit (and True is returned).
         """
+        if self._transaction is not None:
+            self._transaction.delete(task_id)
+            return True
+
+        index = self._index_ready()
+        with self._write_locks([task_id]):
+            deleted = self._unlink_task_file(task_id)
+            if index is not None:
+                index.remove(task_id)
+        return self._delete_related_files(task_id) or deleted
+
+    def _unlink_task_file(self, task_id: str) -> bool:
+        """Remove a task's JSON file (both layouts). Returns True if one existed."""
+        name = f"{task_id}.json"
+        self._cache.pop(name, None)
+        self._header_cache.pop(name, None)
         deleted = False
+        for directory in (self.task_dir(task_id), self._other_dir(task_id)):
+            try:
+                (directory / name).unlink()
+                deleted = True
+            except FileNotFoundError:
+                pass
+        return deleted
 
-        # JSON file
-        json_file = self.tasks_dir / f"{task_id}.json"
-        if json_file.exists():
-            json_file.unlink()
-            deleted = True
+    def _delete_related_files(self, task_id: str) -> bool:
+        """Delete a task's plan, log and sentinel files. Returns True if any existed."""
+        deleted = False
 
         # Plan file
         plan_file = self.plans_dir / f"{task_id}_plan.md"
@@ -124,21 +963,27 @@ class TaskRepository:
             deleted = True
 
         # Sentinel files
-        for suffix in [
-            ".done",
-            ".error",
-            ".cancelled",
-            ".timeout",
-            ".exitcode",
-            ".pid",
-        ]:
-            sentinel_file = self.tasks_dir / f"{task_id}{suffix}"
-            if sentinel_file.exists():
-                sentinel_file.unlink()
-                deleted = True
+        for suffix in SENTINEL_SUFFIXES:
+            for directory in (self.task_dir(task_id), self._other_dir(task_id)):
+                sentinel_file = directory / f"{task_id}{suffix}"
+                if sentinel_file.exists():
+                    sentinel_file.unlink()
+                    deleted = True
 
         return deleted
 
+    # ------------------------------------------------------------------
+    # Sentinels
+    # ------------------------------------------------------------------
+
+    def sentinel_path(self, task_id: str, sentinel_type: str) -> Path:
+        """Path agents should create a sentinel at (active layout)."""
+        return self.task_dir(task_id) / f"{task_id}.{sentinel_type}"
+
+    def find_sentinel(self, task_id: str, sentinel_type: str) -> Optional[Path]:
+        """Existing sentinel file in either layout, or None."""
+        return self._find(task_id, f".{sentinel_type}")
+
     def get_sentinel_files(self, task_id: str) -> Dict[str, bool]:
         """
         Check which sentinel files exist for a task.
@@ -146,18 +991,14 @@ class TaskRepository:
         Returns dict mapping sentinel type to existence boolean.
         """
         return {
-            "done": (self.tasks_dir / f"{task_id}.done").exists(),
-            "error": (self.tasks_dir / f"{task_id}.error").exists(),
-            "cancelled": (self.tasks_dir / f"{task_id}.cancelled").exists(),
-            "timeout": (self.tasks_dir / f"{task_id}.timeout").exists(),
-            "exitcode": (self.tasks_dir / f"{task_id}.exitcode").exists(),
-            "pid": (self.tasks_dir / f"{task_id}.pid").exists(),
+            kind: self.find_sentinel(task_id, kind) is not None
+            for kind in ("done", "error", "cancelled", "timeout", "exitcode", "pid")
         }
 
     def read_sentinel_file(self, task_id: str, sentinel_type: str) -> Optional[str]:
         """Read contents of a sentinel file."""
-        sentinel_file = self.tasks_dir / f"{task_id}.{sentinel_type}"
-        if not sentinel_file.exists():
+        sentinel_file = self.find_sentinel(task_id, sentinel_type)
+        if not sentinel_file:
             return None
 
         try:
@@ -167,13 +1008,13 @@ class TaskRepository:
 
     def write_sentinel_file(self, task_id: str, sentinel_type: str, content: str = ""):
         """Write a sentinel file."""
-        sentinel_file = self.tasks_dir / f"{task_id}.{sentinel_type}"
+        sentinel_file = self._writable_dir(task_id) / f"{task_id}.{sentinel_type}"
         sentinel_file.write_text(content)
 
     def delete_sentinel_file(self, task_id: str, sentinel_type: str):
-        """Delete a sentinel file if it exists."""
-        sentinel_file = self.tasks_dir / f"{task_id}.{sentinel_type}"
-        sentinel_file.unlink(missing_ok=True)
+        """Delete a sentinel file if it exists (in either layout)."""
+        for directory in (self.task_dir(task_id), self._other_dir(task_id)):
+            (directory / f"{task_id}.{sentinel_type}").unlink(missing_ok=True)
 
     # Convenience aliases for cleaner command code
     def get_task(self, task_id: str) -> Optional[Task]:
@@ -187,3 +1028,58 @@ class TaskRepository:
     def list_tasks(self) -> List[Task]:
         """Alias for load_all()."""
         return self.load_all()
+
+    def create_sentinel_file(self, task_id: str, sentinel_type: str, content: str = ""):
+        """Alias for write_sentinel_file()."""
+        return self.write_sentinel_file(task_id, sentinel_type, content)
+
+
+def create_repository(
+    config: Optional[OrchestratorConfig] = None, base_path: Optional[Path] = None
+) -> TaskRepository:
+    """
+    Create the task repository selected by the ``storage`` config section.
+
+    Args:
+        config: Optional config (loaded from .orchestra/config.json if omitted)
+        base_path: Optional custom base path (for testing)
+
+    Returns:
+        A TaskRepository for the configured backend (json, sqlite or journal)
+    """
+    config = config or OrchestratorConfig.load()
+    backend = config.storage.backend
+    layout = config.storage.layout
+    task_format = config.storage.format
+
+    if backend == "sqlite":
+        from .sqlite_repository import SqliteTaskRepository
+
+        db_path = (
+            base_path / "tasks.db" if base_path else Path(config.storage.sqlite_path)
+        )
+        return SqliteTaskRepository(
+            base_path, db_path=db_path, layout=layout, task_format=task_format
+        )
+
+    if backend == "journal":
+        from .journal_repository import JournalTaskRepository
+
+        journal_dir = (
+            base_path / "journal" if base_path else Path(config.storage.journal_dir)
+        )
+        return JournalTaskRepository(
+            base_path,
+            journal_dir=journal_dir,
+            compact_every=config.storage.journal_compact_every,
+            layout=layout,
+        )
+
+    if backend != "json":
+        print(f"Warning: Unknown storage backend '{backend}', using json")
+    return TaskRepository(
+        base_path,
+        layout=layout,
+        task_format=task_format,
+        load_workers=config.storage.load_workers,
+    )
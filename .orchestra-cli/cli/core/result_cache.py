@@ -0,0 +1,278 @@
+"""Content-addressed cache of completed task results."""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.config import CacheConfig, OrchestratorConfig
+from cli.core.models import Task
+from cli.core.repository import TaskRepository
+from cli.utils.locking import file_lock
+from cli.utils.logger import logger
+
+
+def _git(args: List[str], cwd: Optional[Path]) -> Optional[bytes]:
+    """Run a git command, returning its output (None if it fails)."""
+    try:
+        result = subprocess.run(
+            ["git"] + args, cwd=cwd, capture_output=True, timeout=30
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def workspace_fingerprint(
+    cwd: Optional[Path] = None, exclude: str = ".orchestra"
+) -> Optional[str]:
+    """
+    Fingerprint the git work tree: HEAD plus a hash of uncommitted changes.
+
+    The diff against HEAD and the contents of untracked files are hashed,
+    so two trees fingerprint the same only if their files do. ``exclude``
+    (the orchestrator's own state) is left out, as it changes with every
+    task. Returns None outside a git work tree.
+    """
+    head = _git(["rev-parse", "HEAD"], cwd)
+    if head is None:
+        return None
+    pathspec = ["--", ".", f":(exclude){exclude}"]
+    diff = _git(["diff", "HEAD", "--binary"] + pathspec, cwd)
+    untracked = _git(
+        ["ls-files", "--others", "--exclude-standard", "-z"] + pathspec, cwd
+    )
+    if diff is None or untracked is None:
+        return None
+
+    dirty = hashlib.sha256(diff)
+    root = Path(cwd or ".")
+    for name in sorted(untracked.split(b"\0")):
+        if not name:
+            continue
+        dirty.update(b"\0" + name + b"\0")
+        try:
+            dirty.update((root / os.fsdecode(name)).read_bytes())
+        except OSError:
+            pass
+    return f"{head.decode().strip()}+{dirty.hexdigest()}"
+
+
+class ResultCache:
+    """
+    Logs and plans of completed tasks, keyed by what produced them.
+
+    The key is a hash of the agent, its rendered command (see
+    Executor.cache_key) and, optionally, a workspace fingerprint. When a
+    new task's key matches a stored result, the executor restores that
+    log and plan and completes the task without launching the agent.
+
+    Entries are files in a directory next to the tasks with a JSON index.
+    They expire ``ttl_seconds`` after being stored, and the least recently
+    used are evicted once the stored files exceed ``max_bytes``. The daemon
+    and ``status`` both store results, so every read-modify-write of the
+    index runs under a lock file in the cache directory.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        ttl_seconds: int = 604800,
+        max_bytes: int = 100 * 1024 * 1024,
+        workspace: bool = True,
+    ):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.workspace = workspace
+        self.index_path = root / "index.json"
+        self.lock_path = root / "index.lock"
+        self.entries: Dict[str, dict] = {}
+        self._stat = None
+
+    @classmethod
+    def for_repository(
+        cls, repo: TaskRepository, config: Optional[CacheConfig] = None
+    ) -> Optional["ResultCache"]:
+        """Open the cache stored next to a repository's tasks (None if disabled)."""
+        config = config or OrchestratorConfig.load().cache
+        if not config.enabled:
+            return None
+        return cls(
+            repo.tasks_dir.parent / "cache",
+            ttl_seconds=config.ttl_seconds,
+            max_bytes=config.max_size_mb * 1024 * 1024,
+            workspace=config.workspace_fingerprint,
+        )
+
+    def key(self, agent: str, command: List[str]) -> str:
+        """Cache key of an agent's command in the current workspace."""
+        data = {
+            "agent": agent,
+            "command": command,
+            "workspace": workspace_fingerprint() if self.workspace else None,
+        }
+        encoded = json.dumps(data, sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _file_stat(self):
+        try:
+            st = self.index_path.stat()
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _refresh(self):
+        """Reload the index if another process changed it."""
+        stat = self._file_stat()
+        if stat == self._stat:
+            return
+        self._stat = stat
+        self.entries = {}
+        if stat is None:
+            return
+        try:
+            with open(self.index_path) as f:
+                self.entries = json.load(f).get("entries", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load result cache index: {e}")
+
+    def _save(self):
+        """Write the index atomically."""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_suffix(".tmp")
+            with open(temp_path, "w") as f:
+                json.dump({"entries": self.entries}, f, indent=2)
+            os.replace(temp_path, self.index_path)
+            self._stat = self._file_stat()
+        except OSError as e:
+            logger.error(f"Failed to save result cache index: {e}")
+
+    def _path(self, key: str, kind: str) -> Path:
+        return self.root / f"{key}.{kind}"
+
+    def _expired(self, entry: dict, now: datetime) -> bool:
+        if not self.ttl_seconds:
+            return False
+        stored = datetime.fromisoformat(entry["storedAt"])
+        return now - stored > timedelta(seconds=self.ttl_seconds)
+
+    def _remove(self, key: str):
+        self.entries.pop(key, None)
+        for kind in ("log", "plan"):
+            try:
+                self._path(key, kind).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove cached {kind} {key}: {e}")
+
+    def restore(
+        self, key: str, task: Task, now: Optional[datetime] = None
+    ) -> Optional[str]:
+        """
+        Copy a stored result's log and plan to a task's files.
+
+        Returns:
+            The ID of the task that produced the result, or None on a miss
+        """
+        now = now or datetime.now()
+        with file_lock(self.lock_path):
+            self._refresh()
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, now) or not self._path(key, "log").exists():
+                self._remove(key)
+                self._save()
+                return None
+
+            try:
+                for kind, target in (("log", task.logFile), ("plan", task.planFile)):
+                    if kind == "plan" and not entry.get("plan"):
+                        continue
+                    Path(target).parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(self._path(key, kind), target)
+            except OSError as e:
+                logger.warning(
+                    f"Failed to restore cached result for {task.taskId}: {e}"
+                )
+                return None
+
+            entry["lastUsed"] = now.isoformat()
+            entry["hits"] = entry.get("hits", 0) + 1
+            self._save()
+            return entry["taskId"]
+
+    def store(self, key: str, task: Task, now: Optional[datetime] = None) -> bool:
+        """Store a completed task's log and plan under a key. Returns True if stored."""
+        now = now or datetime.now()
+        log_path, plan_path = Path(task.logFile), Path(task.planFile)
+        if not log_path.exists():
+            return False
+
+        with file_lock(self.lock_path):
+            self._refresh()
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(log_path, self._path(key, "log"))
+                size = self._path(key, "log").stat().st_size
+                has_plan = plan_path.exists()
+                if has_plan:
+                    shutil.copyfile(plan_path, self._path(key, "plan"))
+                    size += self._path(key, "plan").stat().st_size
+            except OSError as e:
+                logger.warning(f"Failed to cache result of {task.taskId}: {e}")
+                self._remove(key)
+                return False
+
+            self.entries[key] = {
+                "taskId": task.taskId,
+                "agent": task.agent,
+                "storedAt": now.isoformat(),
+                "lastUsed": now.isoformat(),
+                "hits": 0,
+                "size": size,
+                "plan": has_plan,
+            }
+            self._evict(now)
+            self._save()
+            return key in self.entries
+
+    def _evict(self, now: datetime) -> int:
+        """Drop expired entries, then the least recently used while over size."""
+        removed = 0
+        for key in [k for k, e in self.entries.items() if self._expired(e, now)]:
+            self._remove(key)
+            removed += 1
+        total = self.total_bytes()
+        by_use = sorted(self.entries.items(), key=lambda item: item[1]["lastUsed"])
+        for key, entry in by_use:
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            self._remove(key)
+            removed += 1
+        return removed
+
+    def evict(self, now: Optional[datetime] = None) -> int:
+        """Apply the TTL and size limit now. Returns the number of entries removed."""
+        with file_lock(self.lock_path):
+            self._refresh()
+            removed = self._evict(now or datetime.now())
+            if removed:
+                self._save()
+        return removed
+
+    def total_bytes(self) -> int:
+        """Bytes of stored logs and plans."""
+        return sum(entry["size"] for entry in self.entries.values())
@@ -1,9 +1,10 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from cli.core.models import Task, TaskStatus, RetryHistoryEntry
-from cli.core.repository import TaskRepository
+from cli.core.repository import TaskRepository, VersionConflict
+from cli.utils.ids import new_task_id
 from cli.utils.logger import logger
 
 
@@ -18,10 +19,18 @@ class RetryManager:
         original_task: Task,
         auto_retry: bool,
         max_retries_override: Optional[int] = None,
+        now: Optional[datetime] = None,
     ) -> Optional[Task]:
         """
         Creates a new task as a retry for the original task.
         Returns the new retry task if created, None otherwise.
+
+        The original is saved with a version check, so if another process
+        (e.g. ``status`` auto-retrying too) changed it since it was loaded,
+        no retry is created and None is returned. Inside an outer
+        transaction the check happens at its commit instead.
+
+        ``now`` is the creation time of the retry (defaults to the current time).
         """
         new_retry_count = original_task.retryCount + 1
         effective_max_retries = (
@@ -36,7 +45,8 @@ class RetryManager:
             )
             return None
 
-        new_task_id = f"task_{int(datetime.now().timestamp() * 1000)}"
+        created_at = now or datetime.now()
+        retry_task_id = new_task_id(created_at)
         parent_id = (
             original_task.parentTaskId
             if original_task.parentTaskId
@@ -49,24 +59,24 @@ class RetryManager:
         retry_history.append(
             RetryHistoryEntry(
                 attempt=new_retry_count,
-                timestamp=datetime.now(),
+                timestamp=created_at,
                 error=original_task.errorMessage or "Unknown error",
                 retriedFrom=original_task.taskId,
             )
         )
 
         # Use repository's directory paths to ensure consistency
-        plan_file = str(self.repo.plans_dir / f"{new_task_id}_plan.md")
-        log_file = str(self.repo.logs_dir / f"{new_task_id}.log")
+        plan_file = str(self.repo.plans_dir / f"{retry_task_id}_plan.md")
+        log_file = str(self.repo.logs_dir / f"{retry_task_id}.log")
 
         retry_task = Task(
-            taskId=new_task_id,
+            taskId=retry_task_id,
             status=TaskStatus.PENDING,
             agent=original_task.agent,
             prompt=original_task.prompt,
             planFile=plan_file,
             logFile=log_file,
-            createdAt=datetime.now(),
+            createdAt=created_at,
             retryCount=new_retry_count,
             maxRetries=effective_max_retries,
             autoRetry=auto_retry,
@@ -75,11 +85,10 @@ class RetryManager:
             priority=original_task.priority,
             timeout=original_task.timeout,
             timeoutWarning=original_task.timeoutWarning,
+            deadline=original_task.deadline,
         )
 
-        self.repo.save(retry_task)
-
-        # Create plan file
+        # Create plan file before the retry becomes visible to the scheduler
         plan_path = Path(retry_task.planFile)
         plan_path.parent.mkdir(parents=True, exist_ok=True)
         plan_content = f"# Retry Attempt {new_retry_count}/{effective_max_retries}\n\n"
@@ -97,35 +106,46 @@ class RetryManager:
 
         plan_path.write_text(plan_content)
 
-        # Update original task
-        original_task.retriedBy = new_task_id
-        original_task.retriedAt = datetime.now()
-        self.repo.save(original_task)
+        # Save the retry and the updated original together, so a crash cannot
+        # leave a retry whose original still looks un-retried (or vice versa)
+        expected = original_task.version
+        previous = (original_task.retriedBy, original_task.retriedAt)
+        original_task.retriedBy = retry_task_id
+        original_task.retriedAt = created_at
+        try:
+            with self.repo.transaction() as tx:
+                tx.save(retry_task)
+                tx.save(original_task, expected_version=expected)
+        except VersionConflict:
+            original_task.retriedBy, original_task.retriedAt = previous
+            plan_path.unlink(missing_ok=True)
+            logger.info(
+                f"Task {original_task.taskId} changed while creating its retry; "
+                "skipping"
+            )
+            return None
 
         logger.info(
-            f"Task {new_task_id} created as retry for {original_task.taskId} (attempt {new_retry_count}/{effective_max_retries})"
+            f"Task {retry_task_id} created as retry for {original_task.taskId} (attempt {new_retry_count}/{effective_max_retries})"
         )
         return retry_task
 
-    def is_retry_due(self, task: Task) -> bool:
+    def is_retry_due(self, task: Task, now: Optional[datetime] = None) -> bool:
         """
         Checks if a failed task is due for an automatic retry based on exponential backoff.
-        """
-        if not task.autoRetry or task.status != TaskStatus.FAILED:
-            return False
-
-        if task.retryCount >= task.maxRetries:
-            return False
-
-        # Exponential backoff: 2^retryCount seconds
-        backoff_seconds = 2**task.retryCount
 
-        # Determine the base time for backoff calculation
-        # If retriedAt is set, it means a previous retry occurred, but we are checking if *another* one is due?
-        # No, is_retry_due checks if the *current* failure (task) should trigger a *new* retry task.
-        # So we look at when this task completed (failed).
+        The backoff (2^retryCount seconds) counts from when this task failed.
+        A task that already has a retry (retriedBy) is never due again.
+        """
+        due_at = task.retry_due_at
+        return due_at is not None and (now or datetime.now()) >= due_at
 
-        base_time = task.completedAt or datetime.now()
-        wait_until = base_time + timedelta(seconds=backoff_seconds)
+    def due_retries(self, now: Optional[datetime] = None) -> List[Task]:
+        """
+        Failed tasks whose retry backoff has expired.
 
-        return datetime.now() >= wait_until
+        Served from the repository's retryAt index, so only tasks eligible
+        for an automatic retry are read.
+        """
+        now = now or datetime.now()
+        return [t for t in self.repo.iter_retry_due(now) if self.is_retry_due(t, now)]
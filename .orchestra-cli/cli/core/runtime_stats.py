@@ -0,0 +1,106 @@
+"""Historical task durations per agent."""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.models import Task
+from cli.core.repository import TaskRepository
+from cli.utils.locking import file_lock
+from cli.utils.logger import logger
+
+
+class RuntimeStats:
+    """
+    Exponentially weighted mean run time of completed tasks, per agent.
+
+    Stored as a small JSON file next to the tasks. The reconciler records
+    each successful completion (under a lock file, as the daemon and
+    ``status`` may both reconcile); the scheduler reads the means to
+    estimate how long downstream work will take (see
+    Scheduler.downstream_seconds).
+    """
+
+    # Weight of the newest sample in the moving average
+    ALPHA = 0.2
+    # Estimate for agents with no completed runs when no agent has any
+    DEFAULT_SECONDS = 600.0
+
+    def __init__(self, path: Path, lock_path: Path = None):
+        self.path = path
+        self.lock_path = lock_path or path.with_suffix(".lock")
+        self.agents: Dict[str, Dict[str, float]] = {}
+        self._stat = None
+        self.refresh()
+
+    @classmethod
+    def for_repository(cls, repo: TaskRepository) -> "RuntimeStats":
+        """Open the stats stored next to a repository's tasks."""
+        base = repo.tasks_dir.parent
+        return cls(base / "runtime-stats.json", base / "locks" / "runtime-stats.lock")
+
+    def _file_stat(self):
+        try:
+            st = self.path.stat()
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def refresh(self) -> bool:
+        """Reload the stats if the file changed. Returns True if reloaded."""
+        stat = self._file_stat()
+        if stat == self._stat:
+            return False
+        self._stat = stat
+        self.agents = {}
+        if stat is not None:
+            try:
+                with open(self.path) as f:
+                    self.agents = json.load(f).get("agents", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load runtime stats: {e}")
+        return True
+
+    def record(self, task: Task) -> Optional[float]:
+        """Add a finished task's run time to its agent's mean (returns the mean)."""
+        seconds = task.elapsed_seconds
+        if seconds is None or seconds < 0:
+            return None
+
+        # Read, update and write under the lock so concurrent samples all count
+        with file_lock(self.lock_path):
+            self.refresh()
+            entry = self.agents.get(task.agent)
+            if entry is None:
+                entry = {"mean": seconds, "count": 0}
+            else:
+                entry["mean"] += self.ALPHA * (seconds - entry["mean"])
+            entry["count"] += 1
+            self.agents[task.agent] = entry
+
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_suffix(".tmp")
+                with open(temp_path, "w") as f:
+                    json.dump({"agents": self.agents}, f, indent=2)
+                os.replace(temp_path, self.path)
+                self._stat = self._file_stat()
+            except OSError as e:
+                logger.error(f"Failed to save runtime stats: {e}")
+        return entry["mean"]
+
+    def duration(self, agent: str) -> float:
+        """Expected run time of an agent's task in seconds."""
+        entry = self.agents.get(agent)
+        if entry:
+            return entry["mean"]
+        if self.agents:
+            # Unknown agent: assume the average of the known ones
+            means = [e["mean"] for e in self.agents.values()]
+            return sum(means) / len(means)
+        return self.DEFAULT_SECONDS
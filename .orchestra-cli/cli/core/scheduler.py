@@ -1,23 +1,240 @@
 """Task scheduling and queue management."""
 
 import sys
+from collections import Counter
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Union
 
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.models import Task, TaskStatus
+from cli.core.agents import AgentLimits, load_agent_limits
+from cli.core.config import OrchestratorConfig
+from cli.core.models import Task, TaskHeader, TaskStatus
 from cli.core.repository import TaskRepository
-from cli.core.dependency_resolver import DependencyResolver
+from cli.core.dependency_resolver import DependencyGraph, DependencyResolver
+from cli.core.rate_limit import RateLimiter
+from cli.core.ready_queue import FairQueue
+from cli.core.runtime_stats import RuntimeStats
 
 
 class Scheduler:
-    """Manages task queue and scheduling."""
+    """
+    Manages task queue and scheduling.
 
-    def __init__(self, repo: TaskRepository):
+    Ready tasks are kept in per-agent ReadyQueue heaps owned by the
+    scheduler. The first refresh() loads every pending task; later ones
+    only diff the pending task IDs against what the scheduler already
+    knows, so a long-lived scheduler (the daemon's) never rescans or
+    re-sorts the queue. Tasks with unfinished dependencies wait in a
+    DependencyGraph, and a finished dependency only touches its direct
+    dependents.
+
+    Launch slots are shared between agents by deficit round robin using
+    the maxConcurrent caps and weights from agent-config.json (see
+    FairQueue), so one agent's backlog cannot starve the others. Agents
+    with a rateLimit also need a token from their bucket (see RateLimiter);
+    while it is empty their tasks are skipped like those of a capped agent.
+    The launcher takes the token itself (see Executor.start_task), so a
+    bucket emptied by another process in the meantime stops the launch.
+
+    Within an agent, tasks are ordered by effective priority: the task's
+    priority plus one level per scheduler.aging_interval seconds spent
+    pending. A task is therefore never overtaken by a task submitted more
+    than (P - p) * aging_interval after it, where p is its priority and P
+    the highest priority in use, which bounds its wait under saturation.
+
+    With the critical_path policy, a ready task that gates dependent work
+    also carries the length of its longest downstream path, estimated from
+    each agent's historical run time (see RuntimeStats). Starting the heads
+    of long chains first shortens the makespan of fan-out pipelines. The
+    estimate breaks ties between equal priorities, or with aging counts as
+    time already spent pending.
+
+    Tasks with a deadline must start by deadline - expected run time. When
+    that latest start is less than scheduler.deadline_slack seconds away,
+    the task is launched ahead of the priority order, earliest deadline
+    first. Tasks that can no longer make their deadline keep their normal
+    place and are reported by deadline_risk().
+    """
+
+    def __init__(
+        self,
+        repo: TaskRepository,
+        agent_limits: Optional[Dict[str, AgentLimits]] = None,
+        aging_interval: Optional[int] = None,
+        policy: Optional[str] = None,
+        runtime_stats: Optional[RuntimeStats] = None,
+        deadline_slack: Optional[int] = None,
+    ):
         self.repo = repo
         self.resolver = DependencyResolver(repo)
+        self.agent_limits = (
+            load_agent_limits() if agent_limits is None else agent_limits
+        )
+        if None in (aging_interval, policy, deadline_slack):
+            config = OrchestratorConfig.load().scheduler
+            if aging_interval is None:
+                aging_interval = config.aging_interval
+            if policy is None:
+                policy = config.policy
+            if deadline_slack is None:
+                deadline_slack = config.deadline_slack
+        self.aging_interval = aging_interval
+        self.critical_path = policy == "critical_path"
+        self.runtime_stats = runtime_stats or RuntimeStats.for_repository(repo)
+        self.rate_limiter = RateLimiter.for_repository(
+            repo,
+            {
+                agent: limits.rate_limit
+                for agent, limits in self.agent_limits.items()
+                if limits.rate_limit is not None
+            },
+        )
+        self.ready = FairQueue(
+            {agent: limits.weight for agent, limits in self.agent_limits.items()},
+            aging_interval,
+            deadline_slack,
+        )
+        # Pending tasks whose dependencies are not all complete yet
+        self.graph = DependencyGraph()
+        # Pending tasks blocked by a failed, cancelled or missing dependency
+        self.blocked: Set[str] = set()
+        # Queued tasks that gate dependent work, and the graph version their
+        # downstream estimates were computed at
+        self._ranked: Dict[str, TaskHeader] = {}
+        self._ranked_version: Optional[int] = None
+
+    def refresh(self):
+        """
+        Bring the ready queue up to date with the task store.
+
+        Tasks that stopped being pending (launched, cancelled, deleted) are
+        dropped and new pending tasks are classified. Of the waiting tasks,
+        only the dependents of dependencies that stopped being pending or
+        running are touched: they move to the queue once their last
+        dependency completes, or are blocked if it failed.
+        """
+        pending = self.repo.task_ids(TaskStatus.PENDING)
+        known = set(self.ready) | set(self.graph.waiting) | self.blocked
+
+        for task_id in known - pending:
+            self.ready.discard(task_id)
+            self.graph.discard(task_id)
+            self.blocked.discard(task_id)
+
+        # Set lookups only; a dependency's header is read once it finishes
+        running = self.repo.task_ids(TaskStatus.RUNNING)
+        finished = [
+            dep_id
+            for dep_id in self.graph.open_dependencies()
+            if dep_id not in pending and dep_id not in running
+        ]
+
+        lookup = self.resolver.header_lookup()
+        newly_ready: List[TaskHeader] = []
+        # Blocked-task updates are written in one group commit
+        with self.repo.transaction():
+            for dep_id in finished:
+                dep = lookup(dep_id)
+                if dep and dep.status == TaskStatus.COMPLETE:
+                    newly_ready.extend(self.graph.complete(dep_id))
+                else:
+                    for header in self.graph.drop_dependents(dep_id):
+                        self._admit(header, lookup, newly_ready)
+            for task_id in pending - known:
+                header = self.repo.load_header(task_id)
+                if header:
+                    self._admit(header, lookup, newly_ready)
+        self._queue(newly_ready)
+
+    @property
+    def waiting(self) -> Dict[str, TaskHeader]:
+        """Pending tasks whose dependencies are not all complete yet."""
+        return self.graph.waiting
+
+    def _admit(self, header: TaskHeader, lookup, ready: List[TaskHeader]):
+        """Add a pending task to ``ready``, the waiting graph or the blocked set."""
+        unmet = self.resolver.unmet_dependencies(header, lookup)
+        if unmet is None:
+            self.blocked.add(header.taskId)
+        elif unmet:
+            self.graph.add(header, unmet)
+        else:
+            ready.append(header)
+
+    def _queue(self, headers: List[TaskHeader]):
+        """Queue newly ready tasks; re-rank queued ones if the DAG changed."""
+        if not self.critical_path:
+            for header in headers:
+                self.ready.push(header, latest_start=self.latest_start(header))
+            return
+
+        memo: Dict[str, float] = {}
+        for header in headers:
+            self._push_ranked(header, memo)
+
+        stats_changed = self.runtime_stats.refresh()
+        if not stats_changed and self.graph.version == self._ranked_version:
+            return
+        self._ranked_version = self.graph.version
+        # Queued tasks that gate work now, or did at their last ranking
+        gating = [
+            task_id
+            for task_id in self.graph.dependents
+            if task_id in self.ready and task_id not in self._ranked
+        ]
+        for task_id in list(self._ranked) + gating:
+            header = self._ranked.pop(task_id, None) or self.repo.load_header(task_id)
+            if header and task_id in self.ready:
+                self._push_ranked(header, memo)
+
+    def _push_ranked(self, header: TaskHeader, memo: Dict[str, float]):
+        """Queue a task with its downstream estimate."""
+        downstream = self.downstream_seconds(header.taskId, memo)
+        self.ready.push(header, downstream, self.latest_start(header))
+        if downstream:
+            self._ranked[header.taskId] = header
+        else:
+            self._ranked.pop(header.taskId, None)
+
+    def downstream_seconds(
+        self, task_id: str, memo: Optional[Dict[str, float]] = None
+    ) -> float:
+        """
+        Estimated run time of the longest chain of tasks waiting on this one.
+
+        Follows the dependency graph's reverse edges, weighting each waiting
+        task by its agent's mean run time. Results are stored in ``memo``,
+        so ranking many tasks against one graph visits each edge once.
+        """
+        memo = {} if memo is None else memo
+        dependents = self.graph.dependents
+        expanded = set()
+        stack = [task_id]
+        while stack:
+            node = stack[-1]
+            if node not in memo and node not in expanded:
+                # First visit: compute the dependents first
+                expanded.add(node)
+                stack.extend(
+                    d
+                    for d in dependents.get(node, ())
+                    if d not in memo and d not in expanded
+                )
+                continue
+            stack.pop()
+            if node not in memo:
+                memo[node] = max(
+                    (
+                        self.runtime_stats.duration(self.graph.waiting[d].agent)
+                        + memo.get(d, 0.0)
+                        for d in dependents.get(node, ())
+                    ),
+                    default=0.0,
+                )
+        return memo[task_id]
 
     def get_next_pending(self) -> Optional[Task]:
         """
@@ -25,32 +242,108 @@ class Scheduler:
 
         Returns None if no pending tasks with satisfied dependencies.
         """
-        # Get tasks with satisfied dependencies
-        ready_tasks = self.resolver.get_ready_tasks()
-        if not ready_tasks:
+        tasks = self.get_pending_tasks(1)
+        return tasks[0] if tasks else None
+
+    def effective_priority(
+        self, task: Union[Task, TaskHeader], now: Optional[datetime] = None
+    ) -> float:
+        """A pending task's priority after aging (its priority if aging is off)."""
+        if not self.aging_interval or task.status != TaskStatus.PENDING:
+            return task.priority
+        waited = ((now or datetime.now()) - task.createdAt).total_seconds()
+        return task.priority + max(waited, 0) / self.aging_interval
+
+    def latest_start(self, task: Union[Task, TaskHeader]) -> Optional[datetime]:
+        """When a task must start to meet its deadline (None without one)."""
+        if task.deadline is None:
             return None
+        expected = self.runtime_stats.duration(task.agent)
+        return task.deadline - timedelta(seconds=expected)
 
-        # Sort by priority (higher = more important), then by createdAt (oldest first)
-        ready_tasks.sort(key=lambda t: (-t.priority, t.createdAt))
-        return ready_tasks[0]
+    def deadline_risk(
+        self, task: Task, now: Optional[datetime] = None
+    ) -> Optional[str]:
+        """
+        Describe how a task misses its deadline (None if it doesn't).
+
+        Unfinished tasks are checked against their expected finish time:
+        now (or the start time, if running) plus the agent's mean run time.
+        """
+        if task.deadline is None or task.status in (
+            TaskStatus.FAILED,
+            TaskStatus.CANCELLED,
+        ):
+            return None
+        if task.status == TaskStatus.COMPLETE:
+            if task.completedAt and task.completedAt > task.deadline:
+                return "missed deadline"
+            return None
+
+        now = now or datetime.now()
+        if now > task.deadline:
+            return "past deadline"
+        expected = timedelta(seconds=self.runtime_stats.duration(task.agent))
+        start = (task.status == TaskStatus.RUNNING and task.startedAt) or now
+        if max(start + expected, now) > task.deadline:
+            return "will miss deadline"
+        return None
 
     def get_running_count(self) -> int:
         """Count currently running tasks."""
-        tasks = self.repo.load_all()
-        return sum(1 for t in tasks if t.status == TaskStatus.RUNNING)
+        return self.repo.count_by_status()[TaskStatus.RUNNING]
+
+    def agent_capacity(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Launches allowed now for each agent with a maxConcurrent cap or a
+        rateLimit: free slots, and at most the tokens in its bucket.
+        """
+        capped = {
+            agent: limits.max_concurrent
+            for agent, limits in self.agent_limits.items()
+            if limits.max_concurrent is not None
+        }
+        capacity = {}
+        if capped:
+            running = Counter(
+                h.agent for h in self.repo.load_headers(TaskStatus.RUNNING)
+            )
+            capacity = {
+                agent: max(cap - running[agent], 0) for agent, cap in capped.items()
+            }
+        for agent, tokens in self.rate_limiter.available(now).items():
+            capacity[agent] = min(capacity.get(agent, tokens), tokens)
+        return capacity
 
-    def get_pending_tasks(self, limit: int) -> List[Task]:
+    def get_pending_tasks(
+        self, limit: int, now: Optional[datetime] = None
+    ) -> List[Task]:
         """
         Get multiple pending tasks for parallel execution.
 
+        The returned tasks are taken off the ready queue (O(limit log n))
+        agent by agent in weighted round robin, skipping agents at their
+        maxConcurrent cap; any that are not launched are picked up again by
+        the next refresh.
+
         Args:
             limit: Maximum number of tasks to return
+            now: Current time for rate limits and deadlines (defaults to now)
 
         Returns:
-            List of pending tasks with satisfied dependencies (sorted by priority)
+            List of pending tasks with satisfied dependencies (per agent sorted
+            by priority: higher first, then by createdAt, oldest first)
         """
-        # Get tasks with satisfied dependencies
-        ready_tasks = self.resolver.get_ready_tasks()
-        # Sort by priority (higher = more important), then by createdAt (oldest first)
-        ready_tasks.sort(key=lambda t: (-t.priority, t.createdAt))
-        return ready_tasks[:limit]
+        self.refresh()
+        capacity = self.agent_capacity(now)
+
+        # Only the tasks actually selected are fully loaded
+        tasks = []
+        while len(tasks) < limit:
+            task_id = self.ready.pop(capacity, now)
+            if task_id is None:
+                break
+            task = self.repo.load(task_id)
+            if task and task.status == TaskStatus.PENDING:
+                tasks.append(task)
+        return tasks
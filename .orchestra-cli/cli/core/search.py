@@ -0,0 +1,405 @@
+"""Full-text search over finished tasks.
+
+The search index is an inverted index (term -> task -> term frequency)
+kept in a SQLite database next to the tasks. Each finished task is indexed
+once, from its prompt, error message, plan file and the tail of its log;
+sync() picks up newly finished and newly archived tasks incrementally, so
+queries never rebuild anything.
+
+Queries are bags of terms and "quoted phrases". Every term must match;
+phrases are checked against the candidate documents' text. Results are
+ranked with BM25.
+"""
+
+import math
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Task, TaskStatus
+from .repository import TaskRepository
+from .serialization import decode_task
+from ..utils.logger import logger
+from ..utils.paths import SEARCH_DB_PATH
+
+# Only the end of each log is indexed (errors are usually at the end)
+MAX_LOG_BYTES = 1024 * 1024
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+FINISHED = (TaskStatus.COMPLETE, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    task_id TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    status TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    archived INTEGER NOT NULL DEFAULT 0,
+    preview TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, task_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_task ON postings (task_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_TOKEN = re.compile(r"\w+")
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens (file paths split on . and /)."""
+    return _TOKEN.findall(text.lower())
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """
+    Split a query into required terms and phrases.
+
+    Returns (terms, phrases), where each phrase is its list of tokens. The
+    terms include every token of every phrase.
+    """
+    terms: List[str] = []
+    phrases: List[List[str]] = []
+    for phrase, word in _QUERY_PART.findall(query):
+        tokens = tokenize(phrase if phrase else word)
+        if phrase and len(tokens) > 1:
+            phrases.append(tokens)
+        terms.extend(tokens)
+    return list(dict.fromkeys(terms)), phrases
+
+
+def _contains_phrase(tokens: List[str], phrase: List[str]) -> bool:
+    """Check whether ``phrase`` occurs as consecutive tokens."""
+    first, n = phrase[0], len(phrase)
+    return any(
+        tokens[i : i + n] == phrase
+        for i, token in enumerate(tokens)
+        if token == first
+    )
+
+
+@dataclass
+class SearchResult:
+    """A ranked search hit."""
+
+    task_id: str
+    score: float
+    agent: str
+    status: str
+    archived: bool
+    preview: str
+
+
+class SearchIndex:
+    """Incrementally maintained inverted index over finished tasks."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or SEARCH_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def for_repository(cls, repo: TaskRepository) -> "SearchIndex":
+        """Open the search index stored next to a repository's tasks."""
+        return cls(repo.tasks_dir.parent / "search.db")
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def document_text(task: Task, files_dir: Optional[Path] = None) -> str:
+        """
+        Text indexed for a task: prompt, error, plan and the tail of its log.
+
+        Plan and log files are read from ``files_dir`` (archived tasks) or
+        from the paths recorded in the task; missing files are skipped.
+        """
+        parts = [task.prompt, task.errorMessage or ""]
+        for name, limit in ((task.planFile, None), (task.logFile, MAX_LOG_BYTES)):
+            path = files_dir / Path(name).name if files_dir else Path(name)
+            try:
+                with open(path, "rb") as f:
+                    if limit and f.seek(0, os.SEEK_END) > limit:
+                        f.seek(-limit, os.SEEK_END)
+                    else:
+                        f.seek(0)
+                    parts.append(f.read().decode("utf-8", errors="replace"))
+            except OSError:
+                continue
+        return "\n".join(parts)
+
+    def add(
+        self, task: Task, files_dir: Optional[Path] = None, archived: bool = False
+    ) -> None:
+        """Index (or re-index) a task in one transaction."""
+        tokens = tokenize(self.document_text(task, files_dir))
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM postings WHERE task_id = ?", (task.taskId,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    task.taskId,
+                    task.agent,
+                    task.status.value,
+                    len(tokens),
+                    int(archived),
+                    " ".join(task.prompt.split())[:80],
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?)",
+                [(term, task.taskId, tf) for term, tf in counts.items()],
+            )
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def remove(self, task_ids: Iterable[str]) -> None:
+        """Drop tasks from the index."""
+        rows = [(task_id,) for task_id in task_ids]
+        if not rows:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._conn.executemany("DELETE FROM postings WHERE task_id = ?", rows)
+        self._conn.executemany("DELETE FROM docs WHERE task_id = ?", rows)
+        self._conn.execute("COMMIT")
+
+    def _indexed(self) -> Dict[str, bool]:
+        """Indexed task IDs and whether each is archived."""
+        return {
+            task_id: bool(archived)
+            for task_id, archived in self._conn.execute(
+                "SELECT task_id, archived FROM docs"
+            )
+        }
+
+    def _archive_changed(self, archive_dir: Path) -> bool:
+        """True if the archive directory changed since the last sync."""
+        try:
+            mtime = str(archive_dir.stat().st_mtime_ns)
+        except FileNotFoundError:
+            return False
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'archive_mtime'"
+        ).fetchone()
+        if row and row[0] == mtime:
+            return False
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('archive_mtime', ?)", (mtime,)
+        )
+        return True
+
+    def sync(self, repo: TaskRepository, archive_dir: Optional[Path] = None) -> int:
+        """
+        Bring the index up to date. Returns the number of tasks indexed.
+
+        Finished tasks that are not indexed yet are added. Indexed tasks
+        that left the repository are marked archived if the archive has
+        them and dropped otherwise. When the archive directory changed,
+        archived tasks that were never indexed are added too.
+        """
+        indexed = self._indexed()
+        finished = repo.task_ids(*FINISHED)
+        added = 0
+
+        for task_id in sorted(finished - set(indexed)):
+            task = repo.load(task_id)
+            if task and task.status in FINISHED:
+                self.add(task)
+                added += 1
+
+        gone = {i for i, archived in indexed.items() if not archived} - finished
+        archived_ids: Set[str] = set()
+        if archive_dir is not None:
+            archived_ids = {
+                task_id
+                for task_id in gone
+                if (archive_dir / f"{task_id}.json").exists()
+            }
+        if archived_ids:
+            self._conn.executemany(
+                "UPDATE docs SET archived = 1 WHERE task_id = ?",
+                [(task_id,) for task_id in archived_ids],
+            )
+        self.remove(gone - archived_ids)
+
+        if archive_dir is not None and self._archive_changed(archive_dir):
+            known = set(indexed) | finished
+            for path in sorted(archive_dir.glob("*.json")):
+                if path.stem in known:
+                    continue
+                try:
+                    task = decode_task(path.read_bytes())
+                except Exception as e:
+                    logger.warning(f"Skipping archived file {path}: {e}")
+                    continue
+                self.add(task, archive_dir, archived=True)
+                added += 1
+
+        return added
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        repo: Optional[TaskRepository] = None,
+        archive_dir: Optional[Path] = None,
+        agent: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[SearchResult]:
+        """
+        Return the best-matching tasks, highest BM25 score first.
+
+        Every term must occur in a task. Phrases are verified by re-reading
+        the candidates' text (from ``repo``, or ``archive_dir`` for archived
+        tasks) in score order, stopping once ``limit`` results are found.
+        """
+        terms, phrases = parse_query(query)
+        if not terms:
+            return []
+
+        postings = []
+        for term in terms:
+            rows = dict(
+                self._conn.execute(
+                    "SELECT task_id, tf FROM postings WHERE term = ?", (term,)
+                )
+            )
+            if not rows:
+                return []
+            postings.append(rows)
+
+        # Intersect from the rarest term, so the candidate set shrinks fastest
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for rows in postings[1:]:
+            candidates.intersection_update(rows)
+        docs = self._docs(candidates, agent, status)
+        if not docs:
+            return []
+
+        total, total_length = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs"
+        ).fetchone()
+        avg_length = total_length / total or 1
+        candidates = set(docs)
+
+        scores = {}
+        for rows in postings:
+            idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+            for task_id in candidates:
+                tf = rows[task_id]
+                norm = 1 - BM25_B + BM25_B * docs[task_id][3] / avg_length
+                scores[task_id] = scores.get(task_id, 0.0) + idf * (
+                    tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+                )
+
+        results = []
+        for task_id in sorted(scores, key=lambda i: (-scores[i], i)):
+            _, doc_agent, doc_status, _, archived, preview = docs[task_id]
+            if phrases and not self._matches_phrases(
+                task_id, bool(archived), phrases, repo, archive_dir
+            ):
+                continue
+            results.append(
+                SearchResult(
+                    task_id,
+                    round(scores[task_id], 3),
+                    doc_agent,
+                    doc_status,
+                    bool(archived),
+                    preview,
+                )
+            )
+            if len(results) == limit:
+                break
+        return results
+
+    def _docs(
+        self, task_ids: Set[str], agent: Optional[str], status: Optional[str]
+    ) -> Dict[str, tuple]:
+        """Doc rows for the given tasks that pass the agent/status filters."""
+        docs = {}
+        ids = sorted(task_ids)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i : i + 500]
+            sql = (
+                "SELECT task_id, agent, status, length, archived, preview FROM docs "
+                f"WHERE task_id IN ({', '.join('?' for _ in chunk)})"
+            )
+            params = list(chunk)
+            if agent:
+                sql += " AND agent = ?"
+                params.append(agent)
+            if status:
+                sql += " AND status = ?"
+                params.append(status)
+            docs.update((row[0], row) for row in self._conn.execute(sql, params))
+        return docs
+
+    def _matches_phrases(
+        self,
+        task_id: str,
+        archived: bool,
+        phrases: List[List[str]],
+        repo: Optional[TaskRepository],
+        archive_dir: Optional[Path],
+    ) -> bool:
+        """Check a candidate's text for every phrase (False if unreadable)."""
+        task, files_dir = None, None
+        if archived and archive_dir is not None:
+            try:
+                task = decode_task((archive_dir / f"{task_id}.json").read_bytes())
+                files_dir = archive_dir
+            except Exception:
+                task = None
+        elif repo is not None:
+            task = repo.load(task_id)
+        if task is None:
+            return False
+        tokens = tokenize(self.document_text(task, files_dir))
+        return all(_contains_phrase(tokens, phrase) for phrase in phrases)
+
+    def stats(self) -> dict:
+        """Indexed task and term counts."""
+        tasks, archived = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(archived), 0) FROM docs"
+        ).fetchone()
+        terms = self._conn.execute(
+            "SELECT COUNT(DISTINCT term) FROM postings"
+        ).fetchone()[0]
+        return {"tasks": tasks, "archived": archived, "terms": terms}
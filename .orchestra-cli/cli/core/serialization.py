@@ -0,0 +1,71 @@
+"""On-disk encodings for task documents.
+
+Two formats are supported and every reader accepts both:
+
+- ``json`` (version 1): pretty-printed JSON with every field, including
+  nulls. The original format; easy to read and edit by hand.
+- ``compact`` (version 2): minified JSON produced directly by Pydantic,
+  with null fields omitted and a leading ``"_v": 2`` schema version.
+  Roughly a third smaller, several times faster to write and slightly
+  faster to parse.
+
+Timestamps stay ISO-8601 in both formats: Pydantic parses them natively,
+whereas epoch integers would need a Python-level validator per field and
+make decoding slower than the format they replace.
+"""
+
+import json
+from typing import Union
+
+from .models import Task
+
+
+FORMATS = ("json", "compact")
+COMPACT_VERSION = 2
+
+_VERSION_KEY = '{"_v":'
+_COMPACT_PREFIX = f"{_VERSION_KEY}{COMPACT_VERSION},"
+
+
+def encode_task(task: Task, task_format: str = "json") -> str:
+    """
+    Serialize a task in the given on-disk format.
+
+    Args:
+        task: Task to serialize
+        task_format: "json" (pretty, version 1) or "compact" (version 2)
+    """
+    if task_format == "compact":
+        # model_dump_json always emits "{...}", so splice the version in front
+        return _COMPACT_PREFIX + task.model_dump_json(exclude_none=True)[1:]
+    json_data = task.model_dump(mode="json")
+    return json.dumps(json_data, indent=2, default=str)
+
+
+def detect_format(data: Union[str, bytes]) -> str:
+    """Return the format ("json" or "compact") a task document is stored in."""
+    if isinstance(data, bytes):
+        data = data.decode()
+    return "compact" if data.startswith(_VERSION_KEY) else "json"
+
+
+def decode_task(data: Union[str, bytes]) -> Task:
+    """
+    Parse a task document written in any supported format.
+
+    Bytes are validated directly (no intermediate str), which is the
+    faster path for bulk loads.
+
+    Raises:
+        ValueError: If the document is invalid or from a newer schema version
+    """
+    head = data[: len(_COMPACT_PREFIX)]
+    if isinstance(head, bytes):
+        head = head.decode(errors="replace")
+    if head.startswith(_VERSION_KEY) and head != _COMPACT_PREFIX:
+        if isinstance(data, bytes):
+            data = data.decode(errors="replace")
+        version = data[len(_VERSION_KEY) :].split(",", 1)[0]
+        raise ValueError(f"Unsupported task format version {version}")
+    # Pydantic ignores the "_v" key, so both formats validate the same way
+    return Task.model_validate_json(data)
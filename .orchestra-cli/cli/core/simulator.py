@@ -0,0 +1,549 @@
+"""Discrete-event simulation of the scheduler on a virtual clock."""
+
+import heapq
+import json
+import math
+import random
+import sys
+import tempfile
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.agents import AgentLimits
+from cli.core.models import Task, TaskStatus
+from cli.core.repository import TaskRepository
+from cli.core.retry_manager import RetryManager
+from cli.core.runtime_stats import RuntimeStats
+from cli.core.scheduler import Scheduler
+from cli.core.sqlite_repository import SqliteTaskRepository
+from cli.utils.ids import new_task_id
+
+
+@dataclass
+class AgentProfile:
+    """Run-time and failure distribution of an agent's tasks."""
+
+    mean_seconds: float
+    stddev_seconds: float = 0.0
+    failure_rate: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> Tuple[str, "AgentProfile"]:
+        """
+        Parse ``NAME=MEAN[:STDDEV[:FAILURE_RATE]]`` (seconds, fraction).
+
+        Raises:
+            ValueError: If the spec is malformed or out of range
+        """
+        name, sep, values = spec.partition("=")
+        parts = values.split(":") if sep else []
+        if not name or not 1 <= len(parts) <= 3:
+            raise ValueError(
+                f"Invalid agent profile '{spec}' (NAME=MEAN[:STDDEV[:FAILURE_RATE]])"
+            )
+        numbers = [float(p) for p in parts]
+        profile = cls(*numbers)
+        if profile.mean_seconds <= 0 or profile.stddev_seconds < 0:
+            raise ValueError(f"Invalid durations in agent profile '{spec}'")
+        if not 0 <= profile.failure_rate <= 1:
+            raise ValueError(f"Invalid failure rate in agent profile '{spec}'")
+        return name, profile
+
+    @classmethod
+    def fit(cls, durations: List[float], failures: int) -> "AgentProfile":
+        """Fit a profile to recorded run times and a failure count."""
+        mean = sum(durations) / len(durations)
+        variance = sum((d - mean) ** 2 for d in durations) / len(durations)
+        return cls(max(mean, 1.0), math.sqrt(variance), failures / len(durations))
+
+    def sample(self, rng: random.Random) -> Tuple[float, bool]:
+        """Draw a run time (log-normal with this mean and stddev) and an outcome."""
+        duration = self.mean_seconds
+        if self.stddev_seconds:
+            sigma2 = math.log(1 + (self.stddev_seconds / self.mean_seconds) ** 2)
+            mu = math.log(self.mean_seconds) - sigma2 / 2
+            duration = rng.lognormvariate(mu, math.sqrt(sigma2))
+        return duration, rng.random() < self.failure_rate
+
+
+@dataclass
+class SimTask:
+    """
+    A task submitted to the simulated queue.
+
+    Times are seconds from the start of the simulation. A recorded
+    ``duration``/``fails`` fixes the first attempt; retries (and tasks
+    without a record) are drawn from the agent's profile.
+    """
+
+    key: str
+    agent: str
+    submit_at: float = 0.0
+    priority: int = 5
+    depends_on: List[str] = field(default_factory=list)
+    auto_retry: bool = True
+    max_retries: int = 3
+    deadline: Optional[float] = None
+    duration: Optional[float] = None
+    fails: Optional[bool] = None
+
+
+@dataclass
+class Workload:
+    """Agent profiles and the tasks submitted over a simulation."""
+
+    agents: Dict[str, AgentProfile]
+    tasks: List[SimTask]
+
+    def __post_init__(self):
+        self.tasks = self._ordered(self.tasks)
+        missing = {t.agent for t in self.tasks} - set(self.agents)
+        if missing:
+            raise ValueError(f"No profile for agent(s): {', '.join(sorted(missing))}")
+
+    @staticmethod
+    def _ordered(tasks: List[SimTask]) -> List[SimTask]:
+        """
+        Sort tasks by submission, none before its dependencies.
+
+        A task submitted before a dependency is moved to the dependency's
+        submission time, as ``start`` requires dependencies to exist.
+
+        Raises:
+            ValueError: On unknown dependencies or dependency cycles
+        """
+        by_key = {t.key: t for t in tasks}
+        for task in tasks:
+            unknown = [d for d in task.depends_on if d not in by_key]
+            if unknown:
+                raise ValueError(
+                    f"Task {task.key} depends on unknown task(s): {', '.join(unknown)}"
+                )
+
+        # Post-order DFS: each task gets an index after its dependencies
+        visiting: set = set()
+        done: Dict[str, int] = {}
+        for root in tasks:
+            stack = [(root, False)]
+            while stack:
+                task, expanded = stack.pop()
+                if task.key in done:
+                    continue
+                if expanded:
+                    visiting.discard(task.key)
+                    done[task.key] = len(done)
+                    for dep in task.depends_on:
+                        task.submit_at = max(task.submit_at, by_key[dep].submit_at)
+                    continue
+                if task.key in visiting:
+                    raise ValueError(f"Dependency cycle through task {task.key}")
+                visiting.add(task.key)
+                stack.append((task, True))
+                stack.extend(
+                    (by_key[d], False) for d in task.depends_on if d not in done
+                )
+        return sorted(tasks, key=lambda t: (t.submit_at, done[t.key]))
+
+    @classmethod
+    def synthetic(
+        cls,
+        agents: Dict[str, AgentProfile],
+        num_tasks: int = 100,
+        arrival_seconds: float = 30.0,
+        dependency_rate: float = 0.3,
+        seed: int = 0,
+    ) -> "Workload":
+        """
+        Generate tasks with Poisson arrivals and random dependencies.
+
+        Args:
+            agents: Profiles of the agents tasks are spread over
+            num_tasks: Number of tasks
+            arrival_seconds: Mean time between submissions (0 = all at once)
+            dependency_rate: Chance a task depends on one of the ten before it
+            seed: Random seed
+        """
+        rng = random.Random(seed)
+        names = sorted(agents)
+        tasks: List[SimTask] = []
+        now = 0.0
+        for i in range(num_tasks):
+            if arrival_seconds and i:
+                now += rng.expovariate(1 / arrival_seconds)
+            depends_on = []
+            if tasks and rng.random() < dependency_rate:
+                depends_on = [rng.choice(tasks[-10:]).key]
+            tasks.append(
+                SimTask(
+                    key=f"t{i}",
+                    agent=rng.choice(names),
+                    submit_at=now,
+                    priority=rng.randint(1, 10),
+                    depends_on=depends_on,
+                )
+            )
+        return cls(agents, tasks)
+
+    @classmethod
+    def from_repository(cls, repo: TaskRepository) -> "Workload":
+        """
+        Replay the tasks in a repository.
+
+        Original tasks (not retries) are resubmitted at their recorded
+        offsets, with their recorded run time and outcome if they finished.
+        Agent profiles are fitted to every finished run, retries included.
+
+        Raises:
+            ValueError: If no task has finished yet
+        """
+        tasks = [t for t in repo.load_all() if t.status != TaskStatus.CANCELLED]
+        finished = {
+            t.taskId
+            for t in tasks
+            if t.status in (TaskStatus.COMPLETE, TaskStatus.FAILED)
+            and t.startedAt
+            and t.completedAt
+        }
+        runs: Dict[str, List[float]] = {}
+        failures: Counter = Counter()
+        for task in tasks:
+            if task.taskId in finished:
+                runs.setdefault(task.agent, []).append(max(task.elapsed_seconds, 0.0))
+                failures[task.agent] += task.status == TaskStatus.FAILED
+        if not runs:
+            raise ValueError("No finished tasks to fit run times to")
+
+        fallback = AgentProfile.fit(
+            [d for durations in runs.values() for d in durations],
+            sum(failures.values()),
+        )
+        agents = {
+            agent: AgentProfile.fit(durations, failures[agent])
+            for agent, durations in runs.items()
+        }
+
+        originals = [t for t in tasks if not t.parentTaskId]
+        known = {t.taskId for t in originals}
+        start = min((t.createdAt for t in originals), default=datetime.now())
+        sim_tasks = []
+        for task in originals:
+            agents.setdefault(task.agent, fallback)
+            recorded = task.taskId in finished
+            deadline = task.deadline and (task.deadline - start).total_seconds()
+            sim_tasks.append(
+                SimTask(
+                    key=task.taskId,
+                    agent=task.agent,
+                    submit_at=(task.createdAt - start).total_seconds(),
+                    priority=task.priority,
+                    depends_on=[d for d in task.dependsOn if d in known],
+                    auto_retry=task.autoRetry,
+                    max_retries=task.maxRetries,
+                    deadline=deadline,
+                    duration=task.elapsed_seconds if recorded else None,
+                    fails=task.status == TaskStatus.FAILED if recorded else None,
+                )
+            )
+        return cls(agents, sim_tasks)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Workload":
+        """Create from dictionary (the format written by to_dict)."""
+        agents = {
+            name: AgentProfile(
+                entry["meanSeconds"],
+                entry.get("stddevSeconds", 0.0),
+                entry.get("failureRate", 0.0),
+            )
+            for name, entry in data.get("agents", {}).items()
+        }
+        tasks = [
+            SimTask(
+                key=str(entry["key"]),
+                agent=entry["agent"],
+                submit_at=entry.get("submitAt", 0.0),
+                priority=entry.get("priority", 5),
+                depends_on=[str(d) for d in entry.get("dependsOn", [])],
+                auto_retry=entry.get("autoRetry", True),
+                max_retries=entry.get("maxRetries", 3),
+                deadline=entry.get("deadline"),
+                duration=entry.get("duration"),
+                fails=entry.get("fails"),
+            )
+            for entry in data.get("tasks", [])
+        ]
+        return cls(agents, tasks)
+
+    @classmethod
+    def load(cls, path: Path) -> "Workload":
+        """Load a workload JSON file."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "agents": {
+                name: {
+                    "meanSeconds": p.mean_seconds,
+                    "stddevSeconds": p.stddev_seconds,
+                    "failureRate": p.failure_rate,
+                }
+                for name, p in self.agents.items()
+            },
+            "tasks": [
+                {
+                    "key": t.key,
+                    "agent": t.agent,
+                    "submitAt": t.submit_at,
+                    "priority": t.priority,
+                    "dependsOn": t.depends_on,
+                    "autoRetry": t.auto_retry,
+                    "maxRetries": t.max_retries,
+                    "deadline": t.deadline,
+                    "duration": t.duration,
+                    "fails": t.fails,
+                }
+                for t in self.tasks
+            ],
+        }
+
+    def save(self, path: Path):
+        """Write the workload as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+@dataclass
+class SimulationResult:
+    """Metrics of one simulated run."""
+
+    policy: str
+    max_concurrent: int
+    makespan: float = 0.0
+    # Seconds each launch waited after its task became ready
+    waits: List[float] = field(default_factory=list)
+    busy_seconds: float = 0.0
+    retries: int = 0
+    completed: int = 0
+    failed: int = 0
+    unfinished: int = 0
+    missed_deadlines: int = 0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of the launch slots busy over the makespan."""
+        if not self.makespan:
+            return 0.0
+        return self.busy_seconds / (self.makespan * self.max_concurrent)
+
+    def wait_percentile(self, percent: float) -> float:
+        """Queue wait at a percentile (nearest rank; 0 without launches)."""
+        if not self.waits:
+            return 0.0
+        ordered = sorted(self.waits)
+        rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+
+class Simulation:
+    """
+    Run a workload through the real Scheduler and RetryManager.
+
+    Tasks live in an in-memory SQLite repository and time is virtual: the
+    loop jumps to the next arrival, completion, retry backoff or rate-limit
+    refill, rounded up to the daemon's polling interval, and then does what
+    one daemon cycle does (reconcile, auto-retry, launch). Launches claim
+    tasks without running an agent; each attempt's run time and outcome
+    come from the workload, so every policy sees the same draws.
+    """
+
+    def __init__(
+        self,
+        workload: Workload,
+        policy: str,
+        max_concurrent: int = 3,
+        interval: int = 5,
+        seed: int = 0,
+        agent_limits: Optional[Dict[str, AgentLimits]] = None,
+        aging_interval: Optional[int] = None,
+        deadline_slack: Optional[int] = None,
+    ):
+        self.workload = workload
+        self.policy = policy
+        self.max_concurrent = max_concurrent
+        self.interval = interval
+        self.seed = seed
+        self.agent_limits = agent_limits
+        self.aging_interval = aging_interval
+        self.deadline_slack = deadline_slack
+
+    def run(self) -> SimulationResult:
+        """Simulate until no task can make progress."""
+        with tempfile.TemporaryDirectory(prefix="orchestra-sim-") as base:
+            repo = SqliteTaskRepository(Path(base), db_path=Path(":memory:"))
+            try:
+                return self._run(repo)
+            finally:
+                repo.close()
+
+    @staticmethod
+    def _at(time: datetime, seconds: Optional[float]) -> Optional[datetime]:
+        """A time ``seconds`` after ``time`` (None without seconds)."""
+        return None if seconds is None else time + timedelta(seconds=seconds)
+
+    def _run(self, repo: TaskRepository) -> SimulationResult:
+        stats = RuntimeStats.for_repository(repo)
+        # Start from the agents' known mean run times, as a warm daemon would
+        stats.agents = {
+            agent: {"mean": profile.mean_seconds, "count": 0}
+            for agent, profile in self.workload.agents.items()
+        }
+        scheduler = Scheduler(
+            repo,
+            agent_limits=self.agent_limits,
+            aging_interval=self.aging_interval,
+            policy=self.policy,
+            runtime_stats=stats,
+            deadline_slack=self.deadline_slack,
+        )
+        retry_manager = RetryManager(repo)
+        result = SimulationResult(self.policy, self.max_concurrent)
+        by_key = {t.key: t for t in self.workload.tasks}
+
+        start = datetime(2000, 1, 1)
+        now = start
+        arrivals = deque(self.workload.tasks)
+        running: List[Tuple[datetime, int, str, bool]] = []  # (end, seq, id, fails)
+        retry_due: List[datetime] = []
+        key_of: Dict[str, str] = {}
+        id_of: Dict[str, str] = {}
+        finished_at: Dict[str, datetime] = {}
+        # Workload key -> status of its latest attempt
+        outcome: Dict[str, TaskStatus] = {}
+        completed_at: Dict[str, datetime] = {}
+        seq = 0
+
+        while True:
+            # Reconcile: finish the runs that ended
+            while running and running[0][0] <= now:
+                end, _, task_id, fails = heapq.heappop(running)
+                task = repo.load(task_id)
+                task.status = TaskStatus.FAILED if fails else TaskStatus.COMPLETE
+                task.completedAt = end
+                if fails:
+                    task.errorMessage = "Simulated failure"
+                    if task.retry_due_at:
+                        heapq.heappush(retry_due, task.retry_due_at)
+                else:
+                    stats.record(task)
+                    completed_at[key_of[task_id]] = end
+                repo.save(task)
+                finished_at[task_id] = end
+                outcome[key_of[task_id]] = task.status
+
+            # Submit the tasks that arrived
+            with repo.transaction():
+                while arrivals and self._at(start, arrivals[0].submit_at) <= now:
+                    sim_task = arrivals.popleft()
+                    created = self._at(start, sim_task.submit_at)
+                    task_id = new_task_id(created)
+                    key_of[task_id], id_of[sim_task.key] = sim_task.key, task_id
+                    repo.save(
+                        Task(
+                            taskId=task_id,
+                            status=TaskStatus.PENDING,
+                            agent=sim_task.agent,
+                            prompt=sim_task.key,
+                            planFile=str(repo.plans_dir / f"{task_id}_plan.md"),
+                            logFile=str(repo.logs_dir / f"{task_id}.log"),
+                            createdAt=created,
+                            maxRetries=sim_task.max_retries,
+                            autoRetry=sim_task.auto_retry,
+                            priority=sim_task.priority,
+                            dependsOn=[id_of[d] for d in sim_task.depends_on],
+                            deadline=self._at(start, sim_task.deadline),
+                        )
+                    )
+
+            # Auto-retry failed tasks whose backoff expired
+            while retry_due and retry_due[0] <= now:
+                heapq.heappop(retry_due)
+            with repo.transaction():
+                for task in retry_manager.due_retries(now):
+                    retry = retry_manager.create_retry_task(
+                        task, auto_retry=True, now=now
+                    )
+                    if retry:
+                        key_of[retry.taskId] = key_of[task.taskId]
+                        result.retries += 1
+
+            # Launch into free slots
+            available = self.max_concurrent - len(running)
+            tasks = scheduler.get_pending_tasks(available, now) if available > 0 else []
+            for task in tasks:
+                expected = task.version
+                task.status = TaskStatus.RUNNING
+                task.startedAt = now
+                if not repo.save_if_version(task, expected):
+                    continue
+                if not scheduler.rate_limiter.take(task.agent, now):
+                    # Bucket emptied since the pick: release the claim
+                    task.status = TaskStatus.PENDING
+                    task.startedAt = None
+                    repo.save(task)
+                    continue
+                sim_task = by_key[key_of[task.taskId]]
+                if task.retryCount == 0 and sim_task.duration is not None:
+                    duration, fails = sim_task.duration, bool(sim_task.fails)
+                else:
+                    rng = random.Random(f"{self.seed}:{sim_task.key}:{task.retryCount}")
+                    duration, fails = self.workload.agents[task.agent].sample(rng)
+                duration = max(duration, 0.0)
+                seq += 1
+                end = self._at(now, duration)
+                heapq.heappush(running, (end, seq, task.taskId, fails))
+                ready_at = max(
+                    [task.createdAt]
+                    + [finished_at[d] for d in task.dependsOn if d in finished_at]
+                )
+                result.waits.append((now - ready_at).total_seconds())
+                result.busy_seconds += duration
+
+            # Jump to the daemon cycle after the next event
+            events = [running[0][0]] if running else []
+            if arrivals:
+                events.append(self._at(start, arrivals[0].submit_at))
+            if retry_due:
+                events.append(retry_due[0])
+            if len(scheduler.ready):
+                for agent in scheduler.rate_limiter.limits:
+                    refill = scheduler.rate_limiter.next_token_at(agent, now)
+                    if refill:
+                        events.append(refill)
+            if not events:
+                break
+            cycles = math.ceil((min(events) - start).total_seconds() / self.interval)
+            now = max(
+                self._at(start, cycles * self.interval), self._at(now, self.interval)
+            )
+
+        if finished_at:
+            result.makespan = (max(finished_at.values()) - start).total_seconds()
+        statuses = Counter(outcome.values())
+        result.completed = statuses[TaskStatus.COMPLETE]
+        result.failed = statuses[TaskStatus.FAILED]
+        result.unfinished = len(by_key) - result.completed - result.failed
+        for key, sim_task in by_key.items():
+            if sim_task.deadline is None:
+                continue
+            deadline = self._at(start, sim_task.deadline)
+            if key not in completed_at or completed_at[key] > deadline:
+                result.missed_deadlines += 1
+        return result
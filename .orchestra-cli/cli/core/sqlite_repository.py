@@ -0,0 +1,371 @@
+"""SQLite (WAL mode) storage backend for tasks.
+
+Task documents are stored as JSON in a single table, with the fields used
+for scheduling and queries (status, priority, agent, createdAt, completedAt
+and the retry due time) mirrored into indexed columns. Sentinel, plan and
+log files stay on the file system so the agent-facing protocol is
+unchanged.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+from .models import Task, TaskHeader, TaskStatus
+from .repository import TaskRepository
+from .serialization import decode_task, detect_format, encode_task
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    agent TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL,
+    completed_at TEXT,
+    retry_at TEXT
+);
+"""
+
+# Created after any column migration, since some use the newer columns
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_agent ON tasks (agent);
+CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (status, completed_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_retry ON tasks (retry_at)
+    WHERE retry_at IS NOT NULL;
+"""
+
+# Scheduling columns; the rest of the header is extracted from the document
+HEADER_SQL = (
+    "SELECT task_id, status, priority, created_at, "
+    "json_extract(data, '$.dependsOn'), json_extract(data, '$.pid'), "
+    "json_extract(data, '$.blockedBy'), json_extract(data, '$.version'), "
+    "agent, json_extract(data, '$.completedAt'), retry_at, "
+    "json_extract(data, '$.deadline') FROM tasks"
+)
+
+INSERT_SQL = (
+    "INSERT OR REPLACE INTO tasks "
+    "(task_id, status, priority, agent, created_at, data, completed_at, retry_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Column holding each of TaskHeader.TIME_FIELDS
+TIME_COLUMNS = {
+    "createdAt": "created_at",
+    "completedAt": "completed_at",
+    "retryAt": "retry_at",
+}
+
+
+class SqliteTaskRepository(TaskRepository):
+    """Task repository backed by a SQLite database in WAL mode."""
+
+    # Status queries use the indexed columns instead of a TaskIndex
+    USES_INDEX = False
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        db_path: Optional[Path] = None,
+        layout: str = "flat",
+        task_format: str = "json",
+    ):
+        """
+        Initialize repository.
+
+        Args:
+            base_path: Optional custom base path (for testing)
+            db_path: Database file (defaults to tasks.db next to the tasks dir)
+            layout: Sentinel file layout ("flat" or "sharded")
+            task_format: Encoding of the data column ("json" or "compact")
+        """
+        super().__init__(base_path, layout, task_format)
+        self.db_path = db_path or self.tasks_dir.parent / "tasks.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit mode: every statement is its own transaction unless
+        # explicitly wrapped in BEGIN/COMMIT.
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate_columns()
+        self._conn.executescript(INDEXES)
+
+    def _migrate_columns(self):
+        """Add and backfill the time columns in databases created before them."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "retry_at" in columns:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for column in ("completed_at", "retry_at"):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} TEXT")
+            rows = self._conn.execute("SELECT task_id, data FROM tasks").fetchall()
+            self._conn.executemany(
+                "UPDATE tasks SET completed_at = ?, retry_at = ? WHERE task_id = ?",
+                [
+                    self._row_values(task)[6:] + (task.taskId,)
+                    for task in self._decode_rows(rows)
+                ],
+            )
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def _row_values(self, task: Task) -> tuple:
+        """Column values for a task row."""
+        if self.task_format == "compact":
+            data = encode_task(task, "compact")
+        else:
+            json_data = task.model_dump(mode="json")
+            data = json.dumps(json_data, separators=(",", ":"), default=str)
+        header = TaskHeader.from_task(task)
+        return (
+            task.taskId,
+            task.status.value,
+            task.priority,
+            task.agent,
+            task.createdAt.isoformat(),
+            data,
+            header.indexed_time("completedAt").isoformat(),
+            header.retryAt.isoformat() if header.retryAt else None,
+        )
+
+    def _decode_rows(self, rows) -> List[Task]:
+        """Validate task rows, skipping (with warning) any that fail."""
+        tasks = []
+        for task_id, data in rows:
+            try:
+                tasks.append(decode_task(data))
+            except Exception as e:
+                print(f"Warning: Failed to load {task_id} from {self.db_path}: {e}")
+        return tasks
+
+    def save(self, task: Task) -> None:
+        """Insert or replace a task row (atomic per statement)."""
+        if self._transaction is not None:
+            self._transaction.save(task)
+            return
+        self._commit([task], [])
+
+    def _stored_version(self, task_id: str) -> int:
+        """Version of the stored row (0 if missing)."""
+        row = self._conn.execute(
+            "SELECT json_extract(data, '$.version') FROM tasks WHERE task_id = ?",
+            (task_id,),
+        ).fetchone()
+        return (row[0] or 0) if row else 0
+
+    def _commit(
+        self,
+        saves: List[Task],
+        deletes: List[str],
+        expected: Optional[Dict[str, int]] = None,
+        durable: bool = True,
+    ) -> None:
+        """
+        Apply writes and deletes in one SQLite transaction.
+
+        BEGIN IMMEDIATE takes the database write lock, so the version check
+        and the writes are atomic with respect to other writers.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._assign_versions(saves, expected or {})
+            self._conn.executemany(INSERT_SQL, [self._row_values(t) for t in saves])
+            self._conn.executemany(
+                "DELETE FROM tasks WHERE task_id = ?", [(i,) for i in deletes]
+            )
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+        for task_id in deletes:
+            TaskRepository.delete(self, task_id)
+
+    def migrate_format(self, task_format: str, batch_size: int = 500) -> int:
+        """Re-encode every row in ``task_format``, one transaction per batch."""
+        self.task_format = task_format
+        migrated = 0
+        last_id = ""
+        while True:
+            rows = self._conn.execute(
+                "SELECT task_id, data FROM tasks WHERE task_id > ? "
+                "ORDER BY task_id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                return migrated
+            last_id = rows[-1][0]
+            stale = self._decode_rows(
+                [r for r in rows if detect_format(r[1]) != task_format]
+            )
+            self.save_many(stale)
+            migrated += len(stale)
+
+    def load(self, task_id: str) -> Optional[Task]:
+        """Load a task by ID. Returns None if missing or invalid."""
+        row = self._conn.execute(
+            "SELECT task_id, data FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        if not row:
+            return None
+        tasks = self._decode_rows([row])
+        return tasks[0] if tasks else None
+
+    def _decode_headers(self, rows) -> List[TaskHeader]:
+        """Build headers from HEADER_SQL rows, skipping (with warning) bad rows."""
+        headers = []
+        for row in rows:
+            task_id, status, priority, created_at, depends_on = row[:5]
+            pid, blocked_by, version, agent, completed_at, retry_at = row[5:11]
+            deadline = row[11]
+            try:
+                header = TaskHeader.from_dict(
+                    {
+                        "taskId": task_id,
+                        "status": status,
+                        "priority": priority,
+                        "createdAt": created_at,
+                        "dependsOn": json.loads(depends_on or "[]"),
+                        "pid": pid,
+                        "blockedBy": blocked_by,
+                        "version": version or 0,
+                        "agent": agent,
+                        "completedAt": completed_at,
+                        "deadline": deadline,
+                    }
+                )
+                # The retry fields are not selected; use the stored due time
+                header.retryAt = datetime.fromisoformat(retry_at) if retry_at else None
+                headers.append(header)
+            except Exception as e:
+                print(f"Warning: Failed to load {task_id} from {self.db_path}: {e}")
+        return headers
+
+    def load_header(self, task_id: str) -> Optional[TaskHeader]:
+        """Load a task's scheduling header from the indexed columns."""
+        rows = self._conn.execute(
+            f"{HEADER_SQL} WHERE task_id = ?", (task_id,)
+        ).fetchall()
+        headers = self._decode_headers(rows)
+        return headers[0] if headers else None
+
+    def load_headers(self, *statuses: TaskStatus) -> List[TaskHeader]:
+        """Load scheduling headers (optionally by status) without validation."""
+        if statuses:
+            placeholders = ", ".join("?" for _ in statuses)
+            rows = self._conn.execute(
+                f"{HEADER_SQL} WHERE status IN ({placeholders}) ORDER BY created_at",
+                [s.value for s in statuses],
+            ).fetchall()
+        else:
+            rows = self._conn.execute(f"{HEADER_SQL} ORDER BY created_at").fetchall()
+        return self._decode_headers(rows)
+
+    def load_all(self) -> List[Task]:
+        """Load all tasks, sorted by creation time (oldest first)."""
+        rows = self._conn.execute(
+            "SELECT task_id, data FROM tasks ORDER BY created_at"
+        ).fetchall()
+        return self._decode_rows(rows)
+
+    def load_by_status(self, *statuses: TaskStatus) -> List[Task]:
+        """Load tasks in any of the given states using the status index."""
+        if not statuses:
+            return []
+        placeholders = ", ".join("?" for _ in statuses)
+        rows = self._conn.execute(
+            f"SELECT task_id, data FROM tasks WHERE status IN ({placeholders}) "
+            "ORDER BY created_at",
+            [s.value for s in statuses],
+        ).fetchall()
+        return self._decode_rows(rows)
+
+    def _iter_by_time(
+        self,
+        field: str,
+        statuses: Sequence[TaskStatus],
+        before: Optional[datetime],
+        agent: Optional[str] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 200,
+    ) -> Iterator[Task]:
+        """Yield tasks ordered by a time field, with all filters evaluated in SQL."""
+        column = TIME_COLUMNS[field]
+        where, params = [f"{column} IS NOT NULL"], []
+        if statuses:
+            where.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(s.value for s in statuses)
+        if agent:
+            where.append("agent = ?")
+            params.append(agent)
+        if before:
+            where.append(f"{column} < ?")
+            params.append(before.isoformat())
+        sql = "SELECT task_id, data FROM tasks WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {column}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(max(limit, 0))
+
+        cursor = self._conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from self._decode_rows(rows)
+
+    def task_ids(self, *statuses: TaskStatus) -> Set[str]:
+        """IDs of tasks in the given states (all if omitted), from the index."""
+        if not statuses:
+            return {row[0] for row in self._conn.execute("SELECT task_id FROM tasks")}
+        placeholders = ", ".join("?" for _ in statuses)
+        rows = self._conn.execute(
+            f"SELECT task_id FROM tasks WHERE status IN ({placeholders})",
+            [s.value for s in statuses],
+        )
+        return {row[0] for row in rows}
+
+    def count_by_status(self) -> Dict[TaskStatus, int]:
+        """Count tasks per status with a single indexed GROUP BY."""
+        counts = {status: 0 for status in TaskStatus}
+        for status, count in self._conn.execute(
+            "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+        ):
+            try:
+                counts[TaskStatus(status)] = count
+            except ValueError:
+                print(f"Warning: Unknown status '{status}' in {self.db_path}")
+        return counts
+
+    def delete(self, task_id: str) -> bool:
+        """
+        Delete a task row and all related files.
+
+        Returns True if anything was deleted.
+        """
+        if self._transaction is not None:
+            self._transaction.delete(task_id)
+            return True
+        cursor = self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+        deleted_files = super().delete(task_id)
+        return cursor.rowcount > 0 or deleted_files
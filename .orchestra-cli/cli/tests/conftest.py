@@ -10,6 +10,8 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from cli.core.repository import TaskRepository
+from cli.core.sqlite_repository import SqliteTaskRepository
+from cli.core.journal_repository import JournalTaskRepository
 from cli.core.models import Task, TaskStatus
 
 
@@ -23,11 +25,8 @@ def temp_orchestra_dir(tmp_path, monkeypatch):
     (orchestra_dir / "logs").mkdir()
     (orchestra_dir / "archive").mkdir()
     
-    # Monkeypatch the paths module to use temp directory
-    monkeypatch.setattr("cli.utils.paths.ORCHESTRA_DIR", str(orchestra_dir))
-    monkeypatch.setattr("cli.utils.paths.TASKS_DIR", str(orchestra_dir / "tasks"))
-    monkeypatch.setattr("cli.utils.paths.PLANS_DIR", str(orchestra_dir / "plans"))
-    monkeypatch.setattr("cli.utils.paths.LOGS_DIR", str(orchestra_dir / "logs"))
+    # Run from the temp directory so relative .orchestra/ paths resolve there
+    monkeypatch.chdir(tmp_path)
     
     return orchestra_dir
 
@@ -38,6 +37,20 @@ def repo(temp_orchestra_dir):
     return TaskRepository()
 
 
+@pytest.fixture
+def sqlite_repo(temp_orchestra_dir):
+    """Create a SqliteTaskRepository with temp directory."""
+    repo = SqliteTaskRepository(temp_orchestra_dir)
+    yield repo
+    repo.close()
+
+
+@pytest.fixture
+def journal_repo(temp_orchestra_dir):
+    """Create a JournalTaskRepository with temp directory."""
+    return JournalTaskRepository(temp_orchestra_dir, compact_every=1000)
+
+
 @pytest.fixture
 def sample_task():
     """Create a sample task for testing."""
@@ -0,0 +1,142 @@
+"""Tests for load-aware admission control."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.admission import (
+    AdmissionController,
+    HostLoad,
+    parse_meminfo,
+    parse_pressure,
+)
+from cli.core.config import AdmissionConfig, OrchestratorConfig
+
+PSI = (
+    "some avg10={} avg60=1.00 avg300=0.50 total=12345\n"
+    "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+)
+
+
+@pytest.fixture
+def fake_host(tmp_path, monkeypatch):
+    """A fake /proc and cgroup v2 tree, with a fixed load average."""
+    proc = tmp_path / "proc"
+    cgroup = tmp_path / "cgroup"
+    (proc / "self").mkdir(parents=True)
+    (proc / "self" / "cgroup").write_text("0::/orchestra.slice\n")
+    (proc / "meminfo").write_text(
+        "MemTotal:  8000000 kB\nMemFree:  1000000 kB\nMemAvailable:  2097152 kB\n"
+    )
+    slice_dir = cgroup / "orchestra.slice"
+    slice_dir.mkdir(parents=True)
+    for resource, value in [("cpu", 5.0), ("memory", 1.5), ("io", 40.0)]:
+        (slice_dir / f"{resource}.pressure").write_text(PSI.format(value))
+    monkeypatch.setattr("os.getloadavg", lambda: (4.0, 3.0, 2.0))
+    monkeypatch.setattr("os.cpu_count", lambda: 4)
+    return proc, cgroup
+
+
+def controller(fake_host, **thresholds):
+    """An admission controller reading the fake host."""
+    proc, cgroup = fake_host
+    return AdmissionController(AdmissionConfig(**thresholds), proc, cgroup)
+
+
+class TestParsing:
+    """Test /proc/meminfo and PSI parsing."""
+
+    def test_meminfo(self):
+        """MemAvailable is returned in MB; a missing field gives None."""
+        assert parse_meminfo("MemTotal: 4096 kB\nMemAvailable: 2048 kB\n") == 2.0
+        assert parse_meminfo("MemTotal: 4096 kB\n") is None
+
+    def test_pressure(self):
+        """The "some avg10" value is used."""
+        assert parse_pressure(PSI.format(12.5)) == 12.5
+        assert parse_pressure("full avg10=3.00 avg60=0 avg300=0 total=0") is None
+
+
+class TestAdmissionController:
+    """Test sampling and launch decisions."""
+
+    def test_samples_every_source(self, fake_host):
+        """Load, memory and the cgroup's pressure files are all read."""
+        load = controller(fake_host).sample()
+        assert load.load_per_cpu == 1.0
+        assert load.available_mb == 2048
+        assert load.pressure == {"cpu": 5.0, "memory": 1.5, "io": 40.0}
+
+    def test_falls_back_to_system_pressure(self, fake_host):
+        """Without cgroup v2 PSI files, /proc/pressure is used."""
+        proc, cgroup = fake_host
+        (proc / "self" / "cgroup").write_text("4:memory:/orchestra\n")
+        (proc / "pressure").mkdir()
+        (proc / "pressure" / "cpu").write_text(PSI.format(7.0))
+        load = controller(fake_host).sample()
+        assert load.pressure == {"cpu": 7.0}
+
+    def test_missing_sources_are_skipped(self, tmp_path, monkeypatch):
+        """A host without /proc files or load average admits every launch."""
+
+        def no_loadavg():
+            raise OSError("unsupported")
+
+        monkeypatch.setattr("os.getloadavg", no_loadavg)
+        admission = AdmissionController(AdmissionConfig(), tmp_path, tmp_path)
+        assert admission.sample() == HostLoad()
+        assert admission.admit()
+
+    def test_admits_under_thresholds(self, fake_host):
+        """The default thresholds admit a moderately loaded host."""
+        admission = controller(fake_host)
+        assert admission.admit()
+        assert not admission.deferrals
+
+    @pytest.mark.parametrize(
+        "thresholds, check",
+        [
+            ({"max_load_per_cpu": 0.5}, "cpu-load"),
+            ({"min_available_mb": 4096}, "memory"),
+            ({"max_cpu_pressure": 2.0}, "cpu-pressure"),
+            ({"max_io_pressure": 25.0}, "io-pressure"),
+        ],
+    )
+    def test_defers_over_threshold(self, fake_host, thresholds, check):
+        """Each exceeded threshold defers the launch and is recorded."""
+        admission = controller(fake_host, **thresholds)
+        assert not admission.admit()
+        assert not admission.admit()
+        assert admission.deferrals == {check: 2}
+        assert admission.last_reason.startswith(f"{check}:")
+
+    def test_zero_disables_a_check(self, fake_host):
+        """A threshold of 0 turns that check off."""
+        assert controller(fake_host, max_load_per_cpu=0, max_io_pressure=0).admit()
+
+    def test_resumes_when_load_drops(self, fake_host, monkeypatch):
+        """Launches resume once the host is back under the thresholds."""
+        admission = controller(fake_host, max_load_per_cpu=0.5)
+        assert not admission.admit()
+        monkeypatch.setattr("os.getloadavg", lambda: (1.0, 1.0, 1.0))
+        assert admission.admit()
+        assert admission.deferred_since is None
+        assert admission.last_reason is None
+        assert admission.deferrals == {"cpu-load": 1}
+
+    def test_disabled(self, fake_host):
+        """With admission control disabled, every launch is admitted."""
+        assert controller(fake_host, enabled=False, max_load_per_cpu=0.1).admit()
+
+    def test_config_round_trip(self, tmp_path):
+        """Admission settings are saved and loaded with the config."""
+        config = OrchestratorConfig()
+        config.admission.max_memory_pressure = 35.0
+        config.admission.enabled = False
+        config.save(tmp_path / "config.json")
+        loaded = OrchestratorConfig.load(tmp_path / "config.json")
+        assert loaded.admission == config.admission
@@ -6,8 +6,10 @@ from pathlib import Path
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.dependency_resolver import DependencyResolver
-from cli.core.models import Task, TaskStatus
+from datetime import datetime
+
+from cli.core.dependency_resolver import DependencyGraph, DependencyResolver
+from cli.core.models import Task, TaskHeader, TaskStatus
 
 
 class TestDependencyResolver:
@@ -32,6 +34,33 @@ class TestDependencyResolver:
         assert "task_2" in graph
         assert "task_1" in graph["task_2"]
 
+    def test_block_does_not_undo_cancel(self, repo, sample_task):
+        """A task cancelled after its header was read stays cancelled."""
+        dep = sample_task.model_copy()
+        dep.taskId = "task_1"
+        dep.status = TaskStatus.FAILED
+        task = sample_task.model_copy()
+        task.taskId = "task_2"
+        task.dependsOn = ["task_1"]
+        repo.save_many([dep, task])
+
+        resolver = DependencyResolver(repo)
+        header = repo.load_header("task_2")
+        task.status = TaskStatus.CANCELLED
+        repo.save(task)
+
+        assert resolver.unmet_dependencies(header) is None
+        stored = repo.load("task_2")
+        assert stored.status == TaskStatus.CANCELLED
+        assert stored.blockedBy is None
+
+        # A still-pending dependent is blocked as before
+        task.taskId = "task_3"
+        task.status = TaskStatus.PENDING
+        repo.save(task)
+        assert resolver.unmet_dependencies(repo.load_header("task_3")) is None
+        assert repo.load("task_3").blockedBy == "task_1"
+
     def test_detect_cycle_no_cycle(self, repo, sample_task):
         """Should not detect cycle in valid graph."""
         task1 = sample_task.model_copy()
@@ -143,3 +172,35 @@ class TestDependencyResolver:
         assert valid is False
         assert "cycle" in msg.lower()
 
+
+class TestDependencyGraph:
+    """Test reverse edges and remaining-dependency counters."""
+
+    @staticmethod
+    def header(task_id, *deps):
+        return TaskHeader(
+            task_id, TaskStatus.PENDING, 5, datetime(2026, 1, 1), list(deps)
+        )
+
+    def test_released_after_last_dependency(self):
+        """A task is released only when its last unmet dependency completes."""
+        graph = DependencyGraph()
+        graph.add(self.header("c", "a", "b"), ["a", "b"])
+        graph.add(self.header("d", "a"), ["a"])
+
+        assert [h.taskId for h in graph.complete("a")] == ["d"]
+        assert graph.remaining == {"c": 1}
+        assert [h.taskId for h in graph.complete("b")] == ["c"]
+        assert len(graph) == 0
+        assert graph.dependents == {}
+
+    def test_discard_removes_reverse_edges(self):
+        """A task that stops waiting is unlinked from its dependencies."""
+        graph = DependencyGraph()
+        graph.add(self.header("c", "a", "b"), ["a", "b"])
+        graph.add(self.header("d", "b"), ["b"])
+        graph.discard("c")
+
+        assert graph.open_dependencies() == ["b"]
+        assert [h.taskId for h in graph.drop_dependents("b")] == ["d"]
+        assert len(graph) == 0
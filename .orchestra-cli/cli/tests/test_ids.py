@@ -0,0 +1,45 @@
+"""Tests for task ID generation."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.utils.ids import new_task_id, task_id_time
+
+
+class TestTaskIds:
+    """Test cases for new_task_id()."""
+
+    def test_unique_within_same_millisecond(self):
+        """IDs generated for the same instant must all differ and increase."""
+        now = datetime.now()
+        ids = [new_task_id(now) for _ in range(1000)]
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
+
+    def test_sorts_after_legacy_ids(self):
+        """New IDs should sort by time against legacy task_<ms> IDs."""
+        now = datetime.now()
+        ms = int(now.timestamp() * 1000)
+        legacy_before = f"task_{ms - 1}"
+        legacy_after = f"task_{ms + 10_000}"
+        assert legacy_before < new_task_id(now) < legacy_after
+
+    def test_matches_legacy_pattern(self):
+        """IDs should stay 'task_' followed by digits only."""
+        task_id = new_task_id()
+        assert task_id.startswith("task_")
+        assert task_id[5:].isdigit()
+
+    def test_task_id_time(self):
+        """Should recover the creation time from new and legacy IDs."""
+        then = datetime(2025, 1, 2, 3, 4, 5, 678000)
+        assert task_id_time(f"task_{int(then.timestamp() * 1000)}") == then
+
+        now = datetime.now()
+        embedded = task_id_time(new_task_id(now))
+        assert abs((embedded - now).total_seconds()) < 1
+        assert task_id_time("task_test_123") is None
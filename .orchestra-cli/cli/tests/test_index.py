@@ -0,0 +1,229 @@
+"""Tests for the repository-maintained task index."""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.index import TaskIndex
+from cli.core.models import TaskHeader, TaskStatus
+from cli.core.repository import TaskRepository
+
+
+class TestIndexMaintenance:
+    """Test that writes keep the index current."""
+
+    def test_save_adds_and_moves_status(self, repo, sample_task):
+        """New tasks are indexed; status changes move them."""
+        repo.save(sample_task)
+        assert repo.index.status_of(sample_task.taskId) == "pending"
+
+        sample_task.status = TaskStatus.RUNNING
+        repo.save(sample_task)
+        assert repo.index.status_of(sample_task.taskId) == "running"
+        assert repo.index.get_by_agent("coder") == [sample_task.taskId]
+
+    def test_priority_change_reindexes(self, repo, sample_task):
+        """Changing the priority moves the task between priority buckets."""
+        repo.save(sample_task)
+        sample_task.priority = 9
+        repo.save(sample_task)
+        assert repo.index.get_by_priority(9) == [sample_task.taskId]
+        assert repo.index.get_by_priority(5) == []
+
+    def test_delete_removes(self, repo, sample_task, completed_task):
+        """Deletes (single and grouped) drop tasks from the index."""
+        repo.save_many([sample_task, completed_task])
+        repo.delete(sample_task.taskId)
+        repo.delete_many([completed_task.taskId])
+        assert repo.index.task_ids() == set()
+        assert TaskIndex(repo.index.path).task_ids() == set()
+
+    def test_failed_transaction_leaves_index_alone(self, repo, sample_task):
+        """Nothing is indexed when a transaction is rolled back."""
+        with pytest.raises(RuntimeError):
+            with repo.transaction():
+                repo.save(sample_task)
+                raise RuntimeError("boom")
+        assert repo.index.status_of(sample_task.taskId) is None
+
+    def test_shared_between_processes(self, temp_orchestra_dir, sample_task):
+        """A second repository sees writes made through the first."""
+        first = TaskRepository(temp_orchestra_dir)
+        second = TaskRepository(temp_orchestra_dir)
+        assert second.count_by_status()[TaskStatus.PENDING] == 0
+
+        first.save(sample_task)
+        assert second.count_by_status()[TaskStatus.PENDING] == 1
+
+
+class TestIndexQueries:
+    """Test that status queries are answered from the index."""
+
+    def test_status_query_reads_only_indexed_tasks(
+        self, repo, sample_task, completed_task
+    ):
+        """load_headers(status) reads indexed IDs, not every file."""
+        repo.save(sample_task)
+        # Written behind the repository's back: invisible to indexed queries
+        path = repo.tasks_dir / f"{completed_task.taskId}.json"
+        path.write_text(completed_task.model_dump_json())
+
+        assert repo.load_headers(TaskStatus.COMPLETE) == []
+        assert len(repo.load_headers()) == 2
+
+        assert repo.rebuild_index() == 2
+        assert [h.taskId for h in repo.load_headers(TaskStatus.COMPLETE)] == [
+            completed_task.taskId
+        ]
+
+    def test_file_wins_over_stale_index(self, repo, sample_task):
+        """A task whose file disagrees with the index is not returned."""
+        repo.save(sample_task)
+        path = repo.tasks_dir / f"{sample_task.taskId}.json"
+        data = json.loads(path.read_text())
+        data["status"] = "complete"
+        path.write_text(json.dumps(data))
+
+        assert repo.load_headers(TaskStatus.PENDING) == []
+
+    def test_missing_or_old_index_is_rebuilt(
+        self, temp_orchestra_dir, sample_task, completed_task
+    ):
+        """An index without the current schema is rebuilt on first use."""
+        repo = TaskRepository(temp_orchestra_dir)
+        repo.save_many([sample_task, completed_task])
+        repo.index.path.write_text(json.dumps({"by_status": {}}))
+
+        fresh = TaskRepository(temp_orchestra_dir)
+        counts = fresh.count_by_status()
+        assert counts[TaskStatus.PENDING] == 1
+        assert counts[TaskStatus.COMPLETE] == 1
+
+    def test_backends_without_index(self, sqlite_repo, journal_repo):
+        """SQLite and journal backends use their own queries instead."""
+        assert sqlite_repo.index is None
+        assert journal_repo.index is None
+        assert sqlite_repo.rebuild_index() == 0
+
+
+class TestTaskIndex:
+    """Test the in-memory index and its persistence."""
+
+    @staticmethod
+    def header(i: int, status: TaskStatus = TaskStatus.PENDING) -> TaskHeader:
+        return TaskHeader(
+            f"task_{i:06d}", status, i % 10, datetime(2026, 1, 1), [], agent="coder"
+        )
+
+    def test_unchanged_save_does_not_rewrite(self, repo, sample_task):
+        """Saves that keep status, agent and priority leave the files alone."""
+        repo.save(sample_task)
+        stats = [repo.index.path.stat(), repo.index.log_path.stat()]
+
+        sample_task.pid = 1234
+        repo.save(sample_task)
+        assert [repo.index.path.stat(), repo.index.log_path.stat()] == stats
+
+    def test_saves_append_to_log(self, repo, sample_task):
+        """A save appends its entry instead of rewriting the snapshot."""
+        repo.rebuild_index()
+        snapshot = repo.index.path.read_bytes()
+        repo.save(sample_task)
+        sample_task.status = TaskStatus.RUNNING
+        repo.save(sample_task)
+
+        assert repo.index.path.read_bytes() == snapshot
+        records = repo.index.log_path.read_text().splitlines()[1:]
+        assert [json.loads(r)[1][0] for r in records] == ["pending", "running"]
+
+    def test_other_process_replays_log(self, tmp_path):
+        """Another index applies only the appended records."""
+        writer = TaskIndex(tmp_path / "index.json")
+        writer.rebuild([self.header(1)])
+        reader = TaskIndex(tmp_path / "index.json")
+
+        writer.add(self.header(2))
+        writer.update_status("task_000001", "pending", "running")
+        writer.remove("task_000002")
+        assert reader.get_by_status("running") == ["task_000001"]
+        assert reader.task_ids() == {"task_000001"}
+
+    def test_log_is_compacted(self, tmp_path):
+        """After compact_every records the snapshot is rewritten."""
+        index = TaskIndex(tmp_path / "index.json", compact_every=3)
+        index.rebuild([])
+        reader = TaskIndex(tmp_path / "index.json")
+        for i in range(3):
+            index.add(self.header(i))
+
+        assert not index.log_path.exists()
+        assert json.loads(index.path.read_text())["count"] == 3
+        assert reader.stats()["count"] == 3
+
+    def test_stale_log_is_ignored(self, tmp_path):
+        """A log left behind by an older snapshot is not replayed."""
+        index = TaskIndex(tmp_path / "index.json")
+        index.rebuild([self.header(1)])
+        index.remove("task_000001")
+        stale = index.log_path.read_bytes()
+        index.rebuild([self.header(1)])
+        # As if a compaction crashed before removing the old log
+        index.log_path.write_bytes(stale)
+
+        assert TaskIndex(tmp_path / "index.json").task_ids() == {"task_000001"}
+
+    def test_changes_are_flushed_once_per_batch(self, tmp_path):
+        """Changes inside a batch are written when it ends, atomically."""
+        index = TaskIndex(tmp_path / "index.json")
+        with index.batch():
+            index.add(self.header(1))
+            index.update_status("task_000001", "pending", "running")
+            assert not index.path.exists()
+        assert not (tmp_path / "index.tmp").exists()
+
+        reloaded = TaskIndex(tmp_path / "index.json")
+        assert reloaded.is_current
+        assert reloaded.get_by_status("running") == ["task_000001"]
+        assert reloaded.get_by_status("pending") == []
+
+    def test_ordered_by_time(self, tmp_path):
+        """Time-ordered queries bisect per status and merge the results."""
+        index = TaskIndex(tmp_path / "index.json")
+        for i, status in [(3, "complete"), (1, "complete"), (0, "failed")]:
+            header = self.header(i, TaskStatus(status))
+            header.createdAt = datetime(2026, 1, 1, i)
+            header.completedAt = datetime(2026, 1, 2, 3 - i)
+            index.add(header)
+
+        ids = index.ordered_by("createdAt", ["complete", "failed"])
+        assert ids == ["task_000000", "task_000001", "task_000003"]
+        assert index.ordered_by("completedAt", ["complete"]) == [
+            "task_000003",
+            "task_000001",
+        ]
+        before = datetime(2026, 1, 2, 2)
+        assert index.ordered_by("completedAt", ["complete"], before) == [
+            "task_000003"
+        ]
+        assert index.ordered_by("retryAt", ["failed"]) == []
+
+        index.remove("task_000003")
+        assert index.ordered_by("completedAt", ["complete"], before) == []
+
+    def test_rebuild_is_linear(self, tmp_path):
+        """Rebuilding 100k entries should take well under a few seconds."""
+        headers = [self.header(i) for i in range(100_000)]
+        index = TaskIndex(tmp_path / "index.json")
+
+        start = time.perf_counter()
+        index.rebuild(headers)
+        assert time.perf_counter() - start < 5
+
+        assert TaskIndex(tmp_path / "index.json").stats()["count"] == 100_000
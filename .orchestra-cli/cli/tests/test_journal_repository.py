@@ -0,0 +1,116 @@
+"""Tests for the journal task repository."""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.journal_repository import JournalTaskRepository
+from cli.core.models import TaskStatus
+
+
+def read_log(repo):
+    """Return the records currently in events.log."""
+    if not repo.log_path.exists():
+        return []
+    return [json.loads(line) for line in repo.log_path.read_text().splitlines()]
+
+
+class TestJournalRepository:
+    """Test cases for JournalTaskRepository."""
+
+    def test_save_and_load(self, journal_repo, sample_task):
+        """Should round-trip a task through the journal."""
+        journal_repo.save(sample_task)
+        assert journal_repo.load(sample_task.taskId) == sample_task
+        assert not (journal_repo.tasks_dir / f"{sample_task.taskId}.json").exists()
+
+    def test_transitions_append_small_records(self, journal_repo, sample_task):
+        """Each state change should append one record with only changed fields."""
+        journal_repo.save(sample_task)
+        sample_task.status = TaskStatus.RUNNING
+        sample_task.startedAt = datetime.now()
+        sample_task.pid = 1234
+        journal_repo.save(sample_task)
+        sample_task.status = TaskStatus.COMPLETE
+        sample_task.completedAt = datetime.now()
+        journal_repo.save(sample_task)
+
+        records = read_log(journal_repo)
+        assert [r["event"] for r in records] == ["created", "launched", "completed"]
+        assert set(records[1]["fields"]) == {"status", "startedAt", "pid", "version"}
+        assert [r["seq"] for r in records] == [1, 2, 3]
+
+    def test_unchanged_save_is_skipped(self, journal_repo, sample_task):
+        """Saving an unchanged task should not append anything."""
+        journal_repo.save(sample_task)
+        journal_repo.save(sample_task)
+        assert len(read_log(journal_repo)) == 1
+
+    def test_replay_on_startup(self, journal_repo, sample_task, temp_orchestra_dir):
+        """A new repository should rebuild state from the journal."""
+        journal_repo.save(sample_task)
+        sample_task.status = TaskStatus.CANCELLED
+        journal_repo.save(sample_task)
+
+        reopened = JournalTaskRepository(temp_orchestra_dir)
+        assert reopened.load(sample_task.taskId).status == TaskStatus.CANCELLED
+
+    def test_sees_writes_from_other_instances(
+        self, journal_repo, sample_task, temp_orchestra_dir
+    ):
+        """Writes by another process should be picked up on the next read."""
+        other = JournalTaskRepository(temp_orchestra_dir)
+        other.save(sample_task)
+        assert journal_repo.load(sample_task.taskId) is not None
+        assert journal_repo.count_by_status()[TaskStatus.PENDING] == 1
+
+    def test_compaction_keeps_state_and_history(
+        self, sample_task, temp_orchestra_dir
+    ):
+        """Compaction should snapshot state, rotate the log and keep history."""
+        repo = JournalTaskRepository(temp_orchestra_dir, compact_every=3)
+        repo.save(sample_task)
+        for priority in range(1, 4):
+            sample_task.priority = priority
+            repo.save(sample_task)
+
+        assert repo.snapshot_path.exists()
+        assert len(read_log(repo)) == 1
+        assert list(repo.journal_dir.glob("events-*.log"))
+
+        reopened = JournalTaskRepository(temp_orchestra_dir)
+        assert reopened.load(sample_task.taskId).priority == 3
+        assert len(reopened.history(sample_task.taskId)) == 4
+
+    def test_delete(self, journal_repo, sample_task):
+        """Should record deletion and drop the task."""
+        journal_repo.save(sample_task)
+        assert journal_repo.delete(sample_task.taskId) is True
+        assert journal_repo.load(sample_task.taskId) is None
+        assert read_log(journal_repo)[-1]["event"] == "deleted"
+
+    def test_load_by_status(self, journal_repo, sample_task, failed_task):
+        """Should filter by status."""
+        journal_repo.save(sample_task)
+        journal_repo.save(failed_task)
+        failed = journal_repo.load_by_status(TaskStatus.FAILED)
+        assert [t.taskId for t in failed] == [failed_task.taskId]
+
+    def test_save_many_single_append(self, journal_repo, sample_task, failed_task):
+        """A batch should append sequential records in one write."""
+        journal_repo.save_many([sample_task, failed_task])
+        records = read_log(journal_repo)
+        assert [r["seq"] for r in records] == [1, 2]
+        assert len(journal_repo.load_all()) == 2
+
+    def test_load_headers(self, journal_repo, sample_task, failed_task):
+        """Should build headers from the replayed state."""
+        journal_repo.save_many([sample_task, failed_task])
+        headers = journal_repo.load_headers(TaskStatus.FAILED)
+        assert [h.taskId for h in headers] == [failed_task.taskId]
+        header = journal_repo.load_header(sample_task.taskId)
+        assert header.priority == sample_task.priority
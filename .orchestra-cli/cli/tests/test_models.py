@@ -7,7 +7,7 @@ from pathlib import Path
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.models import Task, TaskStatus, RetryHistoryEntry
+from cli.core.models import Task, TaskHeader, TaskStatus, RetryHistoryEntry
 
 
 class TestTask:
@@ -62,6 +62,20 @@ class TestTask:
         failed_task.maxRetries = 3
         assert not failed_task.should_auto_retry
 
+    def test_retry_due_at(self, failed_task):
+        """Retry time should follow the backoff and stop once retried."""
+        assert failed_task.retry_due_at is None
+
+        failed_task.autoRetry = True
+        failed_task.retryCount = 2
+        expected = failed_task.completedAt + timedelta(seconds=4)
+        assert failed_task.retry_due_at == expected
+        assert TaskHeader.from_task(failed_task).retryAt == expected
+        assert TaskHeader.from_dict(failed_task.model_dump()).retryAt == expected
+
+        failed_task.retriedBy = "task_retry"
+        assert failed_task.retry_due_at is None
+
     def test_dependencies(self, sample_task):
         """Should handle task dependencies."""
         assert len(sample_task.dependsOn) == 0
@@ -84,3 +98,22 @@ class TestRetryHistoryEntry:
         assert entry.error == "Test error"
         assert entry.retriedFrom == "task_123"
 
+
+
+class TestTaskHeader:
+    """Test cases for TaskHeader."""
+
+    def test_from_dict_matches_task(self, sample_task):
+        """A header parsed from JSON should match the validated task."""
+        sample_task.dependsOn = ["task_1"]
+        header = TaskHeader.from_dict(sample_task.model_dump(mode="json"))
+        assert header.taskId == sample_task.taskId
+        assert header.status == TaskStatus.PENDING
+        assert header.createdAt == sample_task.createdAt
+        assert header.dependsOn == ["task_1"]
+        assert not header.is_blocked
+
+    def test_slots(self, sample_task):
+        """Headers should not carry a per-instance __dict__."""
+        header = TaskHeader.from_task(sample_task)
+        assert not hasattr(header, "__dict__")
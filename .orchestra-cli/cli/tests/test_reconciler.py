@@ -0,0 +1,48 @@
+"""Tests for the reconciler."""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.models import TaskStatus
+from cli.core.reconciler import Reconciler
+
+
+class TestReconciler:
+    """Test reconciling running tasks."""
+
+    def running(self, repo, task, started_seconds_ago, pid=None):
+        task.status = TaskStatus.RUNNING
+        task.startedAt = datetime.now() - timedelta(seconds=started_seconds_ago)
+        task.pid = pid
+        repo.save(task)
+        return task
+
+    def test_done_sentinel_completes(self, repo, sample_task):
+        """A done sentinel marks the task complete and is removed."""
+        self.running(repo, sample_task, 5, pid=4242)
+        repo.write_sentinel_file(sample_task.taskId, "done")
+
+        assert Reconciler(repo).reconcile_all() == 1
+        assert repo.load(sample_task.taskId).status == TaskStatus.COMPLETE
+        assert not repo.get_sentinel_files(sample_task.taskId)["done"]
+
+    def test_launching_task_is_left_alone(self, repo, sample_task):
+        """A task still within the launch grace period keeps running."""
+        self.running(repo, sample_task, 5)
+
+        assert Reconciler(repo).reconcile_all() == 0
+        assert repo.load(sample_task.taskId).status == TaskStatus.RUNNING
+
+    def test_task_without_pid_fails_after_grace(self, repo, sample_task):
+        """A task whose launcher never recorded a PID is failed."""
+        self.running(repo, sample_task, Reconciler.LAUNCH_GRACE_SECONDS + 1)
+
+        assert Reconciler(repo).reconcile_all() == 1
+        task = repo.load(sample_task.taskId)
+        assert task.status == TaskStatus.FAILED
+        assert "PID" in task.errorMessage
+        assert task.completedAt is not None
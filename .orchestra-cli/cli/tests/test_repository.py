@@ -1,13 +1,20 @@
 """Tests for task repository."""
 
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import pytest
+
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from cli.core.repository import TaskRepository
+from cli.core import repository as repository_module
+from cli.core.archive_manager import ArchiveManager
+from cli.core.config import OrchestratorConfig
+from cli.core.repository import TaskRepository, VersionConflict
 from cli.core.models import TaskStatus
+from cli.core.retry_manager import RetryManager
 
 
 class TestRepository:
@@ -36,6 +43,15 @@ class TestRepository:
         assert sample_task.taskId in task_ids
         assert completed_task.taskId in task_ids
 
+    def test_legacy_index_is_not_a_task(self, repo, sample_task, capsys):
+        """A tasks/index.json left by older versions is not loaded as a task."""
+        repo.save(sample_task)
+        (repo.tasks_dir / "index.json").write_text('{"by_status": {}}')
+
+        assert [t.taskId for t in repo.load_all()] == [sample_task.taskId]
+        assert [h.taskId for h in repo.load_headers()] == [sample_task.taskId]
+        assert "Warning" not in capsys.readouterr().out
+
     def test_load_all_sorted(self, repo, sample_task, completed_task):
         """Should load tasks sorted by creation time."""
         # Save in reverse order
@@ -89,3 +105,426 @@ class TestRepository:
         sentinels = repo.get_sentinel_files(sample_task.taskId)
         assert sentinels["done"] is False
 
+
+
+class TestRepositoryCache:
+    """Test cases for the parsed-task cache."""
+
+    def test_repeated_load_all_hits_cache(self, repo, sample_task, completed_task):
+        """Unchanged files should not be re-parsed."""
+        repo.save(sample_task)
+        repo.save(completed_task)
+        other = TaskRepository()  # Fresh process-local cache
+
+        other.load_all()
+        assert other.cache_stats()["misses"] == 2
+        other.load_all()
+        stats = other.cache_stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 2
+
+    def test_changed_file_is_reparsed(self, repo, sample_task):
+        """A rewritten file should be parsed again."""
+        repo.save(sample_task)
+        other = TaskRepository()
+        other.load_all()
+
+        sample_task.status = TaskStatus.RUNNING
+        repo.save(sample_task)
+
+        tasks = other.load_all()
+        assert tasks[0].status == TaskStatus.RUNNING
+        assert other.cache_stats()["misses"] == 2
+
+    def test_save_populates_cache(self, repo, sample_task):
+        """Saving should make the next load a cache hit."""
+        repo.save(sample_task)
+        assert repo.load(sample_task.taskId) is not None
+        assert repo.cache_stats() == {"hits": 1, "misses": 0, "size": 1}
+
+    def test_deleted_file_is_evicted(self, repo, sample_task):
+        """Deleted tasks should disappear from the cache."""
+        repo.save(sample_task)
+        repo.load_all()
+        repo.delete(sample_task.taskId)
+        assert repo.load_all() == []
+        assert repo.cache_stats()["size"] == 0
+
+    def test_returns_copies(self, repo, sample_task):
+        """Mutating a loaded task must not affect the cache."""
+        repo.save(sample_task)
+        task = repo.load(sample_task.taskId)
+        task.status = TaskStatus.CANCELLED
+        assert repo.load(sample_task.taskId).status == TaskStatus.PENDING
+
+
+class TestRepositoryTransaction:
+    """Test cases for transaction() / save_many group commits."""
+
+    def test_save_many(self, repo, sample_task, completed_task):
+        """Should write every task in the batch."""
+        repo.save_many([sample_task, completed_task])
+        assert {t.taskId for t in repo.load_all()} == {
+            sample_task.taskId,
+            completed_task.taskId,
+        }
+        assert not list(repo.tasks_dir.glob("*.tmp"))
+
+    def test_writes_deferred_until_commit(self, repo, sample_task):
+        """Saves inside the block should only be visible after it exits."""
+        with repo.transaction():
+            repo.save(sample_task)
+            assert repo.load(sample_task.taskId) is None
+        assert repo.load(sample_task.taskId) is not None
+
+    def test_exception_discards_writes(self, repo, sample_task):
+        """An exception in the block should leave the store untouched."""
+        with pytest.raises(RuntimeError):
+            with repo.transaction():
+                repo.save(sample_task)
+                raise RuntimeError("boom")
+        assert repo.load_all() == []
+
+    def test_failed_write_leaves_nothing_visible(
+        self, repo, sample_task, completed_task, monkeypatch
+    ):
+        """If any temp write fails, no task in the batch should change."""
+        real_write = repo._write_temp
+
+        def failing_write(task, durable=False):
+            if task.taskId == completed_task.taskId:
+                raise OSError("disk full")
+            return real_write(task, durable)
+
+        monkeypatch.setattr(repo, "_write_temp", failing_write)
+        with pytest.raises(OSError):
+            repo.save_many([sample_task, completed_task])
+        assert repo.load_all() == []
+        assert not list(repo.tasks_dir.glob("*.tmp"))
+
+    def test_nested_transactions_join(self, repo, sample_task):
+        """Inner transactions should commit with the outermost one."""
+        with repo.transaction():
+            with repo.transaction():
+                repo.save(sample_task)
+            assert repo.load(sample_task.taskId) is None
+        assert repo.load(sample_task.taskId) is not None
+
+    def test_delete_many(self, repo, sample_task, completed_task):
+        """Should delete task files and sentinels in one commit."""
+        repo.save_many([sample_task, completed_task])
+        repo.write_sentinel_file(completed_task.taskId, "done")
+        repo.delete_many([sample_task.taskId, completed_task.taskId])
+        assert repo.load_all() == []
+        assert not repo.get_sentinel_files(completed_task.taskId)["done"]
+
+
+class TestRepositoryHeaders:
+    """Test cases for load_headers()."""
+
+    def test_load_headers(self, repo, sample_task, completed_task):
+        """Should return headers for all tasks, filterable by status."""
+        repo.save(sample_task)
+        repo.save(completed_task)
+        # Fresh repository: headers are parsed from disk, not the task cache
+        fresh = TaskRepository()
+
+        headers = fresh.load_headers()
+        assert [h.taskId for h in headers] == [
+            t.taskId for t in repo.load_all()
+        ]
+        pending = fresh.load_headers(TaskStatus.PENDING)
+        assert [h.taskId for h in pending] == [sample_task.taskId]
+        assert fresh.cache_stats()["size"] == 0
+
+    def test_header_sees_changes(self, repo, sample_task):
+        """Headers should be re-parsed when the file changes."""
+        repo.save(sample_task)
+        other = TaskRepository()
+        assert other.load_header(sample_task.taskId).status == TaskStatus.PENDING
+
+        sample_task.status = TaskStatus.RUNNING
+        repo.save(sample_task)
+        assert other.load_header(sample_task.taskId).status == TaskStatus.RUNNING
+
+
+class TestShardedLayout:
+    """Test cases for the sharded task layout."""
+
+    def test_save_writes_into_shard(self, temp_orchestra_dir, sample_task):
+        """Task JSON and sentinels should live in the task's shard."""
+        repo = TaskRepository(temp_orchestra_dir, layout="sharded")
+        repo.save(sample_task)
+        repo.write_sentinel_file(sample_task.taskId, "done")
+
+        shard = repo.task_dir(sample_task.taskId)
+        assert shard.parent == repo.tasks_dir
+        assert (shard / f"{sample_task.taskId}.json").exists()
+        assert repo.sentinel_path(sample_task.taskId, "done").exists()
+        assert [t.taskId for t in repo.load_all()] == [sample_task.taskId]
+
+    def test_reads_fall_back_to_flat(self, temp_orchestra_dir, sample_task):
+        """Files written in the flat layout should be found when sharded."""
+        TaskRepository(temp_orchestra_dir).save(sample_task)
+        (temp_orchestra_dir / "tasks" / f"{sample_task.taskId}.done").touch()
+
+        repo = TaskRepository(temp_orchestra_dir, layout="sharded")
+        assert repo.load(sample_task.taskId) is not None
+        assert [h.taskId for h in repo.load_headers()] == [sample_task.taskId]
+        assert repo.get_sentinel_files(sample_task.taskId)["done"]
+
+    def test_reshard_round_trip(self, temp_orchestra_dir, sample_task, completed_task):
+        """reshard() should move files both ways without losing tasks."""
+        repo = TaskRepository(temp_orchestra_dir)
+        repo.save_many([sample_task, completed_task])
+        repo.write_sentinel_file(sample_task.taskId, "pid", "123")
+
+        assert repo.reshard("sharded") == 3
+        assert not list(repo.tasks_dir.glob("task_*"))
+        assert len(repo.load_all()) == 2
+
+        assert repo.reshard("flat") == 3
+        assert len(list(repo.tasks_dir.glob("task_*"))) == 3
+        assert [p for p in repo.tasks_dir.iterdir() if p.is_dir()] == []
+        assert repo.read_sentinel_file(sample_task.taskId, "pid") == "123"
+
+
+class TestOptimisticConcurrency:
+    """Test version checks on saves."""
+
+    def test_save_bumps_version(self, repo, sample_task):
+        """Every save should increment the stored version."""
+        repo.save(sample_task)
+        assert sample_task.version == 1
+        repo.save(sample_task)
+        assert repo.load(sample_task.taskId).version == 2
+
+    def test_stale_save_if_version_is_rejected(self, repo, sample_task):
+        """A writer holding an old copy should not overwrite a newer save."""
+        repo.save(sample_task)
+        stale = repo.load(sample_task.taskId)
+
+        fresh = repo.load(sample_task.taskId)
+        fresh.status = TaskStatus.CANCELLED
+        assert repo.save_if_version(fresh, fresh.version)
+
+        stale.status = TaskStatus.COMPLETE
+        assert not repo.save_if_version(stale, stale.version)
+        assert repo.load(sample_task.taskId).status == TaskStatus.CANCELLED
+
+    def test_update_retries_on_conflict(self, repo, sample_task):
+        """update() should re-run the mutation on a fresh copy after a conflict."""
+        repo.save(sample_task)
+        calls = []
+
+        def mutate(task):
+            calls.append(task.version)
+            if len(calls) == 1:
+                # Simulate a concurrent writer sneaking in
+                repo.save(repo.load(task.taskId))
+            task.priority = 1
+
+        saved = repo.update(sample_task.taskId, mutate)
+        assert calls == [1, 2]
+        assert saved.version == 3
+        assert repo.load(sample_task.taskId).priority == 1
+
+    def test_update_can_decline(self, repo, completed_task):
+        """Returning False from the mutation should leave the task untouched."""
+        repo.save(completed_task)
+        assert repo.update(completed_task.taskId, lambda t: False) is None
+        assert repo.load(completed_task.taskId).version == 1
+
+    def test_transaction_conflict_writes_nothing(
+        self, repo, sample_task, completed_task
+    ):
+        """A stale expected version should abort the whole transaction."""
+        repo.save_many([sample_task, completed_task])
+        stale = repo.load(sample_task.taskId)
+        repo.save(repo.load(sample_task.taskId))
+
+        with pytest.raises(VersionConflict):
+            with repo.transaction():
+                completed_task.priority = 1
+                repo.save(completed_task)
+                repo.save_if_version(stale, stale.version)
+
+        assert repo.load(completed_task.taskId).priority != 1
+        assert repo.load(sample_task.taskId).version == 2
+
+    @pytest.mark.parametrize("backend", ["repo", "sqlite_repo", "journal_repo"])
+    def test_transaction_bumps_caller_versions(self, request, backend, sample_task):
+        """Tasks saved in a transaction carry their new version afterwards."""
+        store = request.getfixturevalue(backend)
+        store.save(sample_task)
+        with store.transaction():
+            sample_task.priority = 2
+            assert store.save_if_version(sample_task, sample_task.version)
+        assert sample_task.version == store.load(sample_task.taskId).version == 2
+
+        sample_task.priority = 1
+        assert store.save_if_version(sample_task, sample_task.version)
+
+    @pytest.mark.parametrize("backend", ["sqlite_repo", "journal_repo"])
+    def test_backends_reject_stale_saves(self, request, backend, sample_task):
+        """The SQLite and journal backends should enforce versions too."""
+        other = request.getfixturevalue(backend)
+        other.save(sample_task)
+        stale = other.load(sample_task.taskId)
+        fresh = other.load(sample_task.taskId)
+        fresh.priority = 1
+        other.save(fresh)
+
+        assert not other.save_if_version(stale, stale.version)
+        assert other.load(sample_task.taskId).version == 2
+
+
+class TestIterTasks:
+    """Test streaming task iteration with filters."""
+
+    @pytest.fixture
+    def tasks(self, sample_task, completed_task, failed_task):
+        """Three tasks created a minute apart, the last for another agent."""
+        start = datetime(2026, 1, 1, 12, 0)
+        for i, task in enumerate([sample_task, completed_task, failed_task]):
+            task.createdAt = start + timedelta(minutes=i)
+        failed_task.agent = "reviewer"
+        return [sample_task, completed_task, failed_task]
+
+    @pytest.mark.parametrize("backend", ["repo", "sqlite_repo", "journal_repo"])
+    def test_filters(self, request, backend, tasks):
+        """Status, agent, created_before and limit should combine."""
+        store = request.getfixturevalue(backend)
+        store.save_many(tasks)
+        ids = lambda *a, **kw: [t.taskId for t in store.iter_tasks(*a, **kw)]
+
+        assert ids() == [t.taskId for t in tasks]
+        assert ids(TaskStatus.COMPLETE, TaskStatus.FAILED) == [
+            tasks[1].taskId,
+            tasks[2].taskId,
+        ]
+        assert ids(agent="reviewer") == [tasks[2].taskId]
+        assert ids(created_before=tasks[1].createdAt) == [tasks[0].taskId]
+        assert ids(limit=2) == [tasks[0].taskId, tasks[1].taskId]
+        assert ids(agent="coder", limit=0) == []
+
+    def test_skips_unmatched_and_does_not_fill_cache(self, repo, tasks):
+        """Only matching tasks should be decoded, and none kept in the cache."""
+        repo.save_many(tasks)
+        repo._cache.clear()
+
+        it = repo.iter_tasks(TaskStatus.FAILED)
+        assert next(it).taskId == tasks[2].taskId
+        assert list(it) == []
+        assert repo._cache == {}
+
+
+class TestTimeQueries:
+    """Test completedAt / retryAt range queries used by archival and retry."""
+
+    @pytest.fixture
+    def finished(self, sample_task, completed_task, failed_task):
+        """A pending task plus tasks that finished one and three days ago."""
+        now = datetime.now()
+        completed_task.completedAt = now - timedelta(days=3)
+        failed_task.completedAt = now - timedelta(days=1)
+        failed_task.autoRetry = True
+        return [sample_task, completed_task, failed_task]
+
+    @pytest.mark.parametrize("backend", ["repo", "sqlite_repo", "journal_repo"])
+    def test_completed_before(self, request, backend, finished):
+        """Only finished tasks completed before the cutoff are yielded."""
+        store = request.getfixturevalue(backend)
+        store.save_many(finished)
+        ids = lambda *a: [t.taskId for t in store.iter_completed_before(*a)]
+
+        cutoff = datetime.now() - timedelta(days=2)
+        assert ids(cutoff) == [finished[1].taskId]
+        assert ids(datetime.now()) == [finished[1].taskId, finished[2].taskId]
+        assert ids(datetime.now(), TaskStatus.FAILED) == [finished[2].taskId]
+
+    @pytest.mark.parametrize("backend", ["repo", "sqlite_repo", "journal_repo"])
+    def test_retry_due(self, request, backend, finished):
+        """Failed tasks are due once their backoff expires, until retried."""
+        store = request.getfixturevalue(backend)
+        store.save_many(finished)
+        failed = finished[2]
+
+        assert list(store.iter_retry_due(failed.completedAt)) == []
+        assert [t.taskId for t in store.iter_retry_due()] == [failed.taskId]
+
+        retry = RetryManager(store).create_retry_task(failed, auto_retry=True)
+        assert retry is not None
+        assert list(store.iter_retry_due()) == []
+        assert RetryManager(store).due_retries() == []
+
+    def test_concurrent_retries_create_one(self, repo, finished, temp_orchestra_dir):
+        """Two processes retrying the same failed task create one retry."""
+        repo.save_many(finished)
+        other = TaskRepository(temp_orchestra_dir)
+        first, second = RetryManager(repo), RetryManager(other)
+        [mine], [theirs] = first.due_retries(), second.due_retries()
+
+        assert first.create_retry_task(mine, auto_retry=True) is not None
+        assert second.create_retry_task(theirs, auto_retry=True) is None
+        retries = [t for t in repo.load_all() if t.parentTaskId == mine.taskId]
+        assert len(retries) == 1
+        assert len(list(repo.plans_dir.glob("*_plan.md"))) == 1
+
+    def test_archival_reads_only_eligible_tasks(
+        self, repo, finished, temp_orchestra_dir, monkeypatch
+    ):
+        """The archive pass should decode only the tasks it archives."""
+        repo.save_many(finished)
+        config = OrchestratorConfig()
+        config.archive.max_completed_age_days = 2
+        config.archive.max_failed_age_days = 2
+        config.archive.archive_dir = str(temp_orchestra_dir / "archive")
+
+        loaded = []
+        load_streamed = repo._load_streamed
+        monkeypatch.setattr(
+            repo, "_load_streamed", lambda i: loaded.append(i) or load_streamed(i)
+        )
+        archivable = ArchiveManager(repo, config).get_archivable_tasks()
+        assert [t.taskId for t in archivable] == [finished[1].taskId]
+        assert loaded == [finished[1].taskId]
+
+
+class TestParallelLoad:
+    """Test thread-pool cold loads."""
+
+    @pytest.fixture
+    def populated(self, temp_orchestra_dir, sample_task, completed_task, failed_task):
+        """Three valid task files plus one corrupt file."""
+        TaskRepository(temp_orchestra_dir).save_many(
+            [sample_task, completed_task, failed_task]
+        )
+        (temp_orchestra_dir / "tasks" / "task_broken.json").write_text("{not json")
+        return temp_orchestra_dir
+
+    def _load(self, base, workers, capsys):
+        ids = [t.taskId for t in TaskRepository(base, load_workers=workers).load_all()]
+        headers = [
+            h.taskId for h in TaskRepository(base, load_workers=workers).load_headers()
+        ]
+        return ids, headers, capsys.readouterr().out
+
+    def test_matches_sequential_load(self, populated, capsys, monkeypatch):
+        """Parallel loads should return the same tasks, order and warnings."""
+        monkeypatch.setattr(repository_module, "PARALLEL_LOAD_MIN", 1)
+        monkeypatch.setattr(repository_module, "READ_CHUNK", 1)
+
+        sequential = self._load(populated, 1, capsys)
+        parallel = self._load(populated, 4, capsys)
+
+        assert parallel == sequential
+        assert len(sequential[0]) == 3
+        assert sequential[2].count("task_broken.json") == 2
+
+    def test_small_loads_stay_sequential(self, repo, sample_task, monkeypatch):
+        """Below PARALLEL_LOAD_MIN files no thread pool should be used."""
+        repo.save(sample_task)
+        repo._cache.clear()
+        monkeypatch.setattr(repository_module, "ThreadPoolExecutor", None)
+        assert [t.taskId for t in repo.load_all()] == [sample_task.taskId]
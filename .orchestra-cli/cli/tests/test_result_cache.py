@@ -0,0 +1,224 @@
+"""Tests for the content-addressed result cache."""
+
+import subprocess
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.config import CacheConfig, OrchestratorConfig
+from cli.core.executor import Executor
+from cli.core.models import Task, TaskStatus
+from cli.core.reconciler import Reconciler
+from cli.core.repository import TaskRepository
+from cli.core.result_cache import ResultCache, workspace_fingerprint
+from cli.utils.paths import task_shard
+
+
+def make_task(task_id: str, prompt: str = "Write the report", agent: str = "coder"):
+    return Task(
+        taskId=task_id,
+        status=TaskStatus.PENDING,
+        agent=agent,
+        prompt=prompt,
+        planFile=f".orchestra/plans/{task_id}_plan.md",
+        logFile=f".orchestra/logs/{task_id}.log",
+        createdAt=datetime.now(),
+    )
+
+
+def write_result(task: Task, log: str, plan: str = "# Plan\n"):
+    Path(task.logFile).write_text(log)
+    Path(task.planFile).write_text(plan)
+
+
+@pytest.fixture
+def cache(repo):
+    """An enabled cache without workspace fingerprints."""
+    return ResultCache.for_repository(
+        repo, CacheConfig(enabled=True, workspace_fingerprint=False)
+    )
+
+
+class TestResultCache:
+    """Test storing, restoring and evicting results."""
+
+    def test_disabled_by_default(self, repo):
+        """The cache is opt-in."""
+        assert OrchestratorConfig().cache.enabled is False
+        assert ResultCache.for_repository(repo) is None
+
+    def test_store_and_restore(self, repo, cache):
+        """A stored log and plan are copied to a new task's files."""
+        first, second = make_task("task_a"), make_task("task_b")
+        write_result(first, "all done\n", "# Plan\n- step\n")
+        assert cache.store("k1", first)
+
+        assert cache.restore("k1", second) == "task_a"
+        assert Path(second.logFile).read_text() == "all done\n"
+        assert Path(second.planFile).read_text() == "# Plan\n- step\n"
+        assert cache.entries["k1"]["hits"] == 1
+
+    def test_miss(self, repo, cache, sample_task):
+        """An unknown key restores nothing."""
+        assert cache.restore("missing", sample_task) is None
+        assert not Path(sample_task.logFile).exists()
+
+    def test_expired_entry_is_dropped(self, repo, cache):
+        """Results older than the TTL are not reused."""
+        task = make_task("task_a")
+        write_result(task, "old\n")
+        stored = datetime.now() - timedelta(seconds=cache.ttl_seconds + 1)
+        cache.store("k1", task, now=stored)
+
+        assert cache.restore("k1", make_task("task_b")) is None
+        assert "k1" not in cache.entries
+        assert not (cache.root / "k1.log").exists()
+
+    def test_size_eviction_drops_least_recently_used(self, repo):
+        """Over max size, the entries used longest ago go first."""
+        cache = ResultCache(repo.tasks_dir.parent / "cache", max_bytes=250)
+        now = datetime.now()
+        for i, key in enumerate(["old", "used", "new"]):
+            task = make_task(f"task_{key}")
+            write_result(task, "x" * 100, "")
+            cache.store(key, task, now=now + timedelta(seconds=i))
+            if key == "used":
+                reader = make_task("task_reader")
+                cache.restore("old", reader, now=now + timedelta(seconds=3))
+
+        assert set(cache.entries) == {"old", "new"}
+        assert cache.total_bytes() <= 250
+
+    def test_index_shared_between_instances(self, repo, cache):
+        """A result stored by one process is seen by another."""
+        task = make_task("task_a")
+        write_result(task, "shared\n")
+        cache.store("k1", task)
+
+        other = ResultCache(cache.root)
+        assert other.restore("k1", make_task("task_b")) == "task_a"
+
+    def test_concurrent_stores_keep_every_entry(self, repo, cache):
+        """Processes storing at the same time do not drop each other's entries."""
+        tasks = [make_task(f"task_{i}") for i in range(20)]
+        for task in tasks:
+            write_result(task, f"{task.taskId}\n")
+
+        def reconciler(batch):
+            other = ResultCache(cache.root)
+            for task in batch:
+                other.store(task.taskId, task)
+
+        threads = [
+            threading.Thread(target=reconciler, args=(tasks[i::4],)) for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        reloaded = ResultCache(cache.root)
+        assert reloaded.evict() == 0
+        assert set(reloaded.entries) == {t.taskId for t in tasks}
+
+    def test_workspace_fingerprint(self, tmp_path):
+        """The fingerprint follows uncommitted changes, but not .orchestra."""
+        if subprocess.run(["git", "--version"], capture_output=True).returncode:
+            pytest.skip("git not available")
+        assert workspace_fingerprint(tmp_path) is None
+
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+        subprocess.run(git + ["init", "-q"], cwd=tmp_path, check=True)
+        (tmp_path / "a.txt").write_text("one")
+        subprocess.run(git + ["add", "."], cwd=tmp_path, check=True)
+        subprocess.run(git + ["commit", "-qm", "init"], cwd=tmp_path, check=True)
+        clean = workspace_fingerprint(tmp_path)
+        assert clean is not None
+
+        (tmp_path / ".orchestra").mkdir()
+        (tmp_path / ".orchestra" / "state.json").write_text("{}")
+        assert workspace_fingerprint(tmp_path) == clean
+
+        (tmp_path / "a.txt").write_text("two")
+        assert workspace_fingerprint(tmp_path) != clean
+
+
+class TestCachedExecution:
+    """Test the executor and reconciler using the cache."""
+
+    def test_key_ignores_task_id(self, repo, cache):
+        """Tasks that differ only in ID share a key; other prompts don't."""
+        executor = Executor(repo, cache=cache)
+        key = executor.cache_key(make_task("task_a"))
+        assert executor.cache_key(make_task("task_b")) == key
+        assert executor.cache_key(make_task("task_c", prompt="Other")) != key
+        assert executor.cache_key(make_task("task_d", agent="reviewer")) != key
+
+    def test_key_ignores_shard_directory(self, temp_orchestra_dir, cache):
+        """In the sharded layout, sentinel paths in other shards still match."""
+        repo = TaskRepository(temp_orchestra_dir, layout="sharded")
+        executor = Executor(repo, cache=cache)
+        first = make_task("task_1700000000001")
+        second = make_task("task_1800000000002")
+        assert task_shard(first.taskId) != task_shard(second.taskId)
+        assert str(repo.task_dir(first.taskId)) in " ".join(
+            executor._build_command(first)
+        )
+
+        assert executor.cache_key(first) == executor.cache_key(second)
+
+    def test_hit_completes_without_launch(self, repo, cache, monkeypatch):
+        """A cache hit restores the result and completes the task."""
+        executor = Executor(repo, cache=cache)
+        first = make_task("task_a")
+        write_result(first, "cached output\n")
+        cache.store(executor.cache_key(first), first)
+
+        task = make_task("task_b")
+        repo.save(task)
+        launched = []
+        monkeypatch.setattr(executor, "launch_task", lambda t: launched.append(t))
+
+        assert executor.start_task(task)
+        assert launched == []
+        assert task.cachedFrom == "task_a"
+        saved = repo.load("task_b")
+        assert saved.status == TaskStatus.COMPLETE
+        assert saved.cachedFrom == "task_a"
+        assert Path(task.logFile).read_text() == "cached output\n"
+
+    def test_miss_launches_and_completion_is_stored(self, repo, cache, monkeypatch):
+        """On a miss the task runs; its completed result is then cached."""
+        executor = Executor(repo, cache=cache)
+        task = make_task("task_a")
+        repo.save(task)
+        monkeypatch.setattr(executor, "launch_task", lambda t: 4242)
+        monkeypatch.setattr("cli.core.executor.kill_process", lambda pid: None)
+
+        assert executor.start_task(task)
+        saved = repo.load("task_a")
+        assert saved.status == TaskStatus.RUNNING
+        assert saved.resultKey == executor.cache_key(task)
+
+        write_result(task, "fresh output\n")
+        repo.write_sentinel_file("task_a", "done")
+        reconciler = Reconciler(repo, cache=cache)
+        assert reconciler.reconcile_task(saved)
+        assert cache.entries[saved.resultKey]["taskId"] == "task_a"
+
+    def test_failed_results_are_not_cached(self, repo, cache):
+        """Only completed tasks are stored."""
+        task = make_task("task_a")
+        task.status = TaskStatus.RUNNING
+        task.resultKey = "k1"
+        repo.save(task)
+        write_result(task, "boom\n")
+        repo.write_sentinel_file("task_a", "error", '{"error": "boom"}')
+
+        assert Reconciler(repo, cache=cache).reconcile_task(repo.load("task_a"))
+        assert cache.entries == {}
@@ -1,14 +1,25 @@
 """Tests for task scheduler."""
 
+import json
 import sys
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import pytest
+
 # Ensure proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from cli.core.agents import AgentLimits, load_agent_configs, load_agent_limits
+from cli.core.executor import Executor
 from cli.core.scheduler import Scheduler
-from cli.core.models import Task, TaskStatus
+from cli.core.models import Task, TaskHeader, TaskStatus
+from cli.core.formatter import Formatter
+from cli.core.rate_limit import RateLimit, RateLimiter
+from cli.core.ready_queue import FairQueue, ReadyQueue
+from cli.core.runtime_stats import RuntimeStats
+from cli.utils.time_utils import parse_deadline
 
 
 class TestScheduler:
@@ -106,3 +117,628 @@ class TestScheduler:
         # Should skip blocked task
         assert next_task.taskId == "task_2"
 
+
+
+class TestReadyQueue:
+    """Test the ready-task heap."""
+
+    @staticmethod
+    def header(task_id, priority, hours_ago):
+        created = datetime(2026, 1, 1) - timedelta(hours=hours_ago)
+        return TaskHeader(task_id, TaskStatus.PENDING, priority, created, [])
+
+    def test_orders_by_priority_then_age(self):
+        """Highest priority first, oldest first within a priority."""
+        queue = ReadyQueue()
+        queue.push(self.header("task_new", 5, 1))
+        queue.push(self.header("task_old", 5, 2))
+        queue.push(self.header("task_urgent", 9, 0))
+
+        assert queue.peek(2) == ["task_urgent", "task_old"]
+        assert [queue.pop(), queue.pop(), queue.pop(), queue.pop()] == [
+            "task_urgent",
+            "task_old",
+            "task_new",
+            None,
+        ]
+
+    def test_discard_and_requeue(self):
+        """Discarded tasks are skipped; re-pushing updates the priority."""
+        queue = ReadyQueue()
+        queue.push(self.header("task_a", 5, 0))
+        queue.push(self.header("task_b", 5, 1))
+        queue.discard("task_b")
+        queue.push(self.header("task_a", 1, 0))
+        queue.push(self.header("task_c", 3, 0))
+
+        assert len(queue) == 2
+        assert queue.pop() == "task_c"
+        assert queue.pop() == "task_a"
+        assert queue.pop() is None
+
+
+class TestIncrementalScheduling:
+    """Test that a long-lived scheduler updates its queue incrementally."""
+
+    def test_refresh_only_reads_new_tasks(self, repo, sample_task, monkeypatch):
+        """Known pending tasks are not re-read on later refreshes."""
+        repo.save(sample_task)
+        scheduler = Scheduler(repo)
+        scheduler.refresh()
+
+        newer = sample_task.model_copy()
+        newer.taskId = "task_newer"
+        repo.save(newer)
+
+        loaded = []
+        original = repo.load_header
+        monkeypatch.setattr(
+            repo, "load_header", lambda i: loaded.append(i) or original(i)
+        )
+        scheduler.refresh()
+
+        assert loaded == ["task_newer"]
+        assert len(scheduler.ready) == 2
+
+    def test_launched_and_unblocked_tasks(self, repo, sample_task, completed_task):
+        """Launched tasks leave the queue; waiting tasks join once deps finish."""
+        dep = sample_task.model_copy()
+        dep.taskId = "task_dep"
+        child = sample_task.model_copy()
+        child.taskId = "task_child"
+        child.dependsOn = ["task_dep"]
+        repo.save_many([dep, child])
+
+        scheduler = Scheduler(repo)
+        assert [t.taskId for t in scheduler.get_pending_tasks(5)] == ["task_dep"]
+        assert set(scheduler.waiting) == {"task_child"}
+
+        dep = repo.load("task_dep")
+        dep.status = TaskStatus.RUNNING
+        repo.save(dep)
+        assert scheduler.get_pending_tasks(5) == []
+
+        dep.status = TaskStatus.COMPLETE
+        repo.save(dep)
+        assert [t.taskId for t in scheduler.get_pending_tasks(5)] == ["task_child"]
+        assert scheduler.waiting == {}
+
+    def test_completion_touches_only_dependents(
+        self, repo, sample_task, monkeypatch
+    ):
+        """Waiting tasks are not re-checked until one of their deps finishes."""
+        tasks = {}
+        for task_id, deps in [
+            ("task_a", []),
+            ("task_b", []),
+            ("task_c", ["task_a", "task_b"]),
+            ("task_d", ["task_b"]),
+        ]:
+            task = sample_task.model_copy()
+            task.taskId = task_id
+            task.dependsOn = deps
+            tasks[task_id] = task
+        repo.save_many(tasks.values())
+
+        scheduler = Scheduler(repo)
+        scheduler.refresh()
+        assert set(scheduler.waiting) == {"task_c", "task_d"}
+
+        loaded = []
+        original = repo.load_header
+        monkeypatch.setattr(
+            repo, "load_header", lambda i: loaded.append(i) or original(i)
+        )
+        scheduler.refresh()
+        assert loaded == []
+
+        tasks["task_b"].status = TaskStatus.COMPLETE
+        repo.save(tasks["task_b"])
+        loaded.clear()  # Saving checks the stored version
+        scheduler.refresh()
+        assert loaded == ["task_b"]
+        assert "task_d" in scheduler.ready
+        assert scheduler.graph.remaining == {"task_c": 1}
+
+    def test_failed_dependency_blocks_dependents(self, repo, sample_task):
+        """A dependency that fails while others wait on it blocks them."""
+        dep = sample_task.model_copy()
+        dep.taskId = "task_dep"
+        child = sample_task.model_copy()
+        child.taskId = "task_child"
+        child.dependsOn = ["task_dep"]
+        repo.save_many([dep, child])
+
+        scheduler = Scheduler(repo)
+        scheduler.refresh()
+        dep.status = TaskStatus.FAILED
+        repo.save(dep)
+        scheduler.refresh()
+
+        assert scheduler.blocked == {"task_child"}
+        assert repo.load("task_child").blockedBy == "task_dep"
+
+    def test_unlaunched_tasks_are_offered_again(self, repo, sample_task):
+        """A task taken off the queue but not launched comes back."""
+        repo.save(sample_task)
+        scheduler = Scheduler(repo)
+        assert scheduler.get_next_pending().taskId == sample_task.taskId
+        assert scheduler.get_next_pending().taskId == sample_task.taskId
+
+
+class TestFairShare:
+    """Test per-agent caps and weighted round robin between agents."""
+
+    @staticmethod
+    def header(task_id, agent, priority=5):
+        return TaskHeader(
+            task_id, TaskStatus.PENDING, priority, datetime(2026, 1, 1), [], agent=agent
+        )
+
+    def fill(self, queue, counts):
+        for agent, n in counts.items():
+            for i in range(n):
+                queue.push(self.header(f"{agent}_{i}", agent))
+
+    def test_weights_share_slots(self):
+        """Agents get launch slots in proportion to their weights."""
+        queue = FairQueue({"coder": 2, "auggie": 1})
+        self.fill(queue, {"auggie": 10, "coder": 10})
+
+        agents = [queue.pop().split("_")[0] for _ in range(9)]
+        assert agents.count("coder") == 6
+        assert agents.count("auggie") == 3
+
+    def test_fractional_weight_and_state_across_calls(self):
+        """Turns resume across pops; weight 0.5 launches every other round."""
+        queue = FairQueue({"slow": 0.5})
+        self.fill(queue, {"slow": 4, "fast": 4})
+
+        agents = [queue.pop().split("_")[0] for _ in range(6)]
+        assert agents.count("fast") == 4
+        assert agents.count("slow") == 2
+
+    def test_capped_agents_are_skipped(self):
+        """An agent with no free slots does not block the others."""
+        queue = FairQueue()
+        self.fill(queue, {"auggie": 3, "coder": 1})
+        capacity = {"auggie": 1}
+
+        popped = [queue.pop(capacity) for _ in range(3)]
+        assert sorted(p.split("_")[0] for p in popped[:2]) == ["auggie", "coder"]
+        assert popped[2] is None
+        assert capacity == {"auggie": 0}
+        assert len(queue) == 2
+
+    def test_scheduler_enforces_max_concurrent(self, repo, sample_task):
+        """Running tasks count against their agent's maxConcurrent."""
+        for i, (agent, status) in enumerate(
+            [("auggie", TaskStatus.RUNNING)]
+            + [("auggie", TaskStatus.PENDING)] * 3
+            + [("coder", TaskStatus.PENDING)] * 3
+        ):
+            task = sample_task.model_copy()
+            task.taskId = f"task_{i}"
+            task.agent = agent
+            task.status = status
+            repo.save(task)
+
+        limits = {"auggie": AgentLimits.from_dict("auggie", {"maxConcurrent": 2})}
+        scheduler = Scheduler(repo, limits)
+        agents = [t.agent for t in scheduler.get_pending_tasks(5)]
+        assert agents.count("auggie") == 1
+        assert agents.count("coder") == 3
+
+    def test_limits_from_agent_config(self, tmp_path):
+        """maxConcurrent and weight are read from agent-config.json."""
+        path = tmp_path / "agent-config.json"
+        path.write_text(
+            '{"agents": {"coder": {"command": "x", "args": [], '
+            '"maxConcurrent": 2, "weight": 3}, '
+            '"auggie": {"command": "y", "args": [], "weight": -1}}}'
+        )
+        limits = load_agent_limits(load_agent_configs(path))
+        assert limits["coder"] == AgentLimits(max_concurrent=2, weight=3.0)
+        assert limits["auggie"] == AgentLimits()
+
+
+class TestPriorityAging:
+    """Test that pending tasks gain effective priority while they wait."""
+
+    @staticmethod
+    def header(task_id, priority, created):
+        return TaskHeader(task_id, TaskStatus.PENDING, priority, created, [])
+
+    def test_wait_is_bounded_under_saturation(self):
+        """A stream of urgent tasks cannot starve a low-priority one forever."""
+        start = datetime(2026, 1, 1)
+        queue = ReadyQueue(aging_interval=60)
+        queue.push(self.header("task_low", 1, start))
+        for minute in range(30):
+            created = start + timedelta(minutes=minute)
+            queue.push(self.header(f"task_urgent_{minute:02d}", 10, created))
+
+        order = [queue.pop() for _ in range(31)]
+        # Urgent tasks submitted up to (10 - 1) minutes later go first
+        assert order.index("task_low") == 10
+
+    def test_no_aging_keeps_strict_priority(self):
+        """With aging off, priority always wins over age."""
+        queue = ReadyQueue()
+        queue.push(self.header("task_low", 1, datetime(2020, 1, 1)))
+        queue.push(self.header("task_high", 2, datetime(2026, 1, 1)))
+        assert queue.pop() == "task_high"
+
+    def test_effective_priority(self, repo, sample_task):
+        """Pending tasks age one level per interval; others keep their priority."""
+        scheduler = Scheduler(repo, agent_limits={}, aging_interval=600)
+        sample_task.createdAt = datetime(2026, 1, 1)
+        now = datetime(2026, 1, 1, 0, 30)
+        assert scheduler.effective_priority(sample_task, now) == 8
+        strict = Scheduler(repo, agent_limits={}, aging_interval=0)
+        assert strict.effective_priority(sample_task, now) == 5
+
+        sample_task.status = TaskStatus.RUNNING
+        assert scheduler.effective_priority(sample_task, now) == 5
+
+    def test_scheduler_launches_aged_task(self, repo, sample_task):
+        """An old low-priority task overtakes a newer higher-priority one."""
+        old = sample_task.model_copy()
+        old.taskId = "task_old"
+        old.priority = 1
+        old.createdAt = datetime.now() - timedelta(hours=1)
+        new = sample_task.model_copy()
+        new.taskId = "task_new"
+        new.priority = 3
+        repo.save_many([old, new])
+
+        scheduler = Scheduler(repo, agent_limits={}, aging_interval=600)
+        assert scheduler.get_next_pending().taskId == "task_old"
+
+
+class TestCriticalPath:
+    """Test critical-path ordering of ready tasks that gate dependent work."""
+
+    @staticmethod
+    def save_dag(repo, sample_task, edges, agents=None):
+        """Save pending tasks from {task_id: dependsOn}, created in order."""
+        start = datetime(2026, 1, 1)
+        tasks = []
+        for i, (task_id, deps) in enumerate(edges.items()):
+            task = sample_task.model_copy()
+            task.taskId = task_id
+            task.dependsOn = deps
+            task.agent = (agents or {}).get(task_id, "coder")
+            task.createdAt = start + timedelta(seconds=i)
+            tasks.append(task)
+        repo.save_many(tasks)
+
+    @staticmethod
+    def stats(temp_orchestra_dir, means):
+        path = temp_orchestra_dir / "runtime-stats.json"
+        agents = {agent: {"mean": mean, "count": 1} for agent, mean in means.items()}
+        path.write_text(json.dumps({"agents": agents}))
+        return RuntimeStats(path)
+
+    def test_runtime_stats(self, temp_orchestra_dir, completed_task):
+        """Completed run times are averaged per agent and persisted."""
+        stats = RuntimeStats(temp_orchestra_dir / "runtime-stats.json")
+        assert stats.duration("coder") == RuntimeStats.DEFAULT_SECONDS
+
+        completed_task.startedAt = datetime(2026, 1, 1)
+        for minutes in (10, 20):
+            completed_task.completedAt = datetime(2026, 1, 1, 0, minutes)
+            stats.record(completed_task)
+
+        reloaded = RuntimeStats(stats.path)
+        assert reloaded.duration("coder") == pytest.approx(600 + 0.2 * 600)
+        assert reloaded.duration("unknown") == reloaded.duration("coder")
+
+    def test_concurrent_records_all_count(self, temp_orchestra_dir, completed_task):
+        """Reconcilers recording at the same time do not lose samples."""
+        path = temp_orchestra_dir / "runtime-stats.json"
+        completed_task.startedAt = datetime(2026, 1, 1)
+        completed_task.completedAt = datetime(2026, 1, 1, 0, 10)
+
+        def reconciler():
+            stats = RuntimeStats(path)
+            for _ in range(25):
+                stats.record(completed_task)
+
+        threads = [threading.Thread(target=reconciler) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert RuntimeStats(path).agents["coder"]["count"] == 100
+
+    def test_downstream_seconds(self, repo, sample_task, temp_orchestra_dir):
+        """The longest chain of waiting dependents is weighted by agent."""
+        self.save_dag(
+            repo,
+            sample_task,
+            {"a": [], "b": ["a"], "c": ["b"], "d": ["a"], "e": ["b", "d"]},
+            agents={"c": "reviewer", "e": "reviewer"},
+        )
+        stats = self.stats(temp_orchestra_dir, {"coder": 100, "reviewer": 30})
+        scheduler = Scheduler(repo, agent_limits={}, runtime_stats=stats)
+        scheduler.refresh()
+
+        assert scheduler.downstream_seconds("a") == 130  # a -> b|d -> c|e
+        assert scheduler.downstream_seconds("c") == 0
+
+    @pytest.mark.parametrize("aging_interval", [0, 600])
+    def test_gating_task_goes_first(self, repo, sample_task, aging_interval):
+        """Among equal priorities, the head of a chain beats an older leaf."""
+        self.save_dag(
+            repo,
+            sample_task,
+            {"leaf": [], "head": [], "mid": ["head"], "tail": ["mid"]},
+        )
+        scheduler = Scheduler(
+            repo, agent_limits={}, aging_interval=aging_interval
+        )
+        assert scheduler.get_next_pending().taskId == "head"
+
+        plain = Scheduler(
+            repo, agent_limits={}, aging_interval=aging_interval, policy="priority"
+        )
+        assert plain.get_next_pending().taskId == "leaf"
+
+    def test_new_dependents_rerank_queued_tasks(self, repo, sample_task):
+        """A queued task moves up when work starts depending on it."""
+        self.save_dag(repo, sample_task, {"first": [], "second": []})
+        scheduler = Scheduler(repo, agent_limits={}, aging_interval=0)
+        assert scheduler.get_next_pending().taskId == "first"
+
+        self.save_dag(repo, sample_task, {"child": ["second"]})
+        assert scheduler.get_next_pending().taskId == "second"
+
+    def test_fan_out_makespan(self, repo, sample_task):
+        """Starting the chain first finishes the pipeline in fewer rounds."""
+
+        def rounds(policy):
+            for task_id in repo.task_ids():
+                repo.delete(task_id)
+            self.save_dag(
+                repo,
+                sample_task,
+                {"l1": [], "l2": [], "l3": [], "h": [], "c1": ["h"], "c2": ["c1"]},
+            )
+            scheduler = Scheduler(
+                repo, agent_limits={}, aging_interval=0, policy=policy
+            )
+            count = 0
+            while repo.task_ids(TaskStatus.PENDING):
+                count += 1
+                for task in scheduler.get_pending_tasks(2):
+                    task.status = TaskStatus.COMPLETE
+                    repo.save(task)
+            return count
+
+        assert rounds("priority") == 4
+        assert rounds("critical_path") == 3
+
+
+class TestDeadlines:
+    """Test earliest-deadline-first launches and deadline risk."""
+
+    NOW = datetime(2026, 1, 1, 12, 0)
+
+    @staticmethod
+    def header(task_id, priority=5, agent="coder"):
+        return TaskHeader(
+            task_id, TaskStatus.PENDING, priority, datetime(2026, 1, 1), [], agent=agent
+        )
+
+    def test_parse_deadline(self):
+        """Durations are relative to now; timestamps are taken as-is."""
+        assert parse_deadline("1h30m", self.NOW) == datetime(2026, 1, 1, 13, 30)
+        assert parse_deadline("2026-03-01T17:00") == datetime(2026, 3, 1, 17, 0)
+        with pytest.raises(ValueError):
+            parse_deadline("soon")
+
+    def test_urgent_task_jumps_priority_order(self):
+        """A task due within the slack goes first; later deadlines wait."""
+        queue = ReadyQueue(deadline_slack=1800)
+        queue.push(self.header("task_high", priority=9))
+        queue.push(
+            self.header("task_later", priority=1),
+            latest_start=self.NOW + timedelta(hours=2),
+        )
+        queue.push(
+            self.header("task_soon", priority=1),
+            latest_start=self.NOW + timedelta(minutes=20),
+        )
+        order = [queue.pop(self.NOW) for _ in range(3)]
+        assert order == ["task_soon", "task_high", "task_later"]
+
+    def test_hopeless_task_falls_back_to_priority(self):
+        """A task that can no longer make its deadline doesn't jump the queue."""
+        queue = ReadyQueue(deadline_slack=1800)
+        queue.push(self.header("task_high", priority=9))
+        queue.push(
+            self.header("task_late", priority=1),
+            latest_start=self.NOW - timedelta(minutes=5),
+        )
+        assert queue.pop(self.NOW) == "task_high"
+        assert queue.pop(self.NOW) == "task_late"
+
+    def test_slack_zero_disables_edf(self):
+        """With no slack, deadlines don't change the order."""
+        queue = ReadyQueue()
+        queue.push(self.header("task_high", priority=9))
+        queue.push(self.header("task_soon", priority=1), latest_start=self.NOW)
+        assert queue.pop(self.NOW) == "task_high"
+
+    def test_urgent_task_skips_round_robin(self):
+        """An urgent task launches whichever agent's turn it is, and is charged."""
+        queue = FairQueue(deadline_slack=1800)
+        queue.push(self.header("coder_1"))
+        queue.push(self.header("coder_2"))
+        queue.push(
+            self.header("auggie_1", agent="auggie"),
+            latest_start=self.NOW + timedelta(minutes=10),
+        )
+        assert queue.pop(now=self.NOW) == "auggie_1"
+        assert queue.pop(capacity={"auggie": 0}, now=self.NOW) == "coder_1"
+
+    def test_scheduler_latest_start_and_risk(
+        self, repo, sample_task, temp_orchestra_dir
+    ):
+        """Latest start and risk use the agent's historical run time."""
+        stats_path = temp_orchestra_dir / "runtime-stats.json"
+        stats_path.write_text(
+            json.dumps({"agents": {"coder": {"mean": 3600, "count": 5}}})
+        )
+        scheduler = Scheduler(
+            repo, agent_limits={}, runtime_stats=RuntimeStats(stats_path)
+        )
+        task = sample_task.model_copy()
+        assert scheduler.latest_start(task) is None
+        assert scheduler.deadline_risk(task, self.NOW) is None
+
+        task.deadline = self.NOW + timedelta(minutes=90)
+        assert scheduler.latest_start(task) == self.NOW + timedelta(minutes=30)
+        assert scheduler.deadline_risk(task, self.NOW) is None
+        later = self.NOW + timedelta(minutes=45)
+        assert scheduler.deadline_risk(task, later) == "will miss deadline"
+        assert scheduler.deadline_risk(task, self.NOW + timedelta(hours=2)) == (
+            "past deadline"
+        )
+
+        task.status = TaskStatus.COMPLETE
+        task.completedAt = self.NOW + timedelta(hours=2)
+        assert scheduler.deadline_risk(task, self.NOW) == "missed deadline"
+
+    @pytest.mark.parametrize("backend", ["repo", "sqlite_repo", "journal_repo"])
+    def test_scheduler_launches_urgent_task_first(
+        self, request, backend, sample_task
+    ):
+        """Deadlines reach the scheduler through every backend's headers."""
+        store = request.getfixturevalue(backend)
+        urgent = sample_task.model_copy()
+        urgent.taskId = "task_urgent"
+        urgent.priority = 1
+        urgent.deadline = datetime.now() + timedelta(minutes=30)
+        normal = sample_task.model_copy()
+        normal.taskId = "task_normal"
+        normal.priority = 9
+        store.save_many([urgent, normal])
+
+        assert store.load_header("task_urgent").deadline == urgent.deadline
+        scheduler = Scheduler(store, agent_limits={}, deadline_slack=1800)
+        assert scheduler.get_next_pending().taskId == "task_urgent"
+
+
+class TestRateLimits:
+    """Test per-agent token buckets on launches."""
+
+    NOW = datetime(2026, 1, 1, 12, 0)
+
+    def test_bucket_refills_over_time(self, tmp_path):
+        """A bucket allows a burst, then refills at the configured rate."""
+        limiter = RateLimiter(
+            {"auggie": RateLimit(per_minute=6, burst=2)}, tmp_path / "rate.json"
+        )
+        assert limiter.tokens("coder") is None
+        assert limiter.available(self.NOW) == {"auggie": 2}
+
+        assert limiter.take("auggie", self.NOW)
+        assert limiter.take("auggie", self.NOW)
+        assert limiter.available(self.NOW) == {"auggie": 0}
+        assert not limiter.take("auggie", self.NOW)
+        assert limiter.next_token_at("auggie", self.NOW) == self.NOW + timedelta(
+            seconds=10
+        )
+
+        later = self.NOW + timedelta(seconds=15)
+        assert limiter.tokens("auggie", later) == pytest.approx(1.5)
+        assert limiter.tokens("auggie", self.NOW + timedelta(hours=1)) == 2
+
+    def test_state_is_shared_through_the_file(self, tmp_path):
+        """Another process (e.g. status) sees the tokens the daemon took."""
+        limits = {"auggie": RateLimit(per_minute=1)}
+        RateLimiter(limits, tmp_path / "rate.json").take("auggie", self.NOW)
+        assert RateLimiter(limits, tmp_path / "rate.json").available(self.NOW) == {
+            "auggie": 0
+        }
+
+    def test_concurrent_takes_never_exceed_burst(self, tmp_path):
+        """Launchers taking at the same time get exactly the bucket's tokens."""
+        limits = {"auggie": RateLimit(per_minute=0.001, burst=10)}
+        taken = []
+
+        def launcher():
+            limiter = RateLimiter(limits, tmp_path / "rate.json")
+            for _ in range(5):
+                taken.append(limiter.take("auggie", self.NOW))
+
+        threads = [threading.Thread(target=launcher) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert taken.count(True) == 10
+        limiter = RateLimiter(limits, tmp_path / "rate.json")
+        assert limiter.tokens("auggie", self.NOW) == 0
+
+    def test_rate_limit_from_agent_config(self):
+        """rateLimit entries are parsed; invalid ones are ignored."""
+        limits = load_agent_limits(
+            {
+                "auggie": {"rateLimit": {"perMinute": 6, "burst": 2}},
+                "opencode": {"rateLimit": {"perMinute": 0}},
+            }
+        )
+        assert limits["auggie"].rate_limit == RateLimit(6.0, 2)
+        assert limits["opencode"].rate_limit is None
+
+    def test_scheduler_skips_empty_bucket(self, repo, sample_task):
+        """While an agent's bucket is empty, other agents' tasks launch."""
+        for i, agent in enumerate(["auggie"] * 3 + ["coder"] * 2):
+            task = sample_task.model_copy()
+            task.taskId = f"task_{i}"
+            task.agent = agent
+            repo.save(task)
+
+        limits = load_agent_limits({"auggie": {"rateLimit": {"perMinute": 1}}})
+        scheduler = Scheduler(repo, limits)
+        first = scheduler.get_pending_tasks(5)
+        assert sorted(t.agent for t in first) == ["auggie", "coder", "coder"]
+
+        auggie = next(t for t in first if t.agent == "auggie")
+        executor = Executor(repo, rate_limiter=scheduler.rate_limiter)
+        executor.launch_task = lambda task: 4242
+        assert executor.start_task(auggie)
+        assert [t.agent for t in scheduler.get_pending_tasks(5)] == ["coder"] * 2
+
+    def test_empty_bucket_releases_claim(self, repo, sample_task):
+        """A launch whose bucket another process emptied is not started."""
+        sample_task.agent = "auggie"
+        repo.save(sample_task)
+        limits = load_agent_limits({"auggie": {"rateLimit": {"perMinute": 1}}})
+        scheduler = Scheduler(repo, limits)
+        [task] = scheduler.get_pending_tasks(1)
+        # Another launcher spends the only token after the pick
+        assert RateLimiter.for_repository(repo, scheduler.rate_limiter.limits).take(
+            "auggie"
+        )
+
+        executor = Executor(repo, rate_limiter=scheduler.rate_limiter)
+        launched = []
+        executor.launch_task = lambda t: launched.append(t)
+        assert not executor.start_task(task)
+        assert launched == []
+        stored = repo.load(sample_task.taskId)
+        assert stored.status == TaskStatus.PENDING
+        assert stored.startedAt is None
+
+    def test_status_shows_buckets(self, tmp_path, capsys):
+        """Bucket levels and the wait for an empty bucket are printed."""
+        limiter = RateLimiter({"auggie": RateLimit(2)}, tmp_path / "rate.json")
+        limiter.take("auggie")
+        Formatter().print_rate_limits(limiter)
+        out = capsys.readouterr().out
+        assert "auggie: 0.0/1 launches available (2/min)" in out
+        assert "empty, next in" in out
@@ -0,0 +1,128 @@
+"""Tests for the full-text search index."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.archive_manager import ArchiveManager
+from cli.core.config import OrchestratorConfig
+from cli.core.search import SearchIndex, parse_query, tokenize
+
+
+@pytest.fixture
+def search_index(repo):
+    """A search index next to the test repository."""
+    index = SearchIndex.for_repository(repo)
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def finished(repo, temp_orchestra_dir, sample_task, completed_task, failed_task):
+    """A pending task plus a completed and a failed task with plans and logs."""
+    for task, log in [
+        (completed_task, "wrote src/parser.py\nall tests passed"),
+        (failed_task, "Traceback\nConnectionError: connection refused by db"),
+    ]:
+        task.planFile = str(temp_orchestra_dir / "plans" / f"{task.taskId}_plan.md")
+        task.logFile = str(temp_orchestra_dir / "logs" / f"{task.taskId}.log")
+        Path(task.planFile).write_text(f"# Plan\nRefactor the {task.agent} flow")
+        Path(task.logFile).write_text(log)
+    failed_task.agent = "reviewer"
+    repo.save_many([sample_task, completed_task, failed_task])
+    return [sample_task, completed_task, failed_task]
+
+
+class TestQueryParsing:
+    """Test tokenization and query parsing."""
+
+    def test_tokenize_splits_paths(self):
+        """File paths and punctuation split into lowercase words."""
+        assert tokenize("Edit src/Parser.py: done") == [
+            "edit",
+            "src",
+            "parser",
+            "py",
+            "done",
+        ]
+
+    def test_terms_and_phrases(self):
+        """Quoted phrases become phrases; all their words are also terms."""
+        terms, phrases = parse_query('timeout "connection refused" db')
+        assert terms == ["timeout", "connection", "refused", "db"]
+        assert phrases == [["connection", "refused"]]
+
+
+class TestSearchIndex:
+    """Test indexing, incremental sync and ranked queries."""
+
+    def test_sync_indexes_finished_tasks_once(self, repo, search_index, finished):
+        """Only finished tasks are indexed, and only the first time."""
+        assert search_index.sync(repo) == 2
+        assert search_index.sync(repo) == 0
+        assert search_index.stats()["tasks"] == 2
+
+    def test_terms_phrases_and_filters(self, repo, search_index, finished):
+        """Terms and phrases match across prompt, plan and log text."""
+        search_index.sync(repo)
+        ids = lambda q, **kw: [r.task_id for r in search_index.search(q, repo, **kw)]
+        completed, failed = finished[1].taskId, finished[2].taskId
+
+        assert ids("parser.py") == [completed]
+        assert sorted(ids("refactor flow")) == sorted([completed, failed])
+        assert ids('"connection refused"') == [failed]
+        assert ids('"refused connection"') == []
+        assert ids("refactor", agent="reviewer") == [failed]
+        assert ids("refactor", status="complete") == [completed]
+        assert ids("nonexistent") == []
+
+    def test_ranking_prefers_more_matches(self, repo, search_index, finished):
+        """A task mentioning the term more often ranks first."""
+        Path(finished[2].logFile).write_text("parser parser parser failed")
+        search_index.sync(repo)
+        results = search_index.search("parser", repo)
+        assert [r.task_id for r in results] == [
+            finished[2].taskId,
+            finished[1].taskId,
+        ]
+        assert results[0].score > results[1].score
+
+    def test_archived_tasks_stay_searchable(
+        self, repo, search_index, finished, temp_orchestra_dir
+    ):
+        """Archived tasks are kept (and found) after leaving the repository."""
+        config = OrchestratorConfig()
+        config.archive.archive_dir = str(temp_orchestra_dir / "archive")
+        manager = ArchiveManager(repo, config)
+        search_index.sync(repo, manager.archive_dir)
+
+        manager.archive_task(finished[2])
+        repo.delete(finished[1].taskId)  # Cleaned, not archived
+        search_index.sync(repo, manager.archive_dir)
+
+        results = search_index.search(
+            '"connection refused"', repo, manager.archive_dir
+        )
+        assert [(r.task_id, r.archived) for r in results] == [
+            (finished[2].taskId, True)
+        ]
+        assert search_index.search("parser", repo, manager.archive_dir) == []
+
+    def test_indexes_archives_made_before_the_index(
+        self, repo, finished, temp_orchestra_dir
+    ):
+        """Archived task files that were never indexed are picked up."""
+        config = OrchestratorConfig()
+        config.archive.archive_dir = str(temp_orchestra_dir / "archive")
+        ArchiveManager(repo, config).archive_task(finished[1])
+
+        index = SearchIndex(temp_orchestra_dir / "other.db")
+        assert index.sync(repo, Path(config.archive.archive_dir)) == 2
+        assert [r.task_id for r in index.search("parser", repo)] == [
+            finished[1].taskId
+        ]
+        index.close()
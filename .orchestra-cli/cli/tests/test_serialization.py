@@ -0,0 +1,66 @@
+"""Tests for task serialization formats."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.repository import TaskRepository
+from cli.core.serialization import decode_task, detect_format, encode_task
+from cli.core.sqlite_repository import SqliteTaskRepository
+
+
+class TestSerialization:
+    """Test cases for encode_task/decode_task."""
+
+    def test_round_trip_both_formats(self, failed_task):
+        """Both formats should decode back to an equal task."""
+        for task_format in ("json", "compact"):
+            data = encode_task(failed_task, task_format)
+            assert detect_format(data) == task_format
+            assert decode_task(data) == failed_task
+
+    def test_compact_is_smaller(self, sample_task):
+        """Compact output should be minified, versioned and skip nulls."""
+        data = encode_task(sample_task, "compact")
+        assert data.startswith('{"_v":2,')
+        assert "null" not in data and "\n" not in data
+        assert len(data) < len(encode_task(sample_task, "json"))
+
+    def test_rejects_newer_version(self, sample_task):
+        """Documents from a newer schema version should not be misread."""
+        data = encode_task(sample_task, "compact").replace('"_v":2', '"_v":3', 1)
+        with pytest.raises(ValueError):
+            decode_task(data)
+
+
+class TestFormatMigration:
+    """Test cases for migrate_format()."""
+
+    def test_json_backend(self, temp_orchestra_dir, sample_task, completed_task):
+        """Should rewrite legacy files and keep them loadable."""
+        repo = TaskRepository(temp_orchestra_dir)
+        repo.save_many([sample_task, completed_task])
+
+        compact = TaskRepository(temp_orchestra_dir, task_format="compact")
+        assert compact.migrate_format("compact") == 2
+        assert compact.migrate_format("compact") == 0
+
+        path = temp_orchestra_dir / "tasks" / f"{sample_task.taskId}.json"
+        assert detect_format(path.read_text()) == "compact"
+        loaded = TaskRepository(temp_orchestra_dir).load(sample_task.taskId)
+        assert loaded.prompt == sample_task.prompt
+        assert loaded.createdAt == sample_task.createdAt
+
+    def test_sqlite_backend(self, temp_orchestra_dir, sample_task):
+        """Should re-encode database rows in place."""
+        repo = SqliteTaskRepository(temp_orchestra_dir)
+        repo.save(sample_task)
+        assert repo.migrate_format("compact") == 1
+        data = repo._conn.execute("SELECT data FROM tasks").fetchone()[0]
+        assert detect_format(data) == "compact"
+        assert repo.load(sample_task.taskId).createdAt == sample_task.createdAt
+        repo.close()
@@ -0,0 +1,173 @@
+"""Tests for the scheduler simulator."""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.agents import AgentLimits
+from cli.core.models import Task, TaskStatus
+from cli.core.rate_limit import RateLimit
+from cli.core.simulator import AgentProfile, SimTask, Simulation, Workload
+
+
+def simulate(workload, policy="priority", max_concurrent=1, agent_limits=None):
+    return Simulation(
+        workload,
+        policy,
+        max_concurrent,
+        agent_limits=agent_limits or {},
+        aging_interval=0,
+        deadline_slack=0,
+    ).run()
+
+
+def fixed(*tasks, failure_rate=0.0):
+    """A workload of 100-second coder tasks."""
+    return Workload({"coder": AgentProfile(100.0, 0.0, failure_rate)}, list(tasks))
+
+
+class TestWorkload:
+    """Test workload parsing, ordering and generation."""
+
+    def test_parse_agent_profile(self):
+        """Profiles are NAME=MEAN[:STDDEV[:FAILURE_RATE]]."""
+        assert AgentProfile.parse("coder=600") == ("coder", AgentProfile(600.0))
+        qa = AgentProfile(60.0, 10.0, 0.2)
+        assert AgentProfile.parse("qa=60:10:0.2") == ("qa", qa)
+        for spec in ("coder", "coder=", "coder=0", "coder=60:10:2", "coder=a"):
+            with pytest.raises(ValueError):
+                AgentProfile.parse(spec)
+
+    def test_dependencies_are_submitted_first(self):
+        """Tasks are ordered after their dependencies, even if listed first."""
+        workload = fixed(
+            SimTask("b", "coder", submit_at=0, depends_on=["a"]),
+            SimTask("a", "coder", submit_at=50),
+        )
+        assert [t.key for t in workload.tasks] == ["a", "b"]
+        assert workload.tasks[1].submit_at == 50
+
+    def test_invalid_dependencies_rejected(self):
+        """Cycles and unknown dependencies are errors."""
+        with pytest.raises(ValueError, match="cycle"):
+            fixed(
+                SimTask("a", "coder", depends_on=["b"]),
+                SimTask("b", "coder", depends_on=["a"]),
+            )
+        with pytest.raises(ValueError, match="unknown"):
+            fixed(SimTask("a", "coder", depends_on=["missing"]))
+
+    def test_synthetic_is_reproducible(self, tmp_path):
+        """The same seed gives the same workload, which round-trips as JSON."""
+        agents = {"coder": AgentProfile(600, 300, 0.1), "qa": AgentProfile(60)}
+        workload = Workload.synthetic(agents, num_tasks=20, seed=7)
+        assert workload == Workload.synthetic(agents, num_tasks=20, seed=7)
+
+        path = tmp_path / "workload.json"
+        workload.save(path)
+        assert Workload.load(path) == workload
+
+    def test_recorded_workload(self, repo):
+        """Finished tasks replay their run time; profiles fit all runs."""
+        start = datetime(2026, 1, 1, 9, 0)
+
+        def recorded(task_id, status, seconds, **kwargs):
+            task = Task(
+                taskId=task_id,
+                status=status,
+                agent="coder",
+                prompt="p",
+                planFile=f".orchestra/plans/{task_id}_plan.md",
+                logFile=f".orchestra/logs/{task_id}.log",
+                createdAt=start,
+                startedAt=start + timedelta(seconds=10) if seconds else None,
+                completedAt=(
+                    start + timedelta(seconds=10 + seconds) if seconds else None
+                ),
+                **kwargs,
+            )
+            repo.save(task)
+
+        recorded("task_1", TaskStatus.COMPLETE, 100)
+        recorded("task_2", TaskStatus.FAILED, 300, autoRetry=True)
+        recorded("task_3", TaskStatus.COMPLETE, 200, parentTaskId="task_2")
+        recorded("task_4", TaskStatus.PENDING, 0, dependsOn=["task_1", "gone"])
+
+        workload = Workload.from_repository(repo)
+        assert workload.agents["coder"] == pytest.approx(
+            AgentProfile(200.0, (20000 / 3) ** 0.5, 1 / 3)
+        )
+        by_key = {t.key: t for t in workload.tasks}
+        assert set(by_key) == {"task_1", "task_2", "task_4"}
+        assert by_key["task_2"].duration == 300 and by_key["task_2"].fails
+        assert by_key["task_4"].duration is None
+        assert by_key["task_4"].depends_on == ["task_1"]
+
+
+class TestSimulation:
+    """Test simulated runs of the real scheduler."""
+
+    def test_serial_run(self):
+        """One slot runs tasks back to back; the second waits for the first."""
+        result = simulate(fixed(SimTask("a", "coder"), SimTask("b", "coder")))
+        assert result.makespan == 200
+        assert result.waits == [0, 100]
+        assert result.utilization == 1.0
+        assert result.completed == 2
+
+    def test_critical_path_shortens_makespan(self):
+        """Starting the head of a chain first finishes the chain sooner."""
+        workload = fixed(
+            SimTask("x", "coder"),
+            SimTask("y", "coder"),
+            SimTask("a", "coder"),
+            SimTask("c", "coder", depends_on=["a"]),
+            SimTask("d", "coder", depends_on=["c"]),
+        )
+        assert simulate(workload, "priority", 2).makespan == 400
+        assert simulate(workload, "critical_path", 2).makespan == 300
+
+    def test_failures_are_retried(self):
+        """Failed tasks are retried with backoff; dependents stay blocked."""
+        workload = fixed(
+            SimTask("a", "coder", max_retries=2),
+            SimTask("b", "coder", depends_on=["a"]),
+            failure_rate=1.0,
+        )
+        result = simulate(workload)
+        assert result.retries == 2
+        assert result.failed == 1
+        assert result.unfinished == 1
+        assert len(result.waits) == 3
+
+    def test_missed_deadlines(self):
+        """Tasks that finish after their deadline are counted as late."""
+        workload = fixed(
+            SimTask("a", "coder", deadline=150),
+            SimTask("b", "coder", deadline=150),
+        )
+        assert simulate(workload).missed_deadlines == 1
+
+    def test_rate_limit_spaces_launches(self):
+        """A rate-limited agent launches only as fast as its bucket refills."""
+        workload = Workload(
+            {"coder": AgentProfile(1.0)},
+            [SimTask(f"t{i}", "coder") for i in range(3)],
+        )
+        limits = {"coder": AgentLimits(rate_limit=RateLimit(per_minute=1))}
+        result = simulate(workload, max_concurrent=3, agent_limits=limits)
+        assert result.waits == [0, 60, 120]
+        assert result.makespan == 121
+
+    def test_same_draws_for_every_policy(self):
+        """Policies are compared on identical run times and failures."""
+        agents = {"coder": AgentProfile(600, 300, 0.2), "qa": AgentProfile(120, 60)}
+        workload = Workload.synthetic(agents, num_tasks=40, seed=3)
+        runs = [simulate(workload, p, 3) for p in ("priority", "critical_path")]
+        assert runs[0].busy_seconds == pytest.approx(runs[1].busy_seconds)
+        assert runs[0].retries == runs[1].retries
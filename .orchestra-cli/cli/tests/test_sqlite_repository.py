@@ -0,0 +1,165 @@
+"""Tests for the SQLite task repository."""
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Ensure proper imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from cli.core.config import OrchestratorConfig
+from cli.core.models import TaskStatus
+from cli.core.reconciler import Reconciler
+from cli.core.repository import create_repository
+from cli.core.scheduler import Scheduler
+from cli.core.sqlite_repository import SqliteTaskRepository
+
+
+class TestSqliteRepository:
+    """Test cases for SqliteTaskRepository."""
+
+    def test_uses_wal_mode(self, sqlite_repo):
+        """Should open the database in WAL mode."""
+        mode = sqlite_repo._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_save_and_load(self, sqlite_repo, sample_task):
+        """Should round-trip a task through the database."""
+        sample_task.dependsOn = ["task_1"]
+        sqlite_repo.save(sample_task)
+
+        loaded = sqlite_repo.load(sample_task.taskId)
+        assert loaded == sample_task
+        assert not (sqlite_repo.tasks_dir / f"{sample_task.taskId}.json").exists()
+
+    def test_save_replaces_row(self, sqlite_repo, sample_task):
+        """Saving twice should update the existing row."""
+        sqlite_repo.save(sample_task)
+        sample_task.status = TaskStatus.RUNNING
+        sqlite_repo.save(sample_task)
+
+        assert len(sqlite_repo.load_all()) == 1
+        assert sqlite_repo.load(sample_task.taskId).status == TaskStatus.RUNNING
+
+    def test_load_all_sorted(self, sqlite_repo, sample_task):
+        """Should return tasks oldest first."""
+        for i in range(3):
+            task = sample_task.model_copy()
+            task.taskId = f"task_{i}"
+            task.createdAt = datetime.now() - timedelta(hours=i)
+            sqlite_repo.save(task)
+
+        assert [t.taskId for t in sqlite_repo.load_all()] == [
+            "task_2",
+            "task_1",
+            "task_0",
+        ]
+
+    def test_load_by_status_and_counts(self, sqlite_repo, sample_task, completed_task):
+        """Should answer status queries from the indexed column."""
+        sqlite_repo.save(sample_task)
+        sqlite_repo.save(completed_task)
+
+        pending = sqlite_repo.load_by_status(TaskStatus.PENDING)
+        assert [t.taskId for t in pending] == [sample_task.taskId]
+
+        counts = sqlite_repo.count_by_status()
+        assert counts[TaskStatus.PENDING] == 1
+        assert counts[TaskStatus.COMPLETE] == 1
+        assert counts[TaskStatus.RUNNING] == 0
+
+    def test_delete_removes_row_and_sentinels(self, sqlite_repo, sample_task):
+        """Should delete the row and sentinel files."""
+        sqlite_repo.save(sample_task)
+        sqlite_repo.write_sentinel_file(sample_task.taskId, "done")
+
+        assert sqlite_repo.delete(sample_task.taskId) is True
+        assert sqlite_repo.load(sample_task.taskId) is None
+        assert not sqlite_repo.get_sentinel_files(sample_task.taskId)["done"]
+
+    def test_scheduler_and_reconciler(self, sqlite_repo, sample_task):
+        """Scheduler and reconciler should work against the SQLite backend."""
+        running = sample_task.model_copy()
+        running.taskId = "task_running"
+        running.status = TaskStatus.RUNNING
+        sqlite_repo.save(running)
+        sqlite_repo.save(sample_task)
+        sqlite_repo.write_sentinel_file("task_running", "done")
+
+        scheduler = Scheduler(sqlite_repo)
+        assert scheduler.get_running_count() == 1
+        assert scheduler.get_next_pending().taskId == sample_task.taskId
+
+        assert Reconciler(sqlite_repo).reconcile_all() == 1
+        assert sqlite_repo.load("task_running").status == TaskStatus.COMPLETE
+
+    def test_transaction_rolls_back(self, sqlite_repo, sample_task, completed_task):
+        """save_many should commit atomically and discard on error."""
+        sqlite_repo.save_many([sample_task, completed_task])
+        assert len(sqlite_repo.load_all()) == 2
+
+        with pytest.raises(RuntimeError):
+            with sqlite_repo.transaction():
+                sqlite_repo.delete(sample_task.taskId)
+                raise RuntimeError("boom")
+        assert len(sqlite_repo.load_all()) == 2
+
+    def test_load_headers(self, sqlite_repo, sample_task, completed_task):
+        """Should build headers from indexed columns and the JSON document."""
+        sample_task.dependsOn = [completed_task.taskId]
+        sqlite_repo.save_many([sample_task, completed_task])
+
+        headers = sqlite_repo.load_headers(TaskStatus.PENDING)
+        assert [h.taskId for h in headers] == [sample_task.taskId]
+        assert headers[0].dependsOn == [completed_task.taskId]
+        assert headers[0].createdAt == sample_task.createdAt
+
+    def test_adds_time_columns_to_old_databases(
+        self, temp_orchestra_dir, completed_task
+    ):
+        """Databases without completed_at/retry_at are migrated on open."""
+        conn = sqlite3.connect(str(temp_orchestra_dir / "tasks.db"))
+        conn.execute(
+            "CREATE TABLE tasks (task_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+            "priority INTEGER NOT NULL, agent TEXT NOT NULL, "
+            "created_at TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                completed_task.taskId,
+                "complete",
+                5,
+                "coder",
+                completed_task.createdAt.isoformat(),
+                completed_task.model_dump_json(),
+            ),
+        )
+        conn.commit()
+        conn.close()
+
+        repo = SqliteTaskRepository(temp_orchestra_dir)
+        tasks = list(repo.iter_completed_before(datetime.now() + timedelta(1)))
+        assert [t.taskId for t in tasks] == [completed_task.taskId]
+        repo.close()
+
+class TestCreateRepository:
+    """Test cases for backend selection."""
+
+    def test_default_is_json(self, temp_orchestra_dir):
+        """Should default to the JSON file backend."""
+        repo = create_repository(OrchestratorConfig(), temp_orchestra_dir)
+        assert not isinstance(repo, SqliteTaskRepository)
+
+    def test_sqlite_backend(self, temp_orchestra_dir):
+        """Should honour storage.backend = sqlite."""
+        config = OrchestratorConfig()
+        config.storage.backend = "sqlite"
+        repo = create_repository(config, temp_orchestra_dir)
+        assert isinstance(repo, SqliteTaskRepository)
+        assert repo.db_path == temp_orchestra_dir / "tasks.db"
+        repo.close()
+
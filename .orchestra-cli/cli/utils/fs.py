@@ -0,0 +1,27 @@
+"""File system helpers for durable writes."""
+
+import os
+from pathlib import Path
+
+from cli.utils.process import get_os_name
+
+
+def fsync_file(f) -> None:
+    """Flush a Python file object and fsync it to disk."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def fsync_dir(directory: Path) -> None:
+    """
+    Fsync a directory so renames/unlinks inside it are durable.
+
+    No-op on Windows, where directories cannot be opened for fsync.
+    """
+    if get_os_name() == "windows":
+        return
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,67 @@
+"""Task ID generation.
+
+IDs look like ``task_<ms><suffix>``: 13 digits of Unix time in
+milliseconds followed by a 10-digit suffix. The first ID of each
+millisecond gets a random suffix (about 33 bits), which makes
+cross-process collisions vanishingly unlikely. Later IDs in the same
+millisecond increment it, ULID-style, so one process never repeats an ID
+or goes backwards, even if the wall clock does.
+
+IDs stay all-digits after ``task_`` and start with the same millisecond
+timestamp as legacy ``task_<ms>`` IDs. Sorting IDs (and task file names)
+as strings therefore sorts tasks by creation time, across old and new IDs.
+"""
+
+import secrets
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+TASK_ID_PREFIX = "task_"
+TIME_DIGITS = 13
+SUFFIX_DIGITS = 10
+
+_SUFFIX_LIMIT = 10**SUFFIX_DIGITS
+_lock = threading.Lock()
+_last_ms = 0
+_last_suffix = 0
+
+
+def new_task_id(now: Optional[datetime] = None) -> str:
+    """
+    Generate a unique, time-sortable task ID.
+
+    Args:
+        now: Creation time to embed (defaults to the current time)
+    """
+    global _last_ms, _last_suffix
+
+    ms = int(now.timestamp() * 1000) if now else time.time_ns() // 1_000_000
+    with _lock:
+        if ms > _last_ms:
+            suffix = secrets.randbelow(_SUFFIX_LIMIT // 2)
+        else:
+            # Same millisecond (or clock went back): keep counting up
+            ms = _last_ms
+            suffix = _last_suffix + 1
+            if suffix >= _SUFFIX_LIMIT:
+                ms += 1
+                suffix = secrets.randbelow(_SUFFIX_LIMIT // 2)
+        _last_ms, _last_suffix = ms, suffix
+
+    return f"{TASK_ID_PREFIX}{ms:0{TIME_DIGITS}d}{suffix:0{SUFFIX_DIGITS}d}"
+
+
+def task_id_time(task_id: str) -> Optional[datetime]:
+    """
+    Return the creation time embedded in a task ID (new or legacy format).
+
+    Returns None for IDs that do not start with a millisecond timestamp.
+    """
+    digits = task_id[len(TASK_ID_PREFIX) :]
+    if not task_id.startswith(TASK_ID_PREFIX) or len(digits) < TIME_DIGITS:
+        return None
+    if not digits.isdigit():
+        return None
+    return datetime.fromtimestamp(int(digits[:TIME_DIGITS]) / 1000)
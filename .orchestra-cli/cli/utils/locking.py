@@ -0,0 +1,46 @@
+"""Cross-platform advisory file locks."""
+
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from cli.utils.process import get_os_name
+
+
+@contextmanager
+def file_lock(lock_path: Path):
+    """
+    Hold an exclusive advisory lock on ``lock_path`` for the duration of the block.
+
+    Uses fcntl.flock on POSIX and msvcrt.locking on Windows. Locks are not
+    re-entrant: do not acquire the same lock twice in one process.
+
+    Args:
+        lock_path: Lock file (created if missing, never deleted)
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if get_os_name() == "windows":
+            import msvcrt
+
+            f.seek(0)
+            # LK_LOCK gives up after ~10 attempts, so keep retrying
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
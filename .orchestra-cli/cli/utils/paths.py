@@ -1,5 +1,6 @@
 """Path constants for the agent orchestrator."""
 
+import hashlib
 from pathlib import Path
 
 
@@ -9,12 +10,21 @@ TASKS_DIR = BASE_PATH / "tasks"
 PLANS_DIR = BASE_PATH / "plans"
 LOGS_DIR = BASE_PATH / "logs"
 WORKSPACE_DIR = BASE_PATH / "workspace"
+INDEX_PATH = BASE_PATH / "index.json"
+SEARCH_DB_PATH = BASE_PATH / "search.db"
 
 # Script paths (legacy - kept for backward compatibility)
 SCRIPTS_DIR = Path(".orchestra-cli/scripts")
 RUN_WITH_TIMEOUT_SH = SCRIPTS_DIR / "run-with-timeout.sh"
 RUN_WITH_TIMEOUT_PS1 = SCRIPTS_DIR / "run-with-timeout.ps1"
 
+# Task file layouts under TASKS_DIR:
+#   flat:    tasks/<taskId>.json, tasks/<taskId>.done, ...
+#   sharded: tasks/<shard>/<taskId>.json, ... where <shard> is 2 hex chars
+#            of the task ID's hash (256 shards, ~400 tasks each at 100k)
+TASK_LAYOUTS = ("flat", "sharded")
+SHARD_CHARS = 2
+
 # Configuration files
 AGENT_CONFIG_PATH = Path(".orchestra-cli/agent-config.json")
 
@@ -23,3 +33,13 @@ def ensure_directories():
     """Create all necessary directories if they don't exist."""
     for directory in [TASKS_DIR, PLANS_DIR, LOGS_DIR, WORKSPACE_DIR]:
         directory.mkdir(parents=True, exist_ok=True)
+
+
+def task_shard(task_id: str) -> str:
+    """Shard directory name for a task (stable hash prefix of its ID)."""
+    return hashlib.blake2b(task_id.encode(), digest_size=4).hexdigest()[:SHARD_CHARS]
+
+
+def is_shard_name(name: str) -> bool:
+    """Check whether a directory name under TASKS_DIR is a shard."""
+    return len(name) == SHARD_CHARS and all(c in "0123456789abcdef" for c in name)
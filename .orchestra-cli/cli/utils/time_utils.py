@@ -1,6 +1,7 @@
 """Time formatting utilities."""
 
-from datetime import datetime
+import re
+from datetime import datetime, timedelta
 from typing import Optional
 
 from ..core.models import Task, TaskStatus
@@ -43,6 +44,34 @@ def format_duration(seconds: int) -> str:
     return f"{days}d"
 
 
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_deadline(value: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Parse a deadline given as a duration from now or an ISO timestamp.
+
+    Examples:
+        "90m" / "1h30m" / "2d" -> that long from now
+        "2026-03-01T17:00" -> that local time
+
+    Raises:
+        ValueError: If the value is neither
+    """
+    text = value.strip().lower()
+    if re.fullmatch(r"(\d+[smhd])+", text):
+        seconds = sum(
+            int(amount) * DURATION_UNITS[unit]
+            for amount, unit in re.findall(r"(\d+)([smhd])", text)
+        )
+        return (now or datetime.now()) + timedelta(seconds=seconds)
+    deadline = datetime.fromisoformat(value.strip())
+    if deadline.tzinfo is not None:
+        # Task times are naive local times
+        deadline = deadline.astimezone().replace(tzinfo=None)
+    return deadline
+
+
 def format_elapsed(task: Task) -> str:
     """
     Format elapsed time for a task with optional timeout display.